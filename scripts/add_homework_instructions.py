@@ -1,8 +1,27 @@
 #!/usr/bin/env python3
-"""Script para agregar homeworkInstructions a todas las sesiones."""
+"""Script para agregar homeworkInstructions a todas las sesiones.
 
-import re
+Recorre sessions.ts una sola vez con el tokenizador de
+generate_missing_session_pdfs.py, anota el rango de cada propiedad de cada
+sesión y aplica todos los cambios en una única reconstrucción del texto, así que
+el coste es proporcional al tamaño del fichero y no a sesiones × tamaño.
+
+- Si la sesión ya tiene homeworkInstructions con otro texto, se sustituye el
+  valor; si no lo tiene, se inserta justo antes de `resources`.
+- Las sesiones con None pierden la propiedad si la tenían.
+- Ejecutarlo dos veces no cambia nada la segunda; la escritura es atómica.
+
+Uso: python3 scripts/add_homework_instructions.py [RUTA/sessions.ts] [--check]
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from generate_missing_session_pdfs import SESSIONS_TS, SessionsParseError, tokenize_ts_spans
 
 # Mapa de instrucciones por número de sesión
 HOMEWORK_INSTRUCTIONS = {
@@ -37,39 +56,179 @@ HOMEWORK_INSTRUCTIONS = {
 }
 
 
-def add_homework_instructions_to_sessions(file_path: Path) -> None:
-    """Agrega homeworkInstructions a las sesiones que no lo tienen."""
-    content = file_path.read_text(encoding='utf-8')
+@dataclass
+class PropSpan:
+    key_start: int
+    value_start: int
+    value_end: int
+    end: int  # past the trailing comma, if there is one
+    value: object  # first token of the value (unescaped for strings)
+    tokens: int
+
 
-    # Primero eliminamos homeworkInstructions existentes (si hay) para evitar duplicados
-    content = re.sub(r",?\s*homeworkInstructions:\s*'[^']*'\s*,?", "", content)
+@dataclass
+class SessionSpan:
+    start: int
+    close: int = -1  # offset of the closing brace
+    props: Dict[str, PropSpan] = field(default_factory=dict)
 
-    # Buscar cada sesión y agregar homeworkInstructions después del cierre de resources
-    for session_num in sorted(HOMEWORK_INSTRUCTIONS.keys()):
-        instructions = HOMEWORK_INSTRUCTIONS[session_num]
-        if instructions is None:
+    @property
+    def number(self) -> Optional[int]:
+        prop = self.props.get('sessionNumber')
+        return prop.value if prop and prop.tokens == 1 and isinstance(prop.value, int) else None
+
+
+def index_sessions(text: str) -> List[SessionSpan]:
+    """Spans of every top-level property of every object in the sessionsData array, in one pass."""
+    tokens = tokenize_ts_spans(text)
+    for kind, val, _, _ in tokens:
+        if kind == 'ident' and val == 'sessionsData':
+            break
+    else:
+        raise SessionsParseError('No se encontro sessionsData en sessions.ts')
+    # Skip the `SessionData[]` annotation: the literal starts after `=`.
+    for kind, val, _, _ in tokens:
+        if kind == 'punct' and val == '=':
+            break
+    for kind, val, _, _ in tokens:
+        if kind == 'punct' and val == '[':
+            break
+
+    sessions: List[SessionSpan] = []
+    current: Optional[SessionSpan] = None
+    depth = 0  # 0 = directly inside the array, 1 = inside a session object
+    state = 'key'
+    key: Optional[str] = None
+    key_start = value_start = value_end = count = 0
+    first: object = None
+
+    def close_prop(end: int) -> None:
+        if current is not None and key is not None and state == 'value' and count:
+            current.props.setdefault(key, PropSpan(key_start, value_start, value_end, end, first, count))
+
+    for kind, val, start, end in tokens:
+        if kind == 'punct' and val in '([{':
+            if depth == 0 and val == '{':
+                current, state, key = SessionSpan(start), 'key', None
+            elif depth >= 1 and state == 'value':
+                if not count:
+                    value_start, first = start, None
+                count += 1
+            depth += 1
+            continue
+        if kind == 'punct' and val in ')]}':
+            depth -= 1
+            if depth < 0:
+                break  # end of the sessions array
+            if depth == 0 and current is not None:
+                close_prop(value_end)
+                current.close = start
+                sessions.append(current)
+                current = None
+            elif state == 'value':
+                value_end = end
             continue
+        if depth != 1:
+            if depth > 1 and state == 'value':
+                value_end = end
+            continue
+        if kind == 'punct' and val == ',':
+            close_prop(end)
+            state, key = 'key', None
+        elif state == 'key':
+            if kind != 'punct':
+                key, key_start, state = str(val), start, 'colon'
+        elif state == 'colon':
+            if kind == 'punct' and val == ':':
+                state, count = 'value', 0
+        else:
+            if not count:
+                value_start, first = start, val
+            value_end = end
+            count += 1
+    return sessions
+
+
+def _line_start(text: str, pos: int) -> int:
+    return text.rfind('\n', 0, pos) + 1
 
-        # Escapar comillas simples en las instrucciones
-        escaped_instructions = instructions.replace("'", "\\'")
 
-        # Patrón: encontrar resources: [ ... ], seguido de },
-        # Usamos lookbehind para encontrar resources y lookahead para },
-        pattern = r"(resources:\s*\[[^\]]*\]\s*,)\n(\s*},)"
+def homework_edits(
+    text: str, sessions: List[SessionSpan], instructions: Dict[int, Optional[str]]
+) -> List[Tuple[int, int, str]]:
+    """(start, end, replacement) edits that bring every session in line with `instructions`."""
+    edits = []
+    for session in sessions:
+        if session.number not in instructions:
+            continue
+        wanted = instructions[session.number]
+        prop = session.props.get('homeworkInstructions')
+        if wanted is None:
+            if prop is not None:
+                start = _line_start(text, prop.key_start)
+                if text[start:prop.key_start].strip():
+                    start = prop.key_start  # not alone on its line
+                end = prop.end + 1 if text.startswith('\n', prop.end) else prop.end
+                edits.append((start, end, ''))
+            continue
+        literal = json.dumps(wanted, ensure_ascii=False)
+        if prop is not None:
+            if prop.tokens != 1 or prop.value != wanted:
+                edits.append((prop.value_start, prop.value_end, literal))
+            continue
+        anchor = session.props.get('resources')
+        if anchor is not None:
+            line = _line_start(text, anchor.key_start)
+            indent = text[line:anchor.key_start]
+            edits.append((line, line, f'{indent}homeworkInstructions: {literal},\n'))
+        elif session.props:
+            last = max(session.props.values(), key=lambda p: p.key_start)
+            line = _line_start(text, last.key_start)
+            indent = text[line:last.key_start]
+            if last.end > last.value_end:
+                edits.append((last.end, last.end, f'\n{indent}homeworkInstructions: {literal},'))
+            else:
+                edits.append((last.value_end, last.value_end, f',\n{indent}homeworkInstructions: {literal},'))
+    return edits
+
+
+def apply_edits(text: str, edits: List[Tuple[int, int, str]]) -> str:
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits):
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def add_homework_instructions_to_sessions(file_path: Path, check: bool = False) -> int:
+    """Agrega o actualiza homeworkInstructions; devuelve cuántas sesiones cambian."""
+    content = file_path.read_text(encoding='utf-8')
+    edits = homework_edits(content, index_sessions(content), HOMEWORK_INSTRUCTIONS)
+    if not edits:
+        print(f'Sin cambios: {file_path}')
+        return 0
+    if check:
+        print(f'{len(edits)} sesiones por actualizar en {file_path}')
+        return len(edits)
 
-        def replacement(match):
-            return f"{match.group(1)}\n    homeworkInstructions: '{escaped_instructions}',\n{match.group(2)}"
+    tmp = file_path.with_name(f'{file_path.name}.{os.getpid()}.tmp')
+    tmp.write_text(apply_edits(content, edits), encoding='utf-8')
+    os.replace(tmp, file_path)
+    print(f'✅ Archivo actualizado: {file_path} ({len(edits)} sesiones)')
+    return len(edits)
 
-        # Solo reemplazamos una vez por sesión
-        # Para hacer esto, buscamos sessionNumber específico
-        session_pattern = rf"(sessionNumber:\s*{session_num},.*?resources:\s*\[[^\]]*\]\s*,)\n(\s*}},)"
-        content = re.sub(session_pattern, replacement, content, flags=re.DOTALL)
 
-    # Escribir el contenido modificado
-    file_path.write_text(content, encoding='utf-8')
-    print(f"✅ Archivo actualizado: {file_path}")
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='Agrega homeworkInstructions a las sesiones de sessions.ts.')
+    ap.add_argument('path', nargs='?', default=SESSIONS_TS, type=Path, help='sessions.ts to patch')
+    ap.add_argument('--check', action='store_true', help='only report; exit 1 if the file would change')
+    args = ap.parse_args(argv)
+    changed = add_homework_instructions_to_sessions(args.path, args.check)
+    return 1 if args.check and changed else 0
 
 
 if __name__ == '__main__':
-    sessions_file = Path('/Users/javierbenitez/Desktop/AI/oral7/src/data/sessions.ts')
-    add_homework_instructions_to_sessions(sessions_file)
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark y fuzzing del parser de sessions.ts.
+
+Mide `parse_sessions_ts` sobre el sessions.ts real y sobre copias ampliadas
+(hasta 100x), ejecuta un corpus de entradas malformadas (cadenas y comentarios
+sin cerrar, anidamiento profundo, truncados aleatorios) y comprueba que el tiempo
+por byte se mantiene constante al crecer la entrada.
+
+Uso: python3 scripts/bench_parse_sessions.py [--max-scale 100] [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from generate_missing_session_pdfs import SESSIONS_TS, SessionsParseError, parse_sessions_text
+
+
+# Per-byte cost at the largest size may not exceed this multiple of the cost at
+# the smallest size. A quadratic parser blows through it by orders of magnitude.
+LINEARITY_LIMIT = 3.0
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+  best = float("inf")
+  for _ in range(repeat):
+    t0 = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - t0)
+  return best
+
+
+def scaled_sessions(text: str, factor: int) -> str:
+  """Repeat the body of the sessionsData array `factor` times."""
+  start = text.index("[", text.index("=", text.index("sessionsData"))) + 1
+  end = text.rindex("\n]")
+  body = text[start:end].rstrip()
+  if not body.endswith(","):
+    body += ","
+  return text[:start] + body * factor + text[end:]
+
+
+def fuzz_corpus(text: str, seed: int, cases: int) -> List[Tuple[str, str]]:
+  rnd = random.Random(seed)
+  corpus: List[Tuple[str, str]] = [
+    ("empty", ""),
+    ("no-array", "export const sessionsData: SessionData[] ="),
+    ("single-quote", text[: len(text) // 2] + "'" + "x" * 5000),
+    ("double-quote", text[: len(text) // 3] + '"' + "y\\" * 5000),
+    ("backtick", text[: len(text) // 4] + "`${" * 5000),
+    ("block-comment", text[: len(text) // 2] + "/*" + " * " * 5000),
+    ("line-comment", text[: len(text) // 2] + "// fin"),
+    ("deep-nesting", "const sessionsData = [" + "[{a:" * 50000),
+    ("stray-closers", "const sessionsData = [" + "}]" * 50000),
+    ("quote-soup", "const sessionsData = [" + "'\"`" * 50000),
+    ("slash-soup", "const sessionsData = [" + "\\/*/" * 50000),
+  ]
+  specials = ["'", '"', "`", "/*", "//", "{", "}", "[", "]", "\\", "(", ")", ":", ","]
+  for i in range(cases):
+    cut = rnd.randrange(len(text))
+    mutated = text[:cut] + rnd.choice(specials) + text[cut + rnd.randrange(0, 200):]
+    corpus.append((f"mutation-{i}", mutated))
+    corpus.append((f"truncated-{i}", text[: rnd.randrange(len(text))]))
+  return corpus
+
+
+def main() -> int:
+  ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  ap.add_argument("--max-scale", type=int, default=100)
+  ap.add_argument("--seed", type=int, default=7)
+  ap.add_argument("--fuzz-cases", type=int, default=200)
+  args = ap.parse_args()
+
+  with open(SESSIONS_TS, "r", encoding="utf-8") as f:
+    text = f.read()
+
+  print(f"sessions.ts: {text.count(chr(10)) + 1} lines, {len(text)} chars")
+  print(f"{'scale':>6} {'chars':>11} {'sessions':>9} {'seconds':>9} {'us/KB':>8}")
+  per_kb: List[float] = []
+  scales = sorted({s for s in (1, 10, args.max_scale) if s <= args.max_scale})
+  for scale in scales:
+    src = scaled_sessions(text, scale) if scale > 1 else text
+    n = len(parse_sessions_text(src))
+    secs = _best_of(lambda: parse_sessions_text(src), 3 if scale < 50 else 1)
+    per_kb.append(secs * 1e6 / (len(src) / 1024))
+    print(f"{scale:>6} {len(src):>11} {n:>9} {secs:>9.3f} {per_kb[-1]:>8.1f}")
+  growth = max(per_kb) / min(per_kb)
+
+  print(f"\nfuzz corpus (seed {args.seed})")
+  failures = 0
+  worst = ("", 0.0)
+  for name, src in fuzz_corpus(text, args.seed, args.fuzz_cases):
+    t0 = time.perf_counter()
+    try:
+      parse_sessions_text(src)
+    except SessionsParseError:
+      pass
+    except Exception as e:  # noqa: BLE001 - anything else is a parser bug
+      failures += 1
+      print(f"  FAIL {name}: {type(e).__name__}: {e}")
+      continue
+    us = (time.perf_counter() - t0) * 1e6 / max(len(src) / 1024, 1)
+    if us > worst[1]:
+      worst = (name, us)
+  print(f"  failed cases: {failures}; worst cost: {worst[1]:.1f} us/KB ({worst[0]})")
+
+  print(f"\nper-KB cost growth: {growth:.2f}x (limit {LINEARITY_LIMIT}x)")
+  if failures or growth > LINEARITY_LIMIT:
+    return 1
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Micro-benchmark del registro de estilos compartido (pdf_theme).
+
+Compara, por documento, reconstruir la hoja de estilos y los TableStyle (lo que
+hacía cada builder antes) frente a reutilizar las instancias memoizadas, y mide
+el efecto sobre `build_pdf` al renderizar cientos de documentos en un proceso.
+
+Uso: python3 scripts/bench_pdf_theme.py [--docs 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+import pdf_theme
+from generate_missing_session_pdfs import build_pdf, load_sessions
+
+
+def setup_once() -> None:
+    """Everything a handout builder asks the theme for."""
+    pdf_theme.handout_styles()
+    pdf_theme.handout_styles(compact=True)
+    pdf_theme.grid_table_style("#eef2ff")
+    pdf_theme.box_table_style()
+
+
+def _timed(n: int, fn: Callable[[int], None]) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--docs", type=int, default=300)
+    args = ap.parse_args()
+    n = args.docs
+
+    def cold_setup(_: int) -> None:
+        pdf_theme.clear_caches()
+        setup_once()
+
+    pdf_theme.clear_caches()
+    cold = _timed(n, cold_setup)
+    warm = _timed(n, lambda _: setup_once())
+    print(f"style setup x{n}: rebuilt {cold * 1000:.1f} ms, shared {warm * 1000:.2f} ms "
+          f"({(cold - warm) / n * 1e6:.0f} us saved per document)")
+
+    sessions = [s for s in load_sessions() if s.resources]
+    tmp = tempfile.mkdtemp(prefix="bench-pdf-theme-")
+
+    def render(i: int) -> None:
+        s = sessions[i % len(sessions)]
+        build_pdf(os.path.join(tmp, "bench.pdf"), s.resources[0].title, s, [s.session_number])
+
+    render(0)  # import reportlab and load fonts outside the timings
+    cold = _timed(n, lambda i: (pdf_theme.clear_caches(), render(i)))
+    warm = _timed(n, render)
+    print(f"build_pdf x{n}: rebuilt styles {cold:.2f} s, shared styles {warm:.2f} s "
+          f"({(cold - warm) / cold * 100:.1f}% less)")
+    os.remove(os.path.join(tmp, "bench.pdf"))
+    os.rmdir(tmp)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
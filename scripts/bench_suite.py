@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Suite de benchmarks de la cadena de PDFs, con baselines en JSON.
+
+Mide, sobre sessions.ts sintéticos (synthetic_sessions.py) de 1k y 10k sesiones:
+
+  parse:<n>        parse_sessions_ts (lectura + tokenizer + construcción de Session)
+  tokenize:<n>     tokenize_ts + iter_array_literal solos, sin construir Session
+  build_pdf        resúmenes de sesión (build_pdf) de sesiones sintéticas
+  table:<n>        glosario de n filas sintéticas (build_glossary + pdf_tables),
+                   con las cachés de anchos vacías al empezar cada ejecución
+  session<N>       las fichas de contenido-pdfs/fichas/sesion-NN.json, con el
+                   motor de handout_layout ya caliente
+
+Cada resultado es el mejor de --repeat ejecuciones. --save escribe los
+resultados como baseline; --compare los contrasta con una baseline y sale con 1
+si alguno empeora más de --threshold (por defecto 20 %). Las baselines dependen
+de la máquina, así que por defecto viven en .cache/.
+
+Uso:
+  python3 scripts/bench_suite.py --save                  # crea la baseline
+  python3 scripts/bench_suite.py --compare               # falla si hay regresión
+  python3 scripts/bench_suite.py --sizes 1000 --only 'parse:*' --compare
+  python3 scripts/bench_suite.py --rows 5000,50000 --only 'table:*' --repeat 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import build_glossary
+import generate_missing_session_pdfs as missing
+import handout_layout
+import pdf_tables
+from synthetic_sessions import synthetic_sessions_ts, synthetic_vocab_rows
+
+
+BASELINE = os.path.join(missing.CACHE_DIR, "bench-baseline.json")
+
+# Differences below this are timer and scheduler noise, not regressions.
+NOISE_FLOOR_S = 0.005
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float  # best of the repeats
+    units: int  # items processed per run (sessions, documents...)
+    unit: str
+
+    @property
+    def per_unit_ms(self) -> float:
+        return self.seconds * 1000 / max(self.units, 1)
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _consume_tokens(text: str) -> int:
+    items = 0
+    for _ in missing.iter_array_literal(missing._find_sessions_array(missing.tokenize_ts(text))):
+        items += 1
+    return items
+
+
+def run_suite(
+    sizes: Sequence[int], docs: int, repeat: int, only: Sequence[str], seed: int, rows: Sequence[int] = ()
+) -> List[Result]:
+    def wanted(name: str) -> bool:
+        return not only or any(fnmatch.fnmatchcase(name, p) for p in only)
+
+    results: List[Result] = []
+    tmp = tempfile.mkdtemp(prefix="bench-suite-")
+    try:
+        corpus: Optional[List[missing.Session]] = None
+        for n in sizes:
+            if not (wanted(f"parse:{n}") or wanted(f"tokenize:{n}")):
+                continue
+            src = os.path.join(tmp, f"sessions-{n}.ts")
+            text = synthetic_sessions_ts(n, seed)
+            with open(src, "w", encoding="utf-8") as f:
+                f.write(text)
+            if wanted(f"parse:{n}"):
+                parsed = missing.parse_sessions_ts(src)
+                if len(parsed) != n:
+                    raise RuntimeError(f"El sessions.ts sintetico de {n} sesiones dio {len(parsed)}")
+                corpus = corpus or parsed
+                results.append(Result(f"parse:{n}", _best_of(lambda: missing.parse_sessions_ts(src), repeat), n, "session"))
+            if wanted(f"tokenize:{n}"):
+                results.append(Result(f"tokenize:{n}", _best_of(lambda: _consume_tokens(text), repeat), n, "session"))
+
+        if wanted("build_pdf") and docs > 0:
+            if corpus is None:
+                corpus = missing.parse_sessions_text(synthetic_sessions_ts(max(docs, 50), seed))
+            picked = [s for s in corpus if s.resources][:docs]
+            out = os.path.join(tmp, "summary.pdf")
+
+            def render_summaries() -> None:
+                for s in picked:
+                    missing.build_pdf(out, s.resources[0].title, s, [s.session_number])
+
+            render_summaries()  # import reportlab and load fonts outside the timings
+            results.append(Result("build_pdf", _best_of(render_summaries, repeat), len(picked), "document"))
+
+        for n in rows:
+            if not wanted(f"table:{n}"):
+                continue
+            vocab = synthetic_vocab_rows(n, seed)
+            out = os.path.join(tmp, f"glossary-{n}.pdf")
+
+            def render_glossary(vocab=vocab, out=out) -> None:
+                pdf_tables.clear_caches()
+                build_glossary.build_glossary_pdf(out, vocab)
+
+            results.append(Result(f"table:{n}", _best_of(render_glossary, repeat), n, "row"))
+
+        for spec in handout_layout.load_specs():
+            if not wanted(spec.builder):
+                continue
+
+            def render_spec(spec=spec) -> None:
+                for fname in spec.handouts:
+                    handout_layout.render_handout(os.path.join(tmp, fname), spec.path, fname)
+
+            render_spec()
+            results.append(Result(spec.builder, _best_of(render_spec, repeat), len(spec.handouts), "document"))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    import reportlab
+
+    return {
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+
+
+def save_baseline(results: List[Result], path: str) -> None:
+    data = {"environment": environment(), "results": {r.name: asdict(r) for r in results}}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("environment") != environment():
+        print(f"warning: baseline recorded with {data.get('environment')}, running {environment()}")
+    return data.get("results", {})
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Names of results slower than their baseline by more than threshold (per unit)."""
+    regressed = []
+    for r in results:
+        old = baseline.get(r.name)
+        if old is None:
+            continue
+        old_per_unit = old["seconds"] / max(old["units"], 1)
+        new_per_unit = r.seconds / max(r.units, 1)
+        if new_per_unit > old_per_unit * (1 + threshold) and r.seconds - old["seconds"] > NOISE_FLOOR_S:
+            regressed.append(r.name)
+    return regressed
+
+
+def print_results(results: List[Result], baseline: Optional[Dict[str, dict]], regressed: Sequence[str]) -> None:
+    print(f"{'benchmark':<16} {'units':>7} {'seconds':>9} {'ms/unit':>9} {'baseline':>9} {'change':>8}")
+    for r in results:
+        line = f"{r.name:<16} {r.units:>7} {r.seconds:>9.3f} {r.per_unit_ms:>9.3f}"
+        old = (baseline or {}).get(r.name)
+        if old:
+            old_per_unit = old["seconds"] * 1000 / max(old["units"], 1)
+            line += f" {old_per_unit:>9.3f} {(r.per_unit_ms / old_per_unit - 1) * 100:>+7.1f}%"
+            if r.name in regressed:
+                line += "  REGRESSION"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks del parser y los generadores de PDF.")
+    ap.add_argument("--sizes", default="1000,10000", help="comma-separated synthetic session counts")
+    ap.add_argument("--rows", default="5000,50000", help="comma-separated glossary sizes for table:<n>")
+    ap.add_argument("--docs", type=int, default=50, metavar="N", help="build_pdf documents per run")
+    ap.add_argument("--repeat", type=int, default=3, metavar="N", help="runs per benchmark (best is kept)")
+    ap.add_argument("--only", action="append", default=[], metavar="PATTERN", help="benchmark name glob")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--save", nargs="?", const=BASELINE, metavar="FILE", help="write results as baseline")
+    ap.add_argument("--compare", nargs="?", const=BASELINE, metavar="FILE", help="compare with a baseline")
+    ap.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown per unit (default 0.20)")
+    args = ap.parse_args(argv)
+
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        rows = [int(s) for s in args.rows.split(",") if s.strip()]
+    except ValueError:
+        ap.error(f"--sizes o --rows invalido: {args.sizes!r}, {args.rows!r}")
+    baseline = None
+    if args.compare:
+        if not os.path.exists(args.compare):
+            ap.error(f"No se encontro la baseline {args.compare} (creala con --save)")
+        baseline = load_baseline(args.compare)
+
+    results = run_suite(sizes, args.docs, args.repeat, args.only, args.seed, rows)
+    regressed = compare(results, baseline, args.threshold) if baseline is not None else []
+    print_results(results, baseline, regressed)
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"Baseline written: {args.save}")
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Dossier del curso: todos los recursos de public/resources en un solo PDF.
+
+Une los PDFs ya generados en el orden de las sesiones, sin volver a
+renderizarlos: copia sus páginas (objetos de página de pikepdf/qpdf) detrás de
+un índice generado con reportlab, que es lo único que se maqueta.
+
+  - Marcadores por bloque > sesión > recurso.
+  - Índice con la página de cada recurso. Un recurso usado en varias sesiones
+    se incluye una sola vez (en la primera) y las demás apuntan a esas páginas;
+    lo mismo para dos URLs con el mismo contenido.
+  - Las fuentes, imágenes y demás recursos de página idénticos entre ficheros
+    se fusionan en un solo objeto, así que el dossier no repite Helvetica 60 veces.
+
+El mapa URL -> sesiones es el de generate_missing_session_pdfs.collect_resources.
+Necesita pikepdf (pip install pikepdf).
+
+Uso: python3 scripts/build_dossier.py [-o dossier-curso.pdf] [--sessions 1-14]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import generate_missing_session_pdfs as missing
+from pdf_output import linearized, render, stamp_date, write_if_changed
+
+
+DEFAULT_OUTPUT = os.path.join(missing.ROOT, "dossier-curso.pdf")
+
+# Page resource categories whose entries are shared objects worth merging.
+RESOURCE_KINDS = ("/Font", "/XObject", "/ExtGState", "/ColorSpace", "/Pattern", "/Shading")
+
+
+@dataclass
+class Part:
+    """One resource file in the dossier."""
+
+    url: str
+    title: str
+    path: str
+    pages: int
+    first_page: int = 0  # 0-based index in the dossier, set once the index length is known
+
+
+@dataclass
+class SessionEntry:
+    session: missing.Session
+    parts: List[Tuple[str, Part]] = field(default_factory=list)  # (title in this session, part)
+
+
+def plan(sessions: List[missing.Session], resources_dir: str) -> Tuple[List[SessionEntry], List[Part], List[str]]:
+    """Sessions in order with their parts, the distinct parts in dossier order, and missing urls."""
+    import pikepdf
+
+    uses = missing.collect_resources(sessions)
+    by_url: Dict[str, Part] = {}
+    by_digest: Dict[str, Part] = {}
+    parts: List[Part] = []
+    missing_urls: List[str] = []
+    entries: List[SessionEntry] = []
+    for s in sorted(sessions, key=lambda s: s.session_number):
+        entry = SessionEntry(s)
+        for r in s.resources:
+            use = uses.get(r.url)
+            if use is None or r.url in missing_urls:
+                continue
+            part = by_url.get(r.url)
+            if part is None:
+                path = os.path.join(resources_dir, use.filename)
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    missing_urls.append(r.url)
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                part = by_digest.get(digest)
+                if part is None:
+                    with pikepdf.open(io.BytesIO(data)) as pdf:
+                        part = Part(r.url, use.title, path, len(pdf.pages))
+                    by_digest[digest] = part
+                    parts.append(part)
+                by_url[r.url] = part
+            if all(p is not part for _, p in entry.parts):
+                entry.parts.append((r.title, part))
+        entries.append(entry)
+    return entries, parts, missing_urls
+
+
+def _toc_pdf(entries: List[SessionEntry]) -> Tuple[bytes, int]:
+    """Render the index, numbering dossier pages from 1; returns (pdf bytes, its page count)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+
+    from pdf_theme import grid_table_style, handout_styles
+
+    h1, h2, p, small = handout_styles(compact=True)
+    doc = SimpleDocTemplate(
+        io.BytesIO(),
+        pagesize=A4,
+        leftMargin=1.6 * cm,
+        rightMargin=1.6 * cm,
+        topMargin=1.5 * cm,
+        bottomMargin=1.5 * cm,
+        title="Dossier del curso",
+        author="oral7",
+    )
+    story: List[object] = [
+        Paragraph("Dossier del curso", h1),
+        Paragraph(f"Recursos de las sesiones en orden · Actualizado: {stamp_date(missing.SESSIONS_TS)}", small),
+        Spacer(1, 8),
+    ]
+    block = None
+    seen: Dict[int, int] = {}  # id(part) -> session that first included it
+    for entry in entries:
+        s = entry.session
+        if not entry.parts:
+            continue
+        if s.block_number != block and s.block_number is not None:
+            block = s.block_number
+            story.append(Paragraph(f"Bloque {block}: {s.block_title or ''}", h2))
+        rows = []
+        for title, part in entry.parts:
+            first = seen.setdefault(id(part), s.session_number)
+            note = f" <font size=7>(ver sesión {first})</font>" if first != s.session_number else ""
+            rows.append([Paragraph(title + note, p), Paragraph(str(part.first_page + 1), p)])
+        header = f"Sesión {s.session_number}" + (f" · {s.date_str}" if s.date_str else "") + f": {s.title}"
+        table = Table([[Paragraph(f"<b>{header}</b>", p), ""], *rows], colWidths=[15.3 * cm, 1.5 * cm])
+        table.setStyle(grid_table_style("#eef2ff"))
+        story += [table, Spacer(1, 6)]
+    data = render(doc, story, missing.SESSIONS_TS)
+    return data, doc.page
+
+
+def _fingerprint(obj: object, memo: Dict[Tuple[int, int], str]) -> str:
+    """Content hash of a PDF object, following references, so equal objects from different files match."""
+    import pikepdf
+
+    key = obj.objgen if isinstance(obj, pikepdf.Object) and obj.is_indirect else None
+    if key is not None:
+        if key in memo:
+            return memo[key]
+        memo[key] = f"cycle{key}"  # placeholder while this object is being hashed
+    h = hashlib.sha256()
+    if isinstance(obj, pikepdf.Stream):
+        h.update(b"S")
+        for k in sorted(obj.keys()):
+            if k != "/Length":
+                h.update(f"{k}={_fingerprint(obj[k], memo)};".encode())
+        h.update(obj.read_raw_bytes())
+    elif isinstance(obj, pikepdf.Dictionary):
+        h.update(b"D")
+        for k in sorted(obj.keys()):
+            h.update(f"{k}={_fingerprint(obj[k], memo)};".encode())
+    elif isinstance(obj, pikepdf.Array):
+        h.update(b"A")
+        for item in obj:
+            h.update(f"{_fingerprint(item, memo)},".encode())
+    else:
+        h.update(repr(obj).encode())
+    fp = h.hexdigest()
+    if key is not None:
+        memo[key] = fp
+    return fp
+
+
+def dedupe_resources(pdf) -> int:
+    """Point every page at one copy of each distinct font, image or other shared resource.
+
+    Returns the number of references redirected; the duplicates become
+    unreachable and are not written.
+    """
+    import pikepdf
+
+    memo: Dict[Tuple[int, int], str] = {}
+    canonical: Dict[str, object] = {}
+    merged = 0
+
+    def shared(obj):
+        nonlocal merged
+        if not (isinstance(obj, pikepdf.Object) and obj.is_indirect):
+            return obj
+        keep = canonical.setdefault(_fingerprint(obj, memo), obj)
+        if keep.objgen != obj.objgen:
+            merged += 1
+        return keep
+
+    for page in pdf.pages:
+        resources = page.obj.get("/Resources")
+        if not isinstance(resources, pikepdf.Dictionary):
+            continue
+        for kind in RESOURCE_KINDS:
+            group = resources.get(kind)
+            if not isinstance(group, pikepdf.Dictionary):
+                continue
+            for name in list(group.keys()):
+                group[name] = shared(group[name])
+            resources[kind] = shared(group)
+    return merged
+
+
+def build_dossier(
+    sessions: List[missing.Session], out_path: str, resources_dir: str = missing.OUT_DIR
+) -> Tuple[bool, Dict[str, object]]:
+    """Write the dossier; returns (written, stats)."""
+    import pikepdf
+
+    entries, parts, missing_urls = plan(sessions, resources_dir)
+    if not parts:
+        raise RuntimeError(f"No hay PDFs de sesiones en {resources_dir}")
+
+    # The index comes first, so part page numbers depend on its length: re-render
+    # until the guess holds (once, unless the index spills onto another page).
+    toc_pages = 1
+    while True:
+        start = toc_pages
+        for part in parts:
+            part.first_page = start
+            start += part.pages
+        toc, pages = _toc_pdf(entries)
+        if pages == toc_pages:
+            break
+        toc_pages = pages
+
+    dossier = pikepdf.open(io.BytesIO(toc))
+    sources = []
+    try:
+        for part in parts:
+            src = pikepdf.open(part.path)
+            sources.append(src)
+            dossier.pages.extend(src.pages)
+        merged = dedupe_resources(dossier)
+
+        with dossier.open_outline() as outline:
+            outline.root.clear()
+            outline.root.append(pikepdf.OutlineItem("Índice", 0))
+            block_item = None
+            block = None
+            for entry in entries:
+                if not entry.parts:
+                    continue
+                s = entry.session
+                item = pikepdf.OutlineItem(f"Sesión {s.session_number}: {s.title}", entry.parts[0][1].first_page)
+                item.children.extend(pikepdf.OutlineItem(t, p.first_page) for t, p in entry.parts)
+                if s.block_number is None:
+                    outline.root.append(item)
+                    continue
+                if s.block_number != block:
+                    block = s.block_number
+                    block_item = pikepdf.OutlineItem(f"Bloque {block}: {s.block_title or ''}", item.destination)
+                    outline.root.append(block_item)
+                block_item.children.append(item)
+        dossier.Root.PageMode = pikepdf.Name.UseOutlines
+
+        out = io.BytesIO()
+        dossier.save(
+            out,
+            linearize=linearized(),
+            deterministic_id=True,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+    finally:
+        dossier.close()
+        for src in sources:
+            src.close()
+
+    data = out.getvalue()
+    stats: Dict[str, object] = {
+        "parts": len(parts),
+        "pages": toc_pages + sum(p.pages for p in parts),
+        "index_pages": toc_pages,
+        "merged_resources": merged,
+        "input_bytes": sum(os.path.getsize(p.path) for p in parts),
+        "bytes": len(data),
+        "missing": missing_urls,
+    }
+    return write_if_changed(out_path, data), stats
+
+
+def _session_range(value: str) -> Tuple[int, int]:
+    first, _, last = value.partition("-")
+    try:
+        return int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"rango de sesiones invalido: {value!r} (usa N o N-M)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Une los PDFs de public/resources en un dossier con índice y marcadores.")
+    ap.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="output PDF (default: dossier-curso.pdf)")
+    ap.add_argument("--sessions", type=_session_range, metavar="N-M", help="only sessions N to M (a semester)")
+    ap.add_argument("--resources-dir", default=missing.OUT_DIR, help="directory with the rendered handouts")
+    args = ap.parse_args(argv)
+    try:
+        import pikepdf  # noqa: F401
+    except ImportError:
+        ap.error("build_dossier.py necesita pikepdf (pip install pikepdf)")
+
+    t0 = time.perf_counter()
+    sessions = missing.load_sessions()
+    if args.sessions:
+        first, last = args.sessions
+        sessions = [s for s in sessions if first <= s.session_number <= last]
+    written, stats = build_dossier(sessions, args.output, args.resources_dir)
+    for url in stats["missing"]:  # type: ignore[union-attr]
+        print(f"  missing, skipped: {url}")
+    print(
+        f"{'Wrote' if written else 'Unchanged'}: {os.path.relpath(args.output)} "
+        f"({stats['pages']} pages from {stats['parts']} PDFs, index {stats['index_pages']} page(s); "
+        f"{stats['merged_resources']} duplicate resources merged; "
+        f"{stats['input_bytes'] / 1024:.0f} KB in -> {stats['bytes'] / 1024:.0f} KB) "
+        f"in {time.perf_counter() - t0:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Glosario C1: todo el vocabularyContent del curso en una tabla alfabética.
+
+Lee los términos del almacén compilado (compile_sessions.py) y los maqueta con
+pdf_tables, que parte la tabla en trozos de una página mientras la recorre, así
+que el coste crece con el número de filas y no con su cuadrado. Un mismo
+término con la misma definición en varias sesiones ocupa una sola fila.
+
+Uso: python3 scripts/build_glossary.py [-o public/resources/glosario-c1.pdf]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import time
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import compile_sessions
+import generate_missing_session_pdfs as missing
+from pdf_output import save, stamp_date
+
+
+DEFAULT_OUTPUT = os.path.join(missing.OUT_DIR, "glosario-c1.pdf")
+HEADER = ("Término", "Categoría", "Definición", "Ejemplo", "Ses.")
+COL_WIDTHS_CM = (3.4, 2.2, 5.6, 5.4, 1.2)
+
+Row = Tuple[str, str, str, str, str]  # term, category, definition, example, sessions
+
+
+def _sort_key(term: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", term.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def glossary_rows(con) -> List[Row]:
+    """One row per distinct (term, definition), alphabetical ignoring case and accents."""
+    merged: Dict[Tuple[str, str], List[object]] = {}
+    for r in con.execute("SELECT session, term, definition, example, category FROM vocab ORDER BY session, position"):
+        key = (_sort_key(r["term"]), (r["definition"] or "").strip())
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = [r["term"], r["category"] or "", r["definition"] or "", r["example"] or "", [r["session"]]]
+        elif r["session"] not in entry[4]:
+            entry[4].append(r["session"])  # type: ignore[union-attr]
+    rows = [(t, c, d, e, ", ".join(map(str, s))) for t, c, d, e, s in merged.values()]
+    rows.sort(key=lambda r: (_sort_key(r[0]), r[0]))
+    return rows
+
+
+def build_glossary_pdf(out_path: str, rows: Sequence[Row], source_path: str = missing.SESSIONS_TS) -> bool:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    from pdf_tables import frame_height, story_height, table_chunks
+    from pdf_theme import handout_styles
+
+    h1, _, _, small = handout_styles(compact=True)
+    doc = SimpleDocTemplate(
+        io.BytesIO(),
+        pagesize=A4,
+        leftMargin=1.6 * cm,
+        rightMargin=1.6 * cm,
+        topMargin=1.5 * cm,
+        bottomMargin=1.5 * cm,
+        title="Glosario C1",
+        author="oral7",
+    )
+    sessions = len({s for r in rows for s in r[4].split(", ") if s})
+    story: List[object] = [
+        Paragraph("Glosario C1", h1),
+        Paragraph(f"{len(rows)} términos de {sessions} sesiones · Actualizado: {stamp_date(source_path)}", small),
+        Spacer(1, 8),
+    ]
+    page = frame_height(doc)
+    first = page - story_height(story, doc.width)
+    story += table_chunks(HEADER, rows, [w * cm for w in COL_WIDTHS_CM], page, first)
+    return save(doc, story, out_path, source_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera el glosario C1 con todo el vocabulario de sessions.ts.")
+    ap.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="output PDF (default: public/resources/glosario-c1.pdf)")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    con = compile_sessions.connect()
+    try:
+        rows = glossary_rows(con)
+    finally:
+        con.close()
+    written = build_glossary_pdf(args.output, rows)
+    print(
+        f"{'Wrote' if written else 'Unchanged'}: {os.path.relpath(args.output)} "
+        f"({len(rows)} terms) in {time.perf_counter() - t0:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
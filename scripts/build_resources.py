@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Punto de entrada único para generar los PDFs de public/resources.
+
+Registra las fichas declarativas de contenido-pdfs/fichas/ (handout_layout.py),
+los handouts de contenido-pdfs/ (render_markdown_pdfs.py) y los resúmenes por sesión de
+generate_missing_session_pdfs.py, y los ejecuta en un solo proceso (o en un pool
+con --jobs) importando reportlab una vez.
+
+Ejemplos:
+  python3 scripts/build_resources.py                      # todo lo que haga falta
+  python3 scripts/build_resources.py --session 3 --dry-run
+  python3 scripts/build_resources.py subjuntivo-duda.pdf '2?-*.pdf' -j 8
+  python3 scripts/build_resources.py --builder markdown --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import generate_missing_session_pdfs as missing
+import handout_layout
+import pdf_metrics
+import pdf_profile
+import precompress_resources
+import render_markdown_pdfs
+import resources_manifest
+from pdf_output import enable_linearize, enable_reproducible, output_options
+
+
+OUT_DIR = missing.OUT_DIR
+
+
+@dataclass
+class Target:
+    name: str  # output filename inside public/resources
+    builder: str
+    sessions: Tuple[int, ...]
+    func: Callable[..., bool]  # returns False if the output already had identical bytes
+    args: tuple = ()
+    # Only set for targets tracked in the build manifest.
+    input_hashes: Optional[Dict[str, str]] = None
+    url: Optional[str] = None
+    template: int = missing.TEMPLATE_VERSION
+    # Reproducible date of a summary, from its build-manifest entry (set by plan()).
+    epoch: Optional[int] = None
+
+    @property
+    def out_path(self) -> str:
+        return os.path.join(OUT_DIR, self.name)
+
+    @property
+    def public_url(self) -> str:
+        return self.url or f"/resources/{self.name}"
+
+    def build(self, out_path: str) -> bool:
+        if self.epoch is None:
+            return self.func(out_path, *self.args)
+        return self.func(out_path, *self.args, epoch=self.epoch)
+
+
+@dataclass
+class TargetRun:
+    target: Target
+    status: str  # "build", "up-to-date" or "unmanaged"
+    reasons: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+    written: bool = True
+    phases: Dict[str, float] = field(default_factory=dict)  # pdf_profile.PHASES -> seconds
+    metrics: Dict[str, object] = field(default_factory=dict)  # one pdf_metrics JSONL record
+
+
+def owned_outputs(referenced: Optional[Set[str]] = None) -> Dict[str, str]:
+    """Output filename -> builder for outputs a handout spec or markdown source produces.
+
+    Those filenames never get a generic sessions.ts summary, here or in
+    generate_missing_session_pdfs.py. With `referenced`, markdown sources nobody
+    links to are left out.
+    """
+    owned = {fname: spec.builder for spec in handout_layout.load_specs() for fname in spec.handouts}
+    for fname in render_markdown_pdfs.markdown_sources(referenced):
+        owned.setdefault(fname, "markdown")
+    return owned
+
+
+def registry(sessions: Sequence[missing.Session]) -> List[Target]:
+    """Every known output: handout specs, markdown handouts, then summaries.
+
+    A sessions.ts resource whose filename is produced by a handout spec or a
+    markdown source is owned by it and gets no generic summary target.
+    """
+    targets: List[Target] = []
+    uses = missing.collect_resources(list(sessions))
+    by_name = {use.filename: use for use in uses.values()}
+    for spec in handout_layout.load_specs():
+        for fname in spec.handouts:
+            use = by_name.get(fname)
+            used_in = tuple(use.used_in) if use else (spec.session,)
+            targets.append(
+                Target(
+                    fname,
+                    spec.builder,
+                    used_in,
+                    handout_layout.render_handout,
+                    (spec.path, fname),
+                    {"spec": render_markdown_pdfs.source_hash(spec.path), **output_options()},
+                    use.url if use else None,
+                    handout_layout.ENGINE_VERSION,
+                )
+            )
+    for fname, source in render_markdown_pdfs.markdown_sources(set(by_name)).items():
+        targets.append(
+            Target(
+                fname,
+                "markdown",
+                tuple(by_name[fname].used_in),
+                render_markdown_pdfs.render_markdown_pdf,
+                (source,),
+                {"source": render_markdown_pdfs.source_hash(source), **output_options()},
+                by_name[fname].url,
+                render_markdown_pdfs.RENDERER_VERSION,
+            )
+        )
+    owned = owned_outputs(set(by_name))
+    for use in uses.values():
+        if use.filename in owned:
+            continue
+        targets.append(
+            Target(
+                use.filename,
+                missing.SUMMARY_BUILDER,
+                tuple(use.used_in),
+                missing.build_pdf,
+                (use.title, use.primary, use.used_in),
+                {**missing.hash_inputs(missing.pdf_inputs(use.title, use.primary, use.used_in)), **output_options()},
+                use.url,
+            )
+        )
+    return targets
+
+
+def select(
+    targets: List[Target], names: Sequence[str], sessions: Sequence[int], builders: Sequence[str] = ()
+) -> List[Target]:
+    """Keep targets matching any filename pattern, session and builder (each only if given)."""
+    picked = []
+    for t in targets:
+        if names and not any(fnmatch.fnmatch(t.name, pat) for pat in names):
+            continue
+        if builders and t.builder not in builders:
+            continue
+        if sessions and not set(sessions) & set(t.sessions):
+            continue
+        picked.append(t)
+    return picked
+
+
+def plan(targets: List[Target], manifest: Dict[str, dict], force: bool) -> List[TargetRun]:
+    runs = []
+    for t in targets:
+        if t.input_hashes is None:
+            runs.append(TargetRun(t, "build", ["forced" if force else "untracked"]))
+            continue
+        entry = manifest.get(t.name)
+        exists = os.path.exists(t.out_path)
+        status, reasons = missing.build_decision(entry, t.input_hashes, exists, force, t.template, t.out_path)
+        if t.builder == missing.SUMMARY_BUILDER:
+            t = replace(t, epoch=missing.summary_epoch(entry, t.input_hashes))
+        runs.append(TargetRun(t, status, reasons))
+    return runs
+
+
+def _warm_worker() -> None:
+    import pdf_theme
+
+    pdf_theme.handout_styles()
+    pdf_theme.handout_styles(compact=True)
+
+
+def _run(target: Target, out_path: str) -> Tuple[float, Optional[str], bool, pdf_metrics.Measurement]:
+    t0 = time.perf_counter()
+    try:
+        with pdf_metrics.measure(target.builder, target.name, target.sessions) as m:
+            written = target.build(out_path)
+    except Exception:
+        return time.perf_counter() - t0, traceback.format_exc(), False, pdf_metrics.Measurement()
+    return time.perf_counter() - t0, None, written, m
+
+
+def execute(runs: List[TargetRun], workers: int = 1) -> None:
+    """Build every run with status "build", filling in its timing and error."""
+    todo = [r for r in runs if r.status == "build"]
+    if workers <= 1 or len(todo) <= 1:
+        results = [_run(r.target, r.target.out_path) for r in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), initializer=_warm_worker) as pool:
+            results = list(pool.map(_run, [r.target for r in todo], [r.target.out_path for r in todo]))
+    for run, (seconds, error, written, m) in zip(todo, results):
+        run.seconds, run.error, run.written, run.phases, run.metrics = seconds, error, written, m.phases, m.record
+
+
+def record(runs: List[TargetRun], manifest: Dict[str, dict]) -> bool:
+    """Store manifest entries for tracked targets that built cleanly; True if any changed."""
+    built = [r for r in runs if r.status == "build" and not r.error and r.target.input_hashes is not None]
+    for r in built:
+        manifest[r.target.name] = missing.manifest_entry(
+            r.target.public_url, r.target.input_hashes, r.target.template, r.target.builder, r.target.epoch
+        )
+    return bool(built)
+
+
+def publish(sessions: Sequence[missing.Session]) -> int:
+    """Rewrite resources-manifest.json for every /resources url in `sessions`."""
+    uses = missing.collect_resources(sessions).values()
+    return resources_manifest.publish((u.url, os.path.join(OUT_DIR, u.filename), u.used_in) for u in uses)
+
+
+def log_metrics(runs: List[TargetRun]) -> int:
+    """Append the metrics of every output built in `runs` to the pdf_metrics sink."""
+    return pdf_metrics.append(r.metrics for r in runs if r.status == "build" and not r.error)
+
+
+def print_report(runs: List[TargetRun], dry_run: bool) -> None:
+    width = max([len(r.target.name) for r in runs] + [6])
+    print(f"{'target':<{width}}  {'builder':<16} {'sessions':<12} {'status':<11} {'ms':>8}  reason")
+    for r in runs:
+        status = r.status
+        if status == "build":
+            status = "would build" if dry_run else ("FAILED" if r.error else "built" if r.written else "unchanged")
+        ms = f"{r.seconds * 1000:8.1f}" if r.status == "build" and not dry_run else f"{'-':>8}"
+        sessions = ",".join(map(str, r.target.sessions))
+        line = f"{r.target.name:<{width}}  {r.target.builder:<16} {sessions:<12} {status:<11} {ms}  {'; '.join(r.reasons)}"
+        print(line.rstrip())
+    for r in runs:
+        if r.error:
+            print(f"\n{r.target.name}:\n{r.error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera los PDFs de public/resources desde un único proceso.")
+    ap.add_argument("targets", nargs="*", metavar="FILE", help="output filenames or glob patterns (default: all)")
+    ap.add_argument("--session", "-s", type=int, action="append", default=[], help="only targets used in session N")
+    ap.add_argument(
+        "--builder", "-b", action="append", default=[], help="only targets of this builder (session2, markdown, ...)"
+    )
+    ap.add_argument("--dry-run", "-n", action="store_true", help="show what would be built and why")
+    ap.add_argument("--force", action="store_true", help="rebuild selected targets even if up to date or unmanaged")
+    ap.add_argument("--jobs", "-j", type=int, default=1, metavar="N", help="render with N worker processes")
+    ap.add_argument("--no-cache", action="store_true", help="parse sessions.ts even if the parse cache is valid")
+    ap.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="date each PDF from the last change of its source (also on if SOURCE_DATE_EPOCH is set)",
+    )
+    ap.add_argument("--linearize", action="store_true", help="write linearized (fast web view) PDFs; needs pikepdf")
+    ap.add_argument(
+        "--precompress", action="store_true", help="afterwards write .br/.gz variants and .etag files for OUT_DIR"
+    )
+    ap.add_argument("--profile", action="store_true", help="print parse/story/layout/write timings per document")
+    ap.add_argument(
+        "--profile-out",
+        metavar="FILE.pstats",
+        help="also run under cProfile and write FILE.pstats plus FILE.collapsed (flamegraph stacks); implies --profile",
+    )
+    ap.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="append per-document metrics to FILE (default: PDF_METRICS or .cache/render-metrics.jsonl)",
+    )
+    ap.add_argument("--no-metrics", action="store_true", help="do not record per-document metrics")
+    args = ap.parse_args(argv)
+    if args.metrics or args.no_metrics:
+        pdf_metrics.set_sink(None if args.no_metrics else os.path.abspath(args.metrics))
+    if args.reproducible:
+        enable_reproducible()
+    if args.linearize:
+        try:
+            enable_linearize()
+        except RuntimeError as e:
+            ap.error(str(e))
+    if args.profile_out and args.jobs > 1:
+        print("--profile-out: rendering in-process so cProfile sees every document (ignoring --jobs)")
+        args.jobs = 1
+    with pdf_profile.profiled(args.profile_out):
+        return _build(args)
+
+
+def _build(args: argparse.Namespace) -> int:
+    t0 = time.perf_counter()
+    sessions = missing.load_sessions(cache_path=None if args.no_cache else missing.PARSE_CACHE)
+    parse_seconds = time.perf_counter() - t0
+    selected = select(registry(sessions), args.targets, args.session, args.builder)
+    if not selected:
+        print("No targets match the given filters.")
+        return 1
+
+    manifest = missing.load_build_manifest()
+    runs = plan(selected, manifest, args.force)
+    t0 = time.perf_counter()
+    if not args.dry_run:
+        os.makedirs(OUT_DIR, exist_ok=True)
+        execute(runs, args.jobs)
+        if record(runs, manifest):
+            missing.save_build_manifest(manifest)
+        publish(sessions)
+        log_metrics(runs)
+    wall = time.perf_counter() - t0
+
+    print_report(runs, args.dry_run)
+    failed = sum(1 for r in runs if r.error)
+    identical = 0 if args.dry_run else sum(1 for r in runs if r.status == "build" and not r.error and not r.written)
+    counts = {s: sum(1 for r in runs if r.status == s) for s in ("build", "up-to-date", "unmanaged")}
+    verb = "To build" if args.dry_run else "Built"
+    print(
+        f"\n{verb}: {counts['build'] - failed - identical}, unchanged bytes: {identical}, "
+        f"up-to-date: {counts['up-to-date']}, unmanaged(existing): {counts['unmanaged']}, "
+        f"failed: {failed} in {wall:.2f}s"
+    )
+    if args.precompress and not args.dry_run:
+        t0 = time.perf_counter()
+        results = precompress_resources.precompress_dir(OUT_DIR, max(args.jobs, 4))
+        precompress_resources.print_summary(results, time.perf_counter() - t0)
+    if args.profile or args.profile_out:
+        pdf_profile.print_phases([(r.target.name, r.phases) for r in runs], parse_seconds)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
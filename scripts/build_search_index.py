@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Índice de búsqueda del curso: palabra → términos, reglas, sesiones y recursos.
+
+Precalcula un índice invertido sin tildes ni mayúsculas sobre lo que el parser
+ya extrae de cada sesión (vocabulario, reglas gramaticales, objetivos, títulos
+de sesión y de recurso) y lo escribe como un JSON compacto que la web puede
+cargar la primera vez que alguien busca, en lugar de enviar sessions.ts entero
+y recorrerlo:
+
+  {"v": 1, "source": "<clave de sessions.ts>",
+   "kinds": ["vocab", "grammar", "objective", "session", "resource"],
+   "sessions": [[3, "Título", [0, 4]], ...],          número, título, recursos
+   "resources": [["/resources/x.pdf", "Título"], ...],
+   "entries": [[0, "No obstante", [2, 5], "Conector..."], ...],
+   "terms": ["abrir", "acuerdo", ...],                 ordenadas
+   "postings": [[0, 3, 1], ...]}                       paralelas a terms
+
+Una entrada es [kind, texto, sesiones, extra]: extra es la definición de un
+término de vocabulario o el índice del recurso de una entrada "resource". Las
+postings son índices de entrada crecientes codificados como diferencias
+(suma acumulada para recuperarlos).
+
+Para buscar: plegar la consulta igual que fold() (NFKD, sin marcas, casefold),
+partirla en palabras y saltar las STOPWORDS, tomar las postings exactas de cada
+palabra y, para la última, las de todas las terms con ese prefijo (búsqueda
+binaria en terms), e intersecar. Primero van las entradas cuyo texto plegado
+contiene la consulta entera a partir de un inicio de palabra. Así "no
+obstante", "No obst" y "pluscuamperfécto" encuentran lo mismo que en el
+original. search() hace exactamente eso y sirve de referencia para el cliente.
+
+Uso:
+  python3 scripts/build_search_index.py                 # escribe public/search-index.json
+  python3 scripts/build_search_index.py --query "no obstante" --query pluscuam
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import gzip
+import json
+import os
+import re
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import compile_sessions
+from pdf_output import write_if_changed
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_OUTPUT = os.path.join(ROOT, "public", "search-index.json")
+FORMAT_VERSION = 1
+
+KINDS = ("vocab", "grammar", "objective", "session", "resource")
+VOCAB, GRAMMAR, OBJECTIVE, SESSION, RESOURCE = range(len(KINDS))
+
+# Too common to narrow a search; they are still matched by the phrase check.
+STOPWORDS = frozenset(
+    "a al como con de del e el en es la las lo los o para por que se su sus u un una unos unas y".split()
+)
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase without accents or other marks: "Pluscuamperfecto" == "pluscuamperfécto"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def words(text: str) -> List[str]:
+    return _WORD.findall(fold(text))
+
+
+def keywords(text: str) -> List[str]:
+    return [w for w in words(text) if w not in STOPWORDS]
+
+
+class IndexBuilder:
+    """Collects entries, merging the same (kind, text) across sessions."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[int, List[object]] = {}  # number -> [number, title, resource ids]
+        self.resources: List[Tuple[str, str]] = []
+        self.resource_ids: Dict[str, int] = {}
+        self.entries: List[list] = []
+        self._entry_ids: Dict[Tuple[int, str], int] = {}
+
+    def session(self, number: int, title: str) -> None:
+        self.sessions[number] = [number, title, []]
+        self.add(SESSION, title, number)
+
+    def resource(self, number: int, title: str, url: Optional[str]) -> None:
+        key = url or f"title:{fold(title)}"
+        rid = self.resource_ids.get(key)
+        if rid is None:
+            rid = self.resource_ids[key] = len(self.resources)
+            self.resources.append((url or "", title))
+        ids = self.sessions[number][2]
+        if rid not in ids:  # type: ignore[operator]
+            ids.append(rid)  # type: ignore[union-attr]
+        self.add(RESOURCE, title, number, rid)
+
+    def add(self, kind: int, text: str, session: int, extra: object = None) -> None:
+        text = " ".join(text.split())
+        if not keywords(text):
+            return
+        key = (kind, fold(text) if kind != VOCAB else f"{fold(text)}\0{fold(str(extra or ''))}")
+        eid = self._entry_ids.get(key)
+        if eid is None:
+            eid = self._entry_ids[key] = len(self.entries)
+            self.entries.append([kind, text, []] + ([extra] if extra not in (None, "") else []))
+        if session not in self.entries[eid][2]:
+            self.entries[eid][2].append(session)
+
+    def build(self, source: str) -> dict:
+        postings: Dict[str, List[int]] = {}
+        for eid, entry in enumerate(self.entries):
+            for w in set(keywords(entry[1])):
+                postings.setdefault(w, []).append(eid)  # eids arrive in order: lists stay sorted
+        terms = sorted(postings)
+        return {
+            "v": FORMAT_VERSION,
+            "source": source,
+            "kinds": list(KINDS),
+            "sessions": [self.sessions[n] for n in sorted(self.sessions)],
+            "resources": [list(r) for r in self.resources],
+            "entries": self.entries,
+            "terms": terms,
+            "postings": [_deltas(postings[t]) for t in terms],
+        }
+
+
+def _deltas(ids: List[int]) -> List[int]:
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def _undeltas(deltas: List[int]) -> List[int]:
+    out, total = [], 0
+    for d in deltas:
+        total += d
+        out.append(total)
+    return out
+
+
+def build_index(con) -> dict:
+    """Index every session in an open compile_sessions store."""
+    b = IndexBuilder()
+    for r in con.execute("SELECT number, title FROM sessions ORDER BY number"):
+        b.session(r["number"], r["title"])
+    for r in con.execute("SELECT session, term, definition FROM vocab ORDER BY session, position"):
+        b.add(VOCAB, r["term"], r["session"], r["definition"])
+    for r in con.execute("SELECT session, text FROM grammar_rules ORDER BY session, position"):
+        b.add(GRAMMAR, r["text"], r["session"])
+    for r in con.execute("SELECT session, text FROM objectives ORDER BY session, position"):
+        b.add(OBJECTIVE, r["text"], r["session"])
+    for r in con.execute("SELECT session, title, url FROM resources ORDER BY session, position"):
+        b.resource(r["session"], r["title"], r["url"])
+    source = con.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()[0]
+    return b.build(source)
+
+
+def encode(index: dict) -> bytes:
+    return (json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def search(index: dict, query: str, limit: int = 20) -> List[dict]:
+    """Entries with every word of `query` (the last one as a prefix); exact phrases first."""
+    qwords = words(query)
+    if not qwords:
+        return []
+    terms: List[str] = index["terms"]
+    candidates: Optional[set] = None
+    for i, w in enumerate(qwords):
+        if w in STOPWORDS and len(qwords) > 1:
+            continue  # not indexed; the phrase check still ranks by them
+        lo = bisect.bisect_left(terms, w)
+        if i == len(qwords) - 1:
+            hi = bisect.bisect_left(terms, w + "\uffff")
+        else:
+            hi = lo + (lo < len(terms) and terms[lo] == w)
+        found = {eid for t in range(lo, hi) for eid in _undeltas(index["postings"][t])}
+        candidates = found if candidates is None else candidates & found
+    if not candidates:
+        return []
+    entries = index["entries"]
+    phrase = " " + " ".join(qwords)
+    ranked = sorted(
+        candidates, key=lambda e: (phrase not in " " + " ".join(words(entries[e][1])), entries[e][0], e)
+    )
+    by_number = {s[0]: s for s in index["sessions"]}
+    hits = []
+    for eid in ranked[:limit]:
+        kind, text, sessions, *extra = entries[eid]
+        if kind == RESOURCE:
+            rids = [extra[0]]
+        else:
+            rids = sorted({rid for n in sessions for rid in by_number[n][2]})
+        hits.append(
+            {
+                "kind": index["kinds"][kind],
+                "text": text,
+                "sessions": sessions,
+                "resources": [index["resources"][rid][0] or index["resources"][rid][1] for rid in rids],
+                **({"definition": extra[0]} if kind == VOCAB and extra else {}),
+            }
+        )
+    return hits
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera el índice de búsqueda (términos, reglas) de la web.")
+    ap.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="index file (default: public/search-index.json)")
+    ap.add_argument("--query", "-q", action="append", default=[], help="search the written index instead of building")
+    ap.add_argument("--limit", type=int, default=10, help="hits per --query")
+    args = ap.parse_args(argv)
+
+    if args.query:
+        if not os.path.exists(args.output):
+            ap.error(f"No se encontro {args.output} (generalo primero sin --query)")
+        with open(args.output, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        for q in args.query:
+            hits = search(index, q, args.limit)
+            print(f"{q!r}: {len(hits)} hit(s)")
+            for h in hits:
+                sessions = ",".join(map(str, h["sessions"]))
+                print(f"  [{h['kind']}] {h['text']}  (sesiones {sessions}; {len(h['resources'])} recursos)")
+        return 0
+
+    t0 = time.perf_counter()
+    con = compile_sessions.connect()
+    try:
+        index = build_index(con)
+    finally:
+        con.close()
+    data = encode(index)
+    written = write_if_changed(args.output, data)
+    print(
+        f"{'Wrote' if written else 'Unchanged'}: {os.path.relpath(args.output)} "
+        f"({len(index['terms'])} terms, {len(index['entries'])} entries, {len(index['sessions'])} sessions; "
+        f"{len(data) / 1024:.0f} KB, {len(gzip.compress(data, 9)) / 1024:.0f} KB gzip) "
+        f"in {(time.perf_counter() - t0) * 1000:.0f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
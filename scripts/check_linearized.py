@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Comprueba que los PDFs de public/resources están linealizados ("fast web view").
+
+Para cada fichero lee el diccionario /Linearized del principio del archivo y
+comprueba que su /L coincide con el tamaño real (si no, el PDF se modificó
+después de linealizarlo). Si pikepdf está instalado, además valida las tablas
+de hints con qpdf; --quick se queda en la comprobación rápida, que solo usa la
+biblioteca estándar.
+
+Con --fix linealiza en su sitio los que no lo están (necesita pikepdf), útil
+para los PDFs hechos a mano que ningún generador reconstruye.
+
+Uso: python3 scripts/check_linearized.py [FILE ...] [--quick] [--fix]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import re
+from typing import Dict, List, Optional
+
+import pdf_output
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(ROOT, "public", "resources")
+
+# The linearization dictionary must be the first object, within the first 1 KB.
+_FIRST_OBJ = re.compile(rb"\d+\s+\d+\s+obj\s*<<(.*?)>>", re.DOTALL)
+_INT_KEY = re.compile(rb"/(Linearized|L|O|E|N|T)\s+(\d+(?:\.\d+)?)")
+
+
+def linearization_dict(head: bytes) -> Optional[Dict[str, float]]:
+    m = _FIRST_OBJ.search(head)
+    if not m or b"/Linearized" not in m.group(1):
+        return None
+    return {k.decode(): float(v) for k, v in _INT_KEY.findall(m.group(1))}
+
+
+def quick_check(path: str) -> Optional[str]:
+    """Problem with the file's linearization header, or None if it looks right."""
+    with open(path, "rb") as f:
+        head = f.read(1024)
+    lin = linearization_dict(head)
+    if lin is None:
+        return "not linearized"
+    missing = [k for k in ("L", "O", "E", "N", "T") if k not in lin]
+    if missing:
+        return "incomplete /Linearized dictionary (missing " + ", ".join(missing) + ")"
+    size = os.path.getsize(path)
+    if int(lin["L"]) != size:
+        return f"/L is {int(lin['L'])} but the file has {size} bytes (changed after linearizing)"
+    return None
+
+
+def deep_check(path: str) -> Optional[str]:
+    import pikepdf
+
+    report = io.StringIO()
+    with pikepdf.open(path) as pdf:
+        if not pdf.is_linearized:
+            return "not linearized"
+        if not pdf.check_linearization(stream=report):
+            return "invalid hint tables: " + " ".join(report.getvalue().split())[:200]
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Verifica la linealización de los PDFs de public/resources.")
+    ap.add_argument("files", nargs="*", metavar="FILE", help="PDFs to check (default: every PDF in public/resources)")
+    ap.add_argument("--quick", action="store_true", help="header check only, without pikepdf")
+    ap.add_argument("--fix", action="store_true", help="linearize failing files in place (needs pikepdf)")
+    args = ap.parse_args(argv)
+
+    try:
+        import pikepdf  # noqa: F401
+
+        have_pikepdf = True
+    except ImportError:
+        have_pikepdf = False
+    if args.fix and not have_pikepdf:
+        ap.error("--fix necesita pikepdf (pip install pikepdf)")
+    deep = have_pikepdf and not args.quick
+
+    paths = args.files or [
+        os.path.join(RESOURCES_DIR, n) for n in sorted(os.listdir(RESOURCES_DIR)) if n.endswith(".pdf")
+    ]
+    bad = 0
+    fixed = 0
+    for path in paths:
+        problem = quick_check(path) or (deep_check(path) if deep else None)
+        if problem and args.fix:
+            with open(path, "rb") as f:
+                pdf_output.write_if_changed(path, pdf_output.linearize(f.read()))
+            fixed += 1
+            problem = quick_check(path) or (deep_check(path) if deep else None)
+        if problem:
+            bad += 1
+            print(f"  {os.path.relpath(path, ROOT)}: {problem}")
+    mode = "header + hint tables" if deep else "header only"
+    summary = f"{len(paths)} PDFs checked ({mode}), {bad} not linearized"
+    if fixed:
+        summary += f", {fixed} linearized in place"
+    print(summary)
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
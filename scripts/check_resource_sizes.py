@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Falla si algún PDF de public/resources supera su presupuesto de tamaño.
+
+Los presupuestos están en scripts/resource-size-budgets.json: `default_kb` para
+todos los ficheros y `files` para excepciones por nombre. Pensado para CI
+(`npm run check:pdf-size`); solo usa la biblioteca estándar.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(ROOT, "public", "resources")
+BUDGETS = os.path.join(ROOT, "scripts", "resource-size-budgets.json")
+
+
+def load_budgets(path: str = BUDGETS) -> Tuple[float, Dict[str, float]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return float(data["default_kb"]), {k: float(v) for k, v in data.get("files", {}).items()}
+
+
+def over_budget(directory: str, default_kb: float, files: Dict[str, float]) -> List[Tuple[str, float, float]]:
+    """(filename, size KB, budget KB) for every PDF larger than its budget."""
+    out = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".pdf"):
+            continue
+        kb = os.path.getsize(os.path.join(directory, name)) / 1024
+        budget = files.get(name, default_kb)
+        if kb > budget:
+            out.append((name, kb, budget))
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Comprueba el tamaño de los PDFs de public/resources.")
+    ap.add_argument("--dir", default=RESOURCES_DIR, help="directory to check")
+    ap.add_argument("--budgets", default=BUDGETS, help="budget file")
+    args = ap.parse_args(argv)
+
+    default_kb, files = load_budgets(args.budgets)
+    checked = sum(1 for n in os.listdir(args.dir) if n.endswith(".pdf"))
+    failures = over_budget(args.dir, default_kb, files)
+    for name, kb, budget in failures:
+        print(f"  {name}: {kb:.1f} KB > {budget:.0f} KB budget")
+    stale = sorted(n for n in files if not os.path.exists(os.path.join(args.dir, n)))
+    for name in stale:
+        print(f"  warning: budget for missing file {name}")
+    print(f"{checked} PDFs checked, {len(failures)} over budget (default {default_kb:.0f} KB)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
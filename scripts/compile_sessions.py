@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Compila sessions.ts a un almacén normalizado: JSON + SQLite con índices.
+
+Usa el parser de generate_missing_session_pdfs.py y escribe en .cache/:
+
+  course.json    tablas planas (sessions, objectives, grammar_rules, vocab,
+                 resources) más el sha256 de sessions.ts del que salen
+  course.sqlite  las mismas tablas con índices para consultas como "qué
+                 sesiones usan el recurso X" o "vocabulario del bloque 2"
+
+Solo se recompila si cambia el hash de sessions.ts (o COMPILER_VERSION), así que
+las herramientas pueden llamar a `connect()` sin preocuparse por el coste.
+
+Uso:
+  python3 scripts/compile_sessions.py                    # compila si hace falta
+  python3 scripts/compile_sessions.py --check            # 1 si está desactualizado
+  python3 scripts/compile_sessions.py --uses /resources/subjuntivo-duda.pdf
+  python3 scripts/compile_sessions.py --vocab-block 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import generate_missing_session_pdfs as missing
+
+
+COURSE_JSON = os.path.join(missing.CACHE_DIR, "course.json")
+COURSE_DB = os.path.join(missing.CACHE_DIR, "course.sqlite")
+
+# Bump when the schema or normalization changes so stored files are rebuilt.
+COMPILER_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE sessions (
+    number INTEGER PRIMARY KEY,
+    id TEXT,
+    date TEXT,
+    title TEXT NOT NULL,
+    subtitle TEXT,
+    block_number INTEGER,
+    block_title TEXT,
+    is_exam_day INTEGER NOT NULL,
+    homework TEXT
+);
+CREATE TABLE objectives (
+    session INTEGER NOT NULL REFERENCES sessions(number),
+    position INTEGER NOT NULL,
+    id TEXT,
+    text TEXT NOT NULL,
+    PRIMARY KEY (session, position)
+);
+CREATE TABLE grammar_rules (
+    session INTEGER NOT NULL REFERENCES sessions(number),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (session, position)
+);
+CREATE TABLE vocab (
+    session INTEGER NOT NULL REFERENCES sessions(number),
+    position INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    definition TEXT,
+    example TEXT,
+    category TEXT,
+    PRIMARY KEY (session, position)
+);
+CREATE TABLE resources (
+    session INTEGER NOT NULL REFERENCES sessions(number),
+    position INTEGER NOT NULL,
+    id TEXT,
+    title TEXT NOT NULL,
+    type TEXT,
+    url TEXT,
+    description TEXT,
+    "order" INTEGER,
+    PRIMARY KEY (session, position)
+);
+CREATE INDEX sessions_block ON sessions(block_number);
+CREATE INDEX vocab_term ON vocab(term COLLATE NOCASE);
+CREATE INDEX vocab_category ON vocab(category);
+CREATE INDEX resources_url ON resources(url);
+"""
+
+TABLES = ("sessions", "objectives", "grammar_rules", "vocab", "resources")
+
+
+# Same coercions as the PDF parser, so both read a field the same way.
+_int = missing._int
+_date = missing._date
+_dicts = missing._dicts
+
+
+def _str(v: object) -> Optional[str]:
+    # The store also keeps expressions such as new Date('...') by their first string.
+    return missing._str(v.first_string() if isinstance(v, missing.RawExpr) else v)
+
+
+def _literal(position: int, obj: dict) -> str:
+    """How an error names a session literal: its place in sessionsData, id and title."""
+    return f"elemento {position + 1} (id {_str(obj.get('id'))!r}, titulo {_str(obj.get('title'))!r})"
+
+
+def normalize(objects: List[dict]) -> Dict[str, List[dict]]:
+    """Flatten raw session objects into one list of rows per table.
+
+    Raises SessionsParseError if two literals share a sessionNumber.
+    """
+    tables: Dict[str, List[dict]] = {t: [] for t in TABLES}
+    seen: Dict[int, Tuple[int, dict]] = {}
+    for position, obj in enumerate(objects):
+        n = _int(obj.get("sessionNumber"))
+        if n is None:
+            continue
+        if n in seen:
+            first = _literal(*seen[n])
+            raise missing.SessionsParseError(
+                f"sessionNumber {n} repetido en sessionsData: {first} y {_literal(position, obj)}"
+            )
+        seen[n] = (position, obj)
+        tables["sessions"].append(
+            {
+                "number": n,
+                "id": _str(obj.get("id")),
+                "date": _date(obj.get("date")),
+                "title": _str(obj.get("title")) or f"Sesión {n}",
+                "subtitle": _str(obj.get("subtitle")),
+                "block_number": _int(obj.get("blockNumber")),
+                "block_title": _str(obj.get("blockTitle")),
+                "is_exam_day": obj.get("isExamDay") is True,
+                "homework": _str(obj.get("homeworkInstructions")),
+            }
+        )
+        for i, o in enumerate(o for o in _dicts(obj.get("objectives")) if _str(o.get("text"))):
+            tables["objectives"].append({"session": n, "position": i, "id": _str(o.get("id")), "text": _str(o["text"])})
+        grammar = obj.get("grammarContent")
+        rules = grammar.get("rules") if isinstance(grammar, dict) else None
+        for i, text in enumerate(t for t in map(_str, rules if isinstance(rules, list) else []) if t):
+            tables["grammar_rules"].append({"session": n, "position": i, "text": text})
+        vocab = obj.get("vocabularyContent")
+        items = _dicts(vocab.get("items")) if isinstance(vocab, dict) else []
+        for i, item in enumerate(x for x in items if _str(x.get("term"))):
+            tables["vocab"].append(
+                {
+                    "session": n,
+                    "position": i,
+                    "term": _str(item["term"]),
+                    "definition": _str(item.get("definition")),
+                    "example": _str(item.get("example")),
+                    "category": _str(item.get("category")),
+                }
+            )
+        for i, r in enumerate(r for r in _dicts(obj.get("resources")) if _str(r.get("title"))):
+            tables["resources"].append(
+                {
+                    "session": n,
+                    "position": i,
+                    "id": _str(r.get("id")),
+                    "title": _str(r["title"]),
+                    "type": _str(r.get("type")),
+                    "url": _str(r.get("url")),
+                    "description": _str(r.get("description")),
+                    "order": _int(r.get("order")),
+                }
+            )
+    return tables
+
+
+def source_key(data: bytes) -> str:
+    return f"v{COMPILER_VERSION}:{hashlib.sha256(data).hexdigest()}"
+
+
+def stored_key(json_path: str = COURSE_JSON, db_path: str = COURSE_DB) -> Optional[str]:
+    """Key both compiled files were built from, or None if they disagree or are missing."""
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            json_key = json.load(f)["source"]["key"]
+        con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            (db_key,) = con.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        finally:
+            con.close()
+    except (OSError, ValueError, KeyError, TypeError, sqlite3.Error):
+        return None
+    return json_key if json_key == db_key else None
+
+
+def _write_json(path: str, key: str, tables: Dict[str, List[dict]]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        payload = {"source": {"path": os.path.relpath(missing.SESSIONS_TS, missing.ROOT), "key": key}, **tables}
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _quote(name: str) -> str:
+    """SQL identifier quoting: repr() would give 'single' quotes, a string literal."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _write_db(path: str, key: str, tables: Dict[str, List[dict]]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = sqlite3.connect(tmp)
+    try:
+        con.executescript(SCHEMA)
+        con.execute("INSERT INTO meta VALUES ('source', ?)", (key,))
+        for table, rows in tables.items():
+            if not rows:
+                continue
+            cols = list(rows[0])
+            sql = f"INSERT INTO {table} ({', '.join(map(_quote, cols))}) VALUES ({', '.join('?' * len(cols))})"
+            con.executemany(sql, [tuple(r[c] for c in cols) for r in rows])
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, path)
+
+
+def compile_sessions(
+    path: str = missing.SESSIONS_TS, json_path: str = COURSE_JSON, db_path: str = COURSE_DB, force: bool = False
+) -> bool:
+    """Rebuild the JSON and SQLite stores if sessions.ts changed; True if they were rebuilt."""
+    with open(path, "rb") as f:
+        data = f.read()
+    key = source_key(data)
+    if not force and stored_key(json_path, db_path) == key:
+        return False
+    tables = normalize(list(missing.iter_session_objects(data.decode("utf-8"))))
+    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+    _write_db(db_path, key, tables)
+    _write_json(json_path, key, tables)
+    return True
+
+
+def connect(db_path: str = COURSE_DB) -> sqlite3.Connection:
+    """Read-only connection to an up-to-date course store, compiling it first if needed."""
+    compile_sessions(db_path=db_path)
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    con.row_factory = sqlite3.Row
+    return con
+
+
+def sessions_using(con: sqlite3.Connection, url: str) -> List[int]:
+    rows = con.execute("SELECT DISTINCT session FROM resources WHERE url = ? ORDER BY session", (url,))
+    return [r[0] for r in rows]
+
+
+def vocab_in_block(con: sqlite3.Connection, block: int) -> List[sqlite3.Row]:
+    return con.execute(
+        "SELECT v.session, v.term, v.definition, v.category FROM vocab v "
+        "JOIN sessions s ON s.number = v.session WHERE s.block_number = ? ORDER BY v.session, v.position",
+        (block,),
+    ).fetchall()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Compila sessions.ts a .cache/course.json y .cache/course.sqlite.")
+    ap.add_argument("--force", action="store_true", help="rebuild even if sessions.ts did not change")
+    ap.add_argument("--check", action="store_true", help="exit 0 if the store matches sessions.ts, 1 otherwise")
+    ap.add_argument("--uses", metavar="URL", help="print the sessions that use a resource URL")
+    ap.add_argument("--vocab-block", type=int, metavar="N", help="print the vocabulary of block N")
+    args = ap.parse_args(argv)
+
+    if args.check:
+        with open(missing.SESSIONS_TS, "rb") as f:
+            fresh = stored_key() == source_key(f.read())
+        print(f"Course store {'up to date' if fresh else 'stale or missing'}: {COURSE_DB}")
+        return 0 if fresh else 1
+
+    try:
+        rebuilt = compile_sessions(force=args.force)
+    except missing.SessionsParseError as e:
+        print(f"error: {e}")
+        return 1
+
+    if args.uses or args.vocab_block is not None:
+        con = connect()
+        if args.uses:
+            print(", ".join(map(str, sessions_using(con, args.uses))) or "(ninguna)")
+        if args.vocab_block is not None:
+            for row in vocab_in_block(con, args.vocab_block):
+                print(f"{row['session']:>3}  {row['term']}  [{row['category'] or '-'}]")
+        con.close()
+        return 0
+
+    con = sqlite3.connect(COURSE_DB)
+    counts = ", ".join(f"{t}: {con.execute(f'SELECT COUNT(*) FROM {t}').fetchone()[0]}" for t in TABLES)
+    con.close()
+    print(f"{'Compiled' if rebuilt else 'Up to date'}: {COURSE_DB} ({counts})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
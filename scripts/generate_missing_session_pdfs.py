@@ -2,22 +2,48 @@
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import codecs
+import hashlib
+import io
+import json
 import os
 import re
-from dataclasses import dataclass
-from datetime import date
-from typing import Dict, List, Optional, Tuple
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pdf_metrics
+import pdf_profile
+import resources_manifest
+from pdf_output import (
+  enable_linearize,
+  enable_reproducible,
+  output_options,
+  reproducible,
+  save,
+  source_epoch,
+  stamp_date,
+)
 
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SESSIONS_TS = os.path.join(ROOT, "src", "data", "sessions.ts")
 OUT_DIR = os.path.join(ROOT, "public", "resources")
+CACHE_DIR = os.path.join(ROOT, ".cache")
+PARSE_CACHE = os.path.join(CACHE_DIR, "sessions-parse.json")
+# Local build state, not committed. On a fresh clone the first run rebuilds and
+# records the outputs an earlier run of these generators wrote (looks_generated);
+# hand-made PDFs stay unmanaged unless --adopt or --force.
+BUILD_MANIFEST = os.path.join(ROOT, "scripts", "resources-build-manifest.json")
+
+# Bump whenever parsing rules or the Session/Resource fields change, so stale
+# parse caches are ignored instead of loaded.
+PARSER_VERSION = 1
 
 
 @dataclass
@@ -43,297 +69,615 @@ class Session:
   resources: List[Resource]
 
 
-def _strip_quotes(s: str) -> str:
-  s = s.strip()
-  if (s.startswith("'") and s.endswith("'")) or (s.startswith('"') and s.endswith('"')):
-    return s[1:-1]
-  return s
+class SessionsParseError(RuntimeError):
+  pass
+
+
+# One alternation per token kind; every branch is free of nested quantifiers, so
+# a match costs time proportional to its length and the whole scan is linear.
+# Unterminated strings and block comments run to end of input (the old
+# character scanner behaved the same way) instead of backtracking.
+_TOKEN_RE = re.compile(
+  r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<str>'[^'\\]*(?:\\.[^'\\]*)*'?
+           |"[^"\\]*(?:\\.[^"\\]*)*"?
+           |`[^`\\]*(?:\\.[^`\\]*)*`?)
+  | (?P<num>\d+(?:\.\d+)?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>.)
+  """,
+  re.VERBOSE | re.DOTALL,
+)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+_ESCAPE_RE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL)
+_LITERAL_IDENTS = {"true": True, "false": False, "null": None, "undefined": None}
+
+Token = Tuple[str, object]
+
+
+def _unescape(m: "re.Match[str]") -> str:
+  esc = m.group(1)
+  if esc[0] in "ux" and len(esc) > 1:
+    code = int(esc[1:].strip("{}"), 16)
+    return chr(code) if code <= 0x10FFFF else m.group()
+  if esc in ("\n", "\r\n", "\r"):
+    return ""  # line continuation
+  return _ESCAPES.get(esc, esc)
+
+
+def _string_value(raw: str) -> str:
+  quote = raw[0]
+  body = raw[1:-1] if len(raw) > 1 and raw[-1] == quote else raw[1:]
+  return _ESCAPE_RE.sub(_unescape, body) if "\\" in body else body
+
+
+def tokenize_ts(text: str) -> Iterator[Token]:
+  """Yield (kind, value) tokens of a TypeScript source, skipping whitespace and comments.
+
+  kind is one of "str", "num", "ident" or "punct". String values are unquoted
+  and unescaped; ``${}`` placeholders in template literals are not evaluated.
+  """
+  for m in _TOKEN_RE.finditer(text):
+    kind = m.lastgroup
+    if kind == "ws" or kind == "comment":
+      continue
+    tok = m.group()
+    if kind == "str":
+      yield "str", _string_value(tok)
+    elif kind == "num":
+      yield "num", float(tok) if "." in tok else int(tok)
+    else:
+      yield kind, tok  # type: ignore[misc]
+
+
+def tokenize_ts_spans(text: str) -> Iterator[Tuple[str, object, int, int]]:
+  """Like tokenize_ts, but yield (kind, value, start, end) with offsets into text.
+
+  For tools that patch the source in place instead of only reading it.
+  """
+  for m in _TOKEN_RE.finditer(text):
+    kind = m.lastgroup
+    if kind == "ws" or kind == "comment":
+      continue
+    tok = m.group()
+    if kind == "str":
+      value: object = _string_value(tok)
+    elif kind == "num":
+      value = float(tok) if "." in tok else int(tok)
+    else:
+      value = tok
+    yield kind, value, m.start(), m.end()  # type: ignore[misc]
+
+
+def tokenize_ts_stream(chunks: Iterable[str]) -> Iterator[Token]:
+  """Like tokenize_ts, over text that arrives in pieces (a file read chunk by chunk).
+
+  The last two matches of the buffered text are held back until more text
+  arrives: a token at the very end may continue in the next chunk, and so may
+  the one before it (``12`` + ``.`` of ``12.5``, or a string cut at a
+  backslash). Memory stays bounded by the chunk size plus the longest token.
+  """
+  buf = ""
+  chunks = iter(chunks)
+  while True:
+    chunk = next(chunks, None)
+    buf = buf + chunk if chunk is not None else buf
+    ms = list(_TOKEN_RE.finditer(buf))
+    ready = ms if chunk is None else ms[:-2]
+    for m in ready:
+      kind = m.lastgroup
+      if kind == "ws" or kind == "comment":
+        continue
+      tok = m.group()
+      if kind == "str":
+        yield "str", _string_value(tok)
+      elif kind == "num":
+        yield "num", float(tok) if "." in tok else int(tok)
+      else:
+        yield kind, tok  # type: ignore[misc]
+    if chunk is None:
+      return
+    buf = buf[ms[-2].start():] if len(ms) >= 2 else buf
+
+
+class RawExpr(tuple):
+  """Tokens of a value that is not a plain literal, e.g. ``new Date('2026-02-03')``."""
+
+  def first_string(self) -> Optional[str]:
+    for kind, val in self:
+      if kind == "str":
+        return val
+    return None
 
 
-def _extract_string_field(obj: str, field: str) -> Optional[str]:
-  # single-quoted first, then double-quoted
-  m = re.search(rf"{re.escape(field)}\s*:\s*'([^']*)'", obj)
-  if m:
-    return m.group(1)
-  m = re.search(rf'{re.escape(field)}\s*:\s*"([^"]*)"', obj)
-  if m:
-    return m.group(1)
-  return None
+class _Frame:
+  __slots__ = ("container", "key", "expect_value", "filled", "raw", "raw_depth")
+
+  def __init__(self, container: object) -> None:
+    self.container = container
+    self.key: Optional[str] = None
+    self.expect_value = not isinstance(container, dict)
+    self.filled = False
+    self.raw: List[Token] = []
+    self.raw_depth = 0
+
+  def put(self, value: object) -> None:
+    if isinstance(self.container, dict):
+      if self.key is not None:
+        self.container.setdefault(self.key, value)
+    else:
+      self.container.append(value)
+    self.filled = True
+
+  def flush(self) -> None:
+    raw = self.raw
+    if raw and not self.filled:
+      if len(raw) == 1:
+        kind, val = raw[0]
+        if kind == "ident" and val in _LITERAL_IDENTS:
+          val = _LITERAL_IDENTS[val]
+        elif kind not in ("str", "num"):
+          val = RawExpr(raw)
+        self.put(val)
+      elif len(raw) == 2 and raw[0] == ("punct", "-") and raw[1][0] == "num":
+        self.put(-raw[1][1])
+      else:
+        self.put(RawExpr(raw))
+    self.raw = []
+    self.key = None
+    self.filled = False
+    self.expect_value = not isinstance(self.container, dict)
+
+
+_OPEN = {"(": 1, "[": 1, "{": 1, ")": -1, "]": -1, "}": -1}
+
+
+def iter_array_literal(tokens: Iterator[Token]) -> Iterator[object]:
+  """Build the items of an array literal whose ``[`` was just consumed from ``tokens``.
+
+  Each top-level item is yielded as soon as it is complete. Objects become dicts
+  (the first occurrence of a key wins), arrays become lists, strings, numbers and
+  ``true``/``false``/``null`` become Python values, and anything else becomes a
+  RawExpr. Nesting is handled with an explicit stack, so deeply nested input
+  cannot exhaust the interpreter stack.
+  """
+  root: List[object] = []
+  stack = [_Frame(root)]
+  for kind, tok in tokens:
+    top = stack[-1]
+    if top.raw_depth:
+      top.raw.append((kind, tok))
+      if kind == "punct":
+        top.raw_depth += _OPEN.get(tok, 0)  # type: ignore[arg-type]
+      continue
 
+    if kind == "punct":
+      if tok == "{" or tok == "[":
+        child: object = {} if tok == "{" else []
+        if isinstance(top.container, dict) and not top.expect_value:
+          top.key = None  # computed key or stray literal; keep the structure, drop the value
+        top.put(child)
+        stack.append(_Frame(child))
+        continue
+      if tok == "}" or tok == "]":
+        top.flush()
+        stack.pop()
+        if not stack:
+          return
+        if len(stack) == 1:
+          yield root.pop()
+        continue
+      if tok == ",":
+        top.flush()
+        continue
+      if tok == ":" and isinstance(top.container, dict) and not top.expect_value:
+        top.expect_value = True
+        continue
+      if tok == "(":
+        top.raw_depth = 1
+      top.raw.append((kind, tok))
+      continue
 
-def _extract_int_field(obj: str, field: str) -> Optional[int]:
-  m = re.search(rf"{re.escape(field)}\s*:\s*(\d+)", obj)
-  return int(m.group(1)) if m else None
+    if not top.expect_value:
+      if top.key is None:
+        top.key = str(tok)
+      continue
+    top.raw.append((kind, tok))
 
+  # Unterminated literal: like the old character scanner, keep whatever items
+  # closed before the input ran out and drop the partial one.
 
-def _extract_date_field(obj: str) -> Optional[str]:
-  m = re.search(r"date\s*:\s*new\s+Date\(\s*'(\d{4}-\d{2}-\d{2})'\s*\)", obj)
-  return m.group(1) if m else None
 
+def _find_sessions_array(tokens: Iterator[Token]) -> Iterator[Token]:
+  # Beware: `SessionData[]` contains `[]` before the actual array literal.
+  for kind, tok in tokens:
+    if kind == "ident" and tok == "sessionsData":
+      break
+  else:
+    raise SessionsParseError("No se encontro sessionsData en sessions.ts")
+  for kind, tok in tokens:
+    if kind == "punct" and tok == "=":
+      break
+  else:
+    raise SessionsParseError("No se encontro '=' al declarar sessionsData")
+  for kind, tok in tokens:
+    if kind == "punct" and tok == "[":
+      return tokens
+  raise SessionsParseError("No se encontro el inicio del array literal de sessionsData")
 
-def _extract_list_block(obj: str, field: str) -> Optional[str]:
-  # Find `field: [` then return the bracket-matched content (inside brackets)
-  idx = obj.find(field)
-  if idx == -1:
-    return None
-  idx = obj.find("[", idx)
-  if idx == -1:
-    return None
 
-  # Start just after the opening '[' and return once we close it.
-  i = idx + 1
-  depth = 1
-  in_str: Optional[str] = None
-  esc = False
-  in_line_comment = False
-  in_block_comment = False
-  start = idx + 1
-  while i < len(obj):
-    ch = obj[i]
-    nxt = obj[i + 1] if i + 1 < len(obj) else ""
-
-    if in_line_comment:
-      if ch == "\n":
-        in_line_comment = False
-      i += 1
-      continue
-    if in_block_comment:
-      if ch == "*" and nxt == "/":
-        in_block_comment = False
-        i += 2
-        continue
-      i += 1
-      continue
+def _str(v: object) -> Optional[str]:
+  return v.strip() if isinstance(v, str) else None
 
-    if in_str:
-      if esc:
-        esc = False
-      elif ch == "\\":
-        esc = True
-      elif ch == in_str:
-        in_str = None
-      i += 1
-      continue
 
-    # comments
-    if ch == "/" and nxt == "/":
-      in_line_comment = True
-      i += 2
-      continue
-    if ch == "/" and nxt == "*":
-      in_block_comment = True
-      i += 2
-      continue
+def _int(v: object) -> Optional[int]:
+  return v if isinstance(v, int) and not isinstance(v, bool) else None
+
+
+def _date(v: object) -> Optional[str]:
+  """A YYYY-MM-DD string, written plainly or as new Date('...'); None for anything else."""
+  s = v.first_string() if isinstance(v, RawExpr) else v
+  return s if isinstance(s, str) and re.fullmatch(r"\d{4}-\d{2}-\d{2}", s) else None
 
-    if ch in ("'", '"', "`"):
-      in_str = ch
-      i += 1
-      continue
 
-    if ch == "[":
-      depth += 1
-    elif ch == "]":
-      depth -= 1
-      if depth == 0:
-        return obj[start:i]
-    i += 1
-  return None
+def _dicts(v: object) -> List[dict]:
+  return [x for x in v if isinstance(x, dict)] if isinstance(v, list) else []
 
 
-def _parse_resources(block: str) -> List[Resource]:
-  if not block:
-    return []
+def _parse_resources(items: object) -> List[Resource]:
   resources: List[Resource] = []
-  # naive object matcher for resources list entries
-  for m in re.finditer(r"\{[^{}]*?title\s*:\s*(['\"])(.*?)\1[^{}]*?url\s*:\s*(['\"])(/resources/.*?\.pdf)\3[^{}]*?\}", block, re.DOTALL):
-    title = m.group(2).strip()
-    url = m.group(4).strip()
-    desc = None
-    md = re.search(r"description\s*:\s*(['\"])(.*?)\1", m.group(0), re.DOTALL)
-    if md:
-      desc = md.group(2).strip()
-    resources.append(Resource(title=title, url=url, description=desc))
+  for r in _dicts(items):
+    title = _str(r.get("title"))
+    url = _str(r.get("url"))
+    if title is None or url is None or not url.startswith("/resources/") or not url.endswith(".pdf"):
+      continue
+    resources.append(Resource(title=title, url=url, description=_str(r.get("description"))))
   return resources
 
 
-def _parse_session(obj: str) -> Optional[Session]:
-  sn = _extract_int_field(obj, "sessionNumber")
+def _parse_session(obj: dict) -> Optional[Session]:
+  sn = _int(obj.get("sessionNumber"))
   if sn is None:
     return None
 
-  title = _extract_string_field(obj, "title") or f"Sesión {sn}"
-  subtitle = _extract_string_field(obj, "subtitle")
-  date_str = _extract_date_field(obj)
-  block_number = _extract_int_field(obj, "blockNumber")
-  block_title = _extract_string_field(obj, "blockTitle")
-
-  objectives_block = _extract_list_block(obj, "objectives")
-  objectives = []
-  if objectives_block:
-    objectives = [t.strip() for t in re.findall(r"text\s*:\s*'([^']+)'", objectives_block)]
-    if not objectives:
-      objectives = [t.strip() for t in re.findall(r'text\s*:\s*"([^"]+)"', objectives_block)]
-
-  grammar_block = obj[obj.find("grammarContent"):] if "grammarContent" in obj else ""
-  grammar_title = _extract_string_field(grammar_block, "title") if grammar_block else None
-  rules_block = _extract_list_block(grammar_block, "rules") if grammar_block else None
-  grammar_rules: List[str] = []
-  if rules_block:
-    grammar_rules = [t.strip() for t in re.findall(r"'([^']+)'", rules_block)]
-
-  vocab_block = obj[obj.find("vocabularyContent"):] if "vocabularyContent" in obj else ""
-  vocab_title = _extract_string_field(vocab_block, "title") if vocab_block else None
-  vocab_items_block = _extract_list_block(vocab_block, "items") if vocab_block else None
-  vocab_terms: List[str] = []
-  if vocab_items_block:
-    vocab_terms = [t.strip() for t in re.findall(r"term\s*:\s*'([^']+)'", vocab_items_block)]
-    if not vocab_terms:
-      vocab_terms = [t.strip() for t in re.findall(r'term\s*:\s*"([^"]+)"', vocab_items_block)]
-
-  resources_block = _extract_list_block(obj, "resources")
-  resources = _parse_resources(resources_block or "")
+  grammar = obj.get("grammarContent")
+  grammar = grammar if isinstance(grammar, dict) else {}
+  vocab = obj.get("vocabularyContent")
+  vocab = vocab if isinstance(vocab, dict) else {}
+  rules = grammar.get("rules")
 
   return Session(
     session_number=sn,
-    title=title,
-    subtitle=subtitle,
-    date_str=date_str,
-    block_number=block_number,
-    block_title=block_title,
-    objectives=objectives,
-    grammar_title=grammar_title,
-    grammar_rules=grammar_rules,
-    vocab_title=vocab_title,
-    vocab_terms=vocab_terms,
-    resources=resources,
+    title=_str(obj.get("title")) or f"Sesión {sn}",
+    subtitle=_str(obj.get("subtitle")),
+    date_str=_date(obj.get("date")),
+    block_number=_int(obj.get("blockNumber")),
+    block_title=_str(obj.get("blockTitle")),
+    objectives=[t for t in (_str(o.get("text")) for o in _dicts(obj.get("objectives"))) if t],
+    grammar_title=_str(grammar.get("title")),
+    grammar_rules=[t for t in (_str(x) for x in rules) if t] if isinstance(rules, list) else [],
+    vocab_title=_str(vocab.get("title")),
+    vocab_terms=[t for t in (_str(i.get("term")) for i in _dicts(vocab.get("items"))) if t],
+    resources=_parse_resources(obj.get("resources")),
   )
 
 
+def _session_objects(tokens: Iterator[Token]) -> Iterator[dict]:
+  for item in iter_array_literal(_find_sessions_array(tokens)):
+    if isinstance(item, dict):
+      yield item
+
+
+def iter_session_objects(text: str) -> Iterator[dict]:
+  """Yield each object literal of the sessionsData array as a raw dict."""
+  return _session_objects(tokenize_ts(text))
+
+
+def iter_sessions_text(text: str) -> Iterator[Session]:
+  for item in iter_session_objects(text):
+    s = _parse_session(item)
+    if s:
+      yield s
+
+
+def _nesting(spans: Iterable[Tuple[str, object, int, int]]) -> Iterator[Tuple[str, object, int, int, int]]:
+  """Add to each token the object/array depth after it, counted as iter_array_literal does.
+
+  Brackets inside ``( ... )`` belong to one raw expression and leave the depth alone.
+  """
+  depth = raw = 0
+  for kind, tok, s, e in spans:
+    if raw:
+      raw += _OPEN.get(tok, 0) if kind == "punct" else 0  # type: ignore[arg-type]
+    elif kind == "punct":
+      if tok == "{" or tok == "[":
+        depth += 1
+      elif tok == "}" or tok == "]":
+        depth -= 1
+      elif tok == "(":
+        raw = 1
+    yield kind, tok, s, e, depth
+
+
+def session_literals(text: str) -> List[Tuple[int, int, List[Token]]]:
+  """(start, end, tokens) of each object literal directly inside the sessionsData array."""
+  spans = tokenize_ts_spans(text)
+  wanted = [("ident", "sessionsData"), ("punct", "="), ("punct", "[")]
+  for kind, tok, _, _ in spans:
+    if (kind, tok) == wanted[0]:
+      wanted.pop(0)
+      if not wanted:
+        break
+  else:
+    raise SessionsParseError("No se encontro el array literal de sessionsData")
+  out: List[Tuple[int, int, List[Token]]] = []
+  start, tokens, depth = 0, [], 0
+  for kind, tok, s, e, after in _nesting(spans):
+    if after < 0:
+      break  # the array's own closing bracket
+    if depth == 0 and after == 1:
+      start, tokens = s, []
+    if depth or after:
+      tokens.append((kind, tok))
+    if depth == 1 and after == 0 and tokens[0] == ("punct", "{"):
+      out.append((start, e, tokens))
+    depth = after
+  return out
+
+
+def _literal_session(tokens: List[Token]) -> Optional[Session]:
+  item = next(iter_array_literal(iter(tokens + [("punct", "]")])), None)
+  return _parse_session(item) if isinstance(item, dict) else None
+
+
+def _common_prefix(a: str, b: str, step: int = 4096) -> int:
+  # Whole chunks compare at memcmp speed; only the chunk with the difference goes char by char.
+  n = min(len(a), len(b))
+  i = 0
+  while i < n and a[i:i + step] == b[i:i + step]:
+    i += step
+  if i >= n:
+    return n
+  return i + next(k for k, (x, y) in enumerate(zip(a[i:i + step], b[i:i + step] + "\0")) if x != y)
+
+
+class IncrementalSessions:
+  """sessions.ts kept parsed across edits, for long-running tools (watch_resources).
+
+  update() compares the new text with the last one. When everything that
+  changed lies strictly inside one session literal, and that literal still
+  tokenizes to a single balanced object, only it is parsed again; any other
+  edit (across braces, between sessions, in the header) reparses the file.
+  """
+
+  def __init__(self, path: str = SESSIONS_TS) -> None:
+    self.path = path
+    self.text: Optional[str] = None
+    self.spans: List[Tuple[int, int]] = []
+    self.items: List[Optional[Session]] = []
+    self.reparsed = 0  # session literals parsed by the last update; -1 for the whole file
+
+  def update(self) -> List[Session]:
+    with open(self.path, "r", encoding="utf-8") as f:
+      text = f.read()
+    if self.text is None or not self._patch(text):
+      literals = session_literals(text)
+      self.spans = [(s, e) for s, e, _ in literals]
+      self.items = [_literal_session(tokens) for _, _, tokens in literals]
+      self.reparsed = -1
+    self.text = text
+    return [s for s in self.items if s]
+
+  def _patch(self, text: str) -> bool:
+    old = self.text or ""
+    if text == old:
+      self.reparsed = 0
+      return True
+    i = bisect.bisect_left(self.spans, (_common_prefix(old, text), -1)) - 1
+    if i < 0:
+      return False  # the edit starts before the first literal
+    start, end = self.spans[i]
+    delta = len(text) - len(old)
+    if end - 1 + delta <= start or old[end - 1:] != text[end - 1 + delta:]:
+      return False  # the edit reaches the literal's closing brace or goes past it
+    literal = list(_nesting(tokenize_ts_spans(text[start:end + delta])))
+    closes = [n for n, t in enumerate(literal) if t[4] <= 0]
+    if closes != [len(literal) - 1] or literal[-1][3] != end - start + delta:
+      return False  # split, merged or unterminated: let the full parse decide
+    self.items[i] = _literal_session([(kind, tok) for kind, tok, _, _, _ in literal])
+    self.spans[i:] = [(start, end + delta)] + [(s + delta, e + delta) for s, e in self.spans[i + 1:]]
+    self.reparsed = 1
+    return True
+
+
+def _read_chunks(path: str, size: int, digest: Optional["hashlib._Hash"] = None) -> Iterator[str]:
+  with open(path, "rb") as f:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+      block = f.read(size)
+      if digest is not None:
+        digest.update(block)
+      text = decoder.decode(block, final=not block)
+      if text:
+        yield text
+      if not block:
+        return
+
+
+def iter_sessions(
+  path: str = SESSIONS_TS, chunk_size: int = 1 << 16, digest: Optional["hashlib._Hash"] = None
+) -> Iterator[Session]:
+  """Yield each Session of sessions.ts as soon as its object literal closes.
+
+  The file is read and tokenized in chunks, so memory does not grow with its size
+  and the first session is available before the rest of the file has been read.
+  `digest`, if given, is updated with every byte read.
+  """
+  for item in _session_objects(tokenize_ts_stream(_read_chunks(path, chunk_size, digest))):
+    s = _parse_session(item)
+    if s:
+      yield s
+
+
+def parse_sessions_text(text: str) -> List[Session]:
+  return list(iter_sessions_text(text))
+
+
 def parse_sessions_ts(path: str) -> List[Session]:
-  text = open(path, "r", encoding="utf-8").read()
+  with open(path, "r", encoding="utf-8") as f:
+    return parse_sessions_text(f.read())
 
-  # Extract top-level objects inside the sessionsData array via brace matching.
-  anchor = text.find("sessionsData")
-  if anchor == -1:
-    raise RuntimeError("No se encontro sessionsData en sessions.ts")
-  # Beware: `SessionData[]` contains `[]` before the actual array literal.
-  eq = text.find("=", anchor)
-  if eq == -1:
-    raise RuntimeError("No se encontro '=' al declarar sessionsData")
-  arr_start = text.find("[", eq)
-  if arr_start == -1:
-    raise RuntimeError("No se encontro el inicio del array literal de sessionsData")
 
-  sessions: List[Session] = []
-  i = arr_start + 1
-  in_str: Optional[str] = None
-  esc = False
-  in_line_comment = False
-  in_block_comment = False
-  depth = 0
-  obj_start = -1
-
-  while i < len(text):
-    ch = text[i]
-    nxt = text[i + 1] if i + 1 < len(text) else ""
-
-    if in_line_comment:
-      if ch == "\n":
-        in_line_comment = False
-      i += 1
-      continue
-    if in_block_comment:
-      if ch == "*" and nxt == "/":
-        in_block_comment = False
-        i += 2
-        continue
-      i += 1
-      continue
+def _cache_key(data: bytes) -> str:
+  return _digest_key(hashlib.sha256(data))
 
-    if in_str:
-      if esc:
-        esc = False
-      elif ch == "\\":
-        esc = True
-      elif ch == in_str:
-        in_str = None
-      i += 1
-      continue
 
-    if ch == "/" and nxt == "/":
-      in_line_comment = True
-      i += 2
-      continue
-    if ch == "/" and nxt == "*":
-      in_block_comment = True
-      i += 2
-      continue
+def _digest_key(digest: "hashlib._Hash") -> str:
+  return f"v{PARSER_VERSION}:{digest.hexdigest()}"
 
-    if ch in ("'", '"', "`"):
-      in_str = ch
-      i += 1
-      continue
 
-    if ch == "{":
-      if depth == 0:
-        obj_start = i
-      depth += 1
-    elif ch == "}":
-      depth -= 1
-      if depth == 0 and obj_start != -1:
-        obj_txt = text[obj_start : i + 1]
-        s = _parse_session(obj_txt)
-        if s:
-          sessions.append(s)
-        obj_start = -1
-    elif ch == "]" and depth == 0:
-      break
+def _read_parse_cache(cache_path: str, key: str) -> Optional[List[Session]]:
+  try:
+    with open(cache_path, "r", encoding="utf-8") as f:
+      payload = json.load(f)
+    if payload.get("key") != key:
+      return None
+    sessions = []
+    for d in payload["sessions"]:
+      d = dict(d, resources=[Resource(**r) for r in d["resources"]])
+      sessions.append(Session(**d))
+    return sessions
+  except (OSError, ValueError, KeyError, TypeError):
+    # Missing, corrupt or written by an incompatible version: parse again.
+    return None
 
-    i += 1
 
+def _write_parse_cache(cache_path: str, key: str, sessions: List[Session]) -> None:
+  os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+  tmp = f"{cache_path}.{os.getpid()}.tmp"
+  with open(tmp, "w", encoding="utf-8") as f:
+    json.dump({"key": key, "sessions": [asdict(s) for s in sessions]}, f, ensure_ascii=False)
+  os.replace(tmp, cache_path)
+
+
+def load_sessions(path: str = SESSIONS_TS, cache_path: Optional[str] = PARSE_CACHE) -> List[Session]:
+  """Parse sessions.ts, reusing the on-disk parse cache when its content hash matches.
+
+  Pass cache_path=None to always parse.
+  """
+  with open(path, "rb") as f:
+    data = f.read()
+  if cache_path is None:
+    return parse_sessions_text(data.decode("utf-8"))
+  key = _cache_key(data)
+  sessions = _read_parse_cache(cache_path, key)
+  if sessions is None:
+    sessions = parse_sessions_text(data.decode("utf-8"))
+    _write_parse_cache(cache_path, key, sessions)
   return sessions
 
 
-def build_pdf(out_path: str, resource_title: str, session: Session, used_in: List[int]) -> None:
-  styles = getSampleStyleSheet()
+def stream_sessions(path: str = SESSIONS_TS, cache_path: Optional[str] = PARSE_CACHE) -> Iterator[Session]:
+  """Like load_sessions, but yield each Session as soon as it is available.
+
+  A valid parse cache is replayed. Otherwise sessions.ts is parsed with
+  iter_sessions; with a cache_path the sessions are also kept to refresh the
+  cache once the file is done, so pass cache_path=None to keep memory flat on
+  very large or generated course files.
+  """
+  if cache_path is None:
+    yield from iter_sessions(path)
+    return
+  digest = hashlib.sha256()
+  with open(path, "rb") as f:
+    for block in iter(lambda: f.read(1 << 20), b""):
+      digest.update(block)
+  cached = _read_parse_cache(cache_path, _digest_key(digest))
+  if cached is not None:
+    yield from cached
+    return
+  # Hash what is actually parsed, in case the file changes in between.
+  digest = hashlib.sha256()
+  sessions: List[Session] = []
+  for s in iter_sessions(path, digest=digest):
+    sessions.append(s)
+    yield s
+  _write_parse_cache(cache_path, _digest_key(digest), sessions)
 
-  h1 = ParagraphStyle(
-    "H1",
-    parent=styles["Title"],
-    fontName="Helvetica-Bold",
-    fontSize=18,
-    leading=22,
-    textColor=colors.HexColor("#111827"),
-    spaceAfter=8,
-  )
-  h2 = ParagraphStyle(
-    "H2",
-    parent=styles["Heading2"],
-    fontName="Helvetica-Bold",
-    fontSize=12.5,
-    leading=15,
-    textColor=colors.HexColor("#111827"),
-    spaceBefore=10,
-    spaceAfter=6,
-  )
-  p = ParagraphStyle(
-    "P",
-    parent=styles["Normal"],
-    fontName="Helvetica",
-    fontSize=10.5,
-    leading=14,
-    textColor=colors.HexColor("#111827"),
-  )
-  small = ParagraphStyle(
-    "Small",
-    parent=p,
-    fontSize=9.5,
-    leading=12,
-    textColor=colors.HexColor("#374151"),
-  )
+
+def check_parse_cache(path: str = SESSIONS_TS, cache_path: str = PARSE_CACHE) -> bool:
+  with open(path, "rb") as f:
+    key = _cache_key(f.read())
+  return _read_parse_cache(cache_path, key) is not None
+
+
+def purge_parse_cache(cache_path: str = PARSE_CACHE) -> bool:
+  try:
+    os.remove(cache_path)
+    return True
+  except FileNotFoundError:
+    return False
+
+
+# Bump whenever build_pdf's layout or wording changes so every output it owns
+# is rebuilt on the next run.
+TEMPLATE_VERSION = 1
+# How build_pdf outputs are named in the build manifest, build_resources and metrics.
+SUMMARY_BUILDER = "session_summary"
+
+
+def summary_epoch(entry: Optional[dict], input_hashes: Dict[str, str]) -> Optional[int]:
+  """Date of a summary in reproducible mode (None outside it), kept in its build-manifest entry.
+
+  While the summary's input hashes match the entry, the recorded epoch is
+  reused, so a rebuild for any other reason (--force, a template bump) gives
+  the same bytes and editing another session does not re-date it. When they
+  change, the date moves to the last change of sessions.ts: the edit that
+  changed them.
+  """
+  if not reproducible():
+    return None
+  if entry is not None and entry.get("inputs") == input_hashes and isinstance(entry.get("epoch"), int):
+    return entry["epoch"]
+  return source_epoch(SESSIONS_TS)
+
+
+def pdf_inputs(resource_title: str, session: Session, used_in: List[int]) -> Dict[str, object]:
+  """Exactly the values build_pdf renders, except the date (summary_epoch); keep in sync with it."""
+  return {
+    "resource_title": resource_title,
+    "session_number": session.session_number,
+    "title": session.title,
+    "subtitle": session.subtitle,
+    "date_str": session.date_str,
+    "block": [session.block_number, session.block_title],
+    "objectives": session.objectives[:8],
+    "grammar_title": session.grammar_title,
+    "grammar_rules": session.grammar_rules[:6],
+    "vocab_title": session.vocab_title,
+    "vocab_terms": session.vocab_terms[:18],
+    "used_in": used_in,
+  }
+
+
+def build_pdf(
+  out_path: str, resource_title: str, session: Session, used_in: List[int], epoch: Optional[int] = None
+) -> bool:
+  """Render one summary; in reproducible mode it is dated `epoch` (default: last change of sessions.ts)."""
+  # reportlab is imported here so cache checks and no-op runs don't pay for it.
+  from reportlab.lib.pagesizes import A4
+  from reportlab.lib.units import cm
+  from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+  from pdf_theme import box_table_style, handout_styles
+
+  h1, h2, p, small = handout_styles(compact=True)
 
   doc = SimpleDocTemplate(
-    out_path,
+    io.BytesIO(),
     pagesize=A4,
     leftMargin=1.6 * cm,
     rightMargin=1.6 * cm,
@@ -353,7 +697,7 @@ def build_pdf(out_path: str, resource_title: str, session: Session, used_in: Lis
     meta_bits.append(f"Bloque {session.block_number}: {session.block_title}")
   if len(used_in) > 1:
     meta_bits.append("Usado en sesiones: " + ", ".join(map(str, used_in)))
-  meta_bits.append(f"Actualizado: {date.today().isoformat()}")
+  meta_bits.append(f"Actualizado: {stamp_date(SESSIONS_TS, epoch).isoformat()}")
   story.append(Paragraph(" · ".join(meta_bits), small))
   story.append(Spacer(1, 10))
 
@@ -390,57 +734,499 @@ def build_pdf(out_path: str, resource_title: str, session: Session, used_in: Lis
     "Marca 3 expresiones/ideas que quieras usar hoy y úsalas al menos una vez."
   )
   box = Table([[Paragraph(tip, small)]], colWidths=[16.8 * cm])
-  box.setStyle(
-    TableStyle(
-      [
-        ("BOX", (0, 0), (-1, -1), 0.7, colors.HexColor("#d1d5db")),
-        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#f9fafb")),
-        ("LEFTPADDING", (0, 0), (-1, -1), 10),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-        ("TOPPADDING", (0, 0), (-1, -1), 10),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-      ]
-    )
-  )
+  box.setStyle(box_table_style())
   story.append(box)
 
-  doc.build(story)
+  return save(doc, story, out_path, SESSIONS_TS, epoch)
+
+
+def _hash_value(value: object) -> str:
+  blob = json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")
+  return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def hash_inputs(inputs: Dict[str, object]) -> Dict[str, str]:
+  return {k: _hash_value(v) for k, v in inputs.items()}
+
+
+def load_build_manifest(path: str = BUILD_MANIFEST) -> Dict[str, dict]:
+  try:
+    with open(path, "r", encoding="utf-8") as f:
+      return json.load(f).get("outputs", {})
+  except FileNotFoundError:
+    return {}
+
+
+def save_build_manifest(outputs: Dict[str, dict], path: str = BUILD_MANIFEST) -> None:
+  tmp = f"{path}.{os.getpid()}.tmp"
+  with open(tmp, "w", encoding="utf-8") as f:
+    json.dump({"outputs": dict(sorted(outputs.items()))}, f, ensure_ascii=False, indent=2)
+    f.write("\n")
+  os.replace(tmp, path)
+
+
+def manifest_entry(
+  url: str,
+  input_hashes: Dict[str, str],
+  template: int = TEMPLATE_VERSION,
+  builder: str = SUMMARY_BUILDER,
+  epoch: Optional[int] = None,
+) -> dict:
+  entry = {"url": url, "builder": builder, "template": template, "inputs": input_hashes}
+  if epoch is not None:
+    entry["epoch"] = epoch  # see summary_epoch
+  return entry
+
+
+def stale_reasons(
+  entry: Optional[dict], input_hashes: Dict[str, str], exists: bool, template: int = TEMPLATE_VERSION
+) -> List[str]:
+  """Why an output recorded as `entry` must be rebuilt; empty if it is up to date."""
+  if entry is None:
+    return ["new"]
+  reasons = []
+  if not exists:
+    reasons.append("missing")
+  if entry.get("template") != template:
+    reasons.append(f"template v{entry.get('template')} -> v{template}")
+  old = entry.get("inputs", {})
+  changed = [k for k in input_hashes if old.get(k) != input_hashes[k]] + [k for k in old if k not in input_hashes]
+  if changed:
+    reasons.append("changed: " + ", ".join(changed))
+  return reasons
+
+
+def looks_generated(path: str) -> bool:
+  """Whether the PDF at `path` was written by reportlab with this repo's author stamp."""
+  try:
+    with open(path, "rb") as f:
+      data = f.read()
+  except OSError:
+    return False
+  return b"/Author (oral7)" in data and b"/Producer (ReportLab" in data
+
+
+def build_decision(
+  entry: Optional[dict],
+  input_hashes: Dict[str, str],
+  exists: bool,
+  force: bool = False,
+  template: int = TEMPLATE_VERSION,
+  out_path: Optional[str] = None,
+) -> Tuple[str, List[str]]:
+  """Return ("unmanaged" | "up-to-date" | "build", reasons) for one output.
+
+  An existing output without a manifest entry is left alone unless `out_path`
+  shows an earlier run wrote it, as on a fresh clone; then it is rebuilt. A
+  symlink is always left alone, even with force: it aliases another file, and
+  writing the output would replace the link with a copy.
+  """
+  if out_path is not None and os.path.islink(out_path):
+    return "unmanaged", []
+  if entry is None and exists and not force:
+    if out_path is not None and looks_generated(out_path):
+      return "build", ["not in build manifest"]
+    # Hand-made or from another tool: leave it alone.
+    return "unmanaged", []
+  reasons = ["forced"] if force else stale_reasons(entry, input_hashes, exists, template)
+  return ("build" if reasons else "up-to-date"), reasons
 
 
-def main() -> int:
-  os.makedirs(OUT_DIR, exist_ok=True)
-  sessions = parse_sessions_ts(SESSIONS_TS)
+@dataclass
+class ResourceUse:
+  url: str
+  title: str
+  primary: Session
+  used_in: List[int]
 
-  # Map resource url -> (title, sessions referencing)
-  url_to_title: Dict[str, str] = {}
-  url_to_sessions: Dict[str, List[int]] = {}
-  url_to_primary_session: Dict[str, Session] = {}
+  @property
+  def filename(self) -> str:
+    return self.url.removeprefix("/resources/")
 
-  for s in sessions:
+
+class ResourceCollector:
+  """collect_resources one session at a time: add() each session, read uses() at the end."""
+
+  def __init__(self) -> None:
+    self._title: Dict[str, str] = {}
+    self._sessions: Dict[str, List[int]] = {}
+    self._primary: Dict[str, Session] = {}
+
+  def add(self, s: Session) -> List[str]:
+    """Record one session; return the urls no earlier session used."""
+    new = []
     for r in s.resources:
       if not r.url.startswith("/resources/") or not r.url.endswith(".pdf"):
         continue
-      url_to_title.setdefault(r.url, r.title)
-      url_to_sessions.setdefault(r.url, []).append(s.session_number)
+      if r.url not in self._title:
+        self._title[r.url] = r.title
+        new.append(r.url)
+      self._sessions.setdefault(r.url, []).append(s.session_number)
       # keep the earliest session as the primary metadata source
-      if r.url not in url_to_primary_session or s.session_number < url_to_primary_session[r.url].session_number:
-        url_to_primary_session[r.url] = s
-
-  created = 0
-  skipped = 0
-  for url, title in sorted(url_to_title.items(), key=lambda kv: kv[0]):
-    fname = url.removeprefix("/resources/")
-    out_path = os.path.join(OUT_DIR, fname)
-    if os.path.exists(out_path):
-      skipped += 1
-      continue
-    primary = url_to_primary_session[url]
-    used_in = sorted(set(url_to_sessions.get(url, [])))
-    build_pdf(out_path, title, primary, used_in)
-    created += 1
+      if r.url not in self._primary or s.session_number < self._primary[r.url].session_number:
+        self._primary[r.url] = s
+    return new
+
+  def use(self, url: str) -> ResourceUse:
+    """The resource as known so far; final once every session has been added."""
+    return ResourceUse(url, self._title[url], self._primary[url], sorted(set(self._sessions[url])))
+
+  def uses(self) -> Dict[str, ResourceUse]:
+    return {url: self.use(url) for url in sorted(self._title)}
+
+
+_RESOURCE_URL = re.compile(r"""['"`](/resources/[^'"`\\\n]+?\.pdf)['"`]""")
+
+
+def shared_urls(path: str = SESSIONS_TS) -> Set[str]:
+  """/resources urls written more than once in sessions.ts, found without parsing it.
+
+  A match in a comment or twice in one session also counts: for StreamingBuild
+  that only delays a render to finish(), it never renders anything twice.
+  """
+  with open(path, "r", encoding="utf-8") as f:
+    counts = Counter(_RESOURCE_URL.findall(f.read()))
+  return {url for url, n in counts.items() if n > 1}
+
+
+def collect_resources(sessions: Iterable[Session]) -> Dict[str, ResourceUse]:
+  """Map each /resources/*.pdf url to its title, primary session and sessions using it, sorted by url."""
+  collector = ResourceCollector()
+  for s in sessions:
+    collector.add(s)
+  return collector.uses()
+
+
+@dataclass
+class RenderJob:
+  url: str
+  title: str
+  session: Session
+  used_in: List[int]
+  out_path: str
+  reasons: Tuple[str, ...] = ()
+  epoch: Optional[int] = None
+
+
+@dataclass
+class RenderResult:
+  url: str
+  out_path: str
+  seconds: float
+  error: Optional[str] = None
+  written: bool = True  # False when the output already had identical bytes
+  phases: Dict[str, float] = field(default_factory=dict)  # pdf_profile.PHASES -> seconds
+  metrics: Dict[str, object] = field(default_factory=dict)  # one pdf_metrics JSONL record
+
+
+def _warm_worker() -> None:
+  # Pay the reportlab import and theme setup once per worker; build_pdf's local
+  # imports then resolve from sys.modules.
+  import pdf_theme
+
+  pdf_theme.handout_styles(compact=True)
+
+
+def _render(job: RenderJob) -> RenderResult:
+  t0 = time.perf_counter()
+  try:
+    with pdf_metrics.measure(SUMMARY_BUILDER, os.path.basename(job.out_path), job.used_in) as m:
+      written = build_pdf(job.out_path, job.title, job.session, job.used_in, job.epoch)
+  except Exception:
+    return RenderResult(job.url, job.out_path, time.perf_counter() - t0, traceback.format_exc())
+  seconds = time.perf_counter() - t0
+  return RenderResult(job.url, job.out_path, seconds, written=written, phases=m.phases, metrics=m.record)
+
+
+def render_jobs(jobs: List[RenderJob], workers: int = 1) -> List[RenderResult]:
+  """Render jobs in order, in-process or across a pool of `workers` processes.
 
-  print(f"Created: {created}, skipped(existing): {skipped}")
-  return 0
+  A failing job is reported in its result instead of aborting the others.
+  """
+  if workers <= 1 or len(jobs) <= 1:
+    return [_render(j) for j in jobs]
+  with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_warm_worker) as pool:
+    return list(pool.map(_render, jobs))
+
+
+@dataclass
+class _Provisional:
+  hashes: Dict[str, str]
+  job: Optional[RenderJob] = None  # set if it was rendered before its inputs were final
+  pending: object = None  # the job's RenderResult, or its Future with a pool
+
+
+class StreamingBuild:
+  """Plan and render /resources PDFs while sessions.ts is still being parsed.
+
+  feed() each session as it is parsed: a resource is planned as soon as the first
+  session using it arrives, with the sessions known so far, and rendered right
+  away (in-process, or submitted to the pool) if it needs building. Urls in
+  `shared` (shared_urls: written more than once in sessions.ts) are left for
+  finish() instead, since their used_in is not final until a later session
+  arrives and an early render would be thrown away. finish() plans every
+  resource with its final inputs; an early render whose inputs still changed
+  (shared missed a url) is redone after it completes, so the two never race.
+
+  Filenames in `owned` (handout specs, markdown sources) and manifest entries
+  written by another builder are never planned, not even with force or adopt.
+  """
+
+  def __init__(
+    self,
+    manifest: Dict[str, dict],
+    force: bool = False,
+    workers: int = 1,
+    owned: Iterable[str] = (),
+    shared: Iterable[str] = (),
+  ) -> None:
+    self.manifest = manifest
+    self.force = force
+    self.owned: Set[str] = set(owned)
+    self.shared: Set[str] = set(shared)
+    self.collector = ResourceCollector()
+    self.provisional: Dict[str, _Provisional] = {}
+    self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) if workers > 1 else None
+    self.inline_seconds = 0.0  # spent rendering inside feed() when there is no pool
+    self.first_done: Optional[float] = None  # perf_counter() when the first PDF was finished
+    self.rerendered = 0
+    # Filled in by finish():
+    self.jobs: List[RenderJob] = []
+    self.results: List[RenderResult] = []
+    self.hashes: Dict[str, Dict[str, str]] = {}
+    self.up_to_date = 0
+    self.unmanaged = 0
+    self.adopted = 0
+    self.foreign = 0
+
+  def _foreign(self, filename: str) -> bool:
+    """Whether another builder produces `filename`."""
+    entry = self.manifest.get(filename)
+    return filename in self.owned or (entry is not None and entry.get("builder", SUMMARY_BUILDER) != SUMMARY_BUILDER)
+
+  def _plan(self, use: ResourceUse) -> Tuple[Dict[str, str], str, List[str]]:
+    hashes = {**hash_inputs(pdf_inputs(use.title, use.primary, use.used_in)), **output_options()}
+    out_path = os.path.join(OUT_DIR, use.filename)
+    decision, reasons = build_decision(
+      self.manifest.get(use.filename), hashes, os.path.exists(out_path), self.force, TEMPLATE_VERSION, out_path
+    )
+    return hashes, decision, reasons
+
+  def _done(self, _: object = None) -> None:
+    if self.first_done is None:
+      self.first_done = time.perf_counter()
+
+  def _submit(self, use: ResourceUse, hashes: Dict[str, str], reasons: List[str]) -> Tuple[RenderJob, object]:
+    out_path = os.path.join(OUT_DIR, use.filename)
+    epoch = summary_epoch(self.manifest.get(use.filename), hashes)
+    job = RenderJob(use.url, use.title, use.primary, use.used_in, out_path, tuple(reasons), epoch)
+    if self.pool is not None:
+      future = self.pool.submit(_render, job)
+      future.add_done_callback(self._done)
+      return job, future
+    t0 = time.perf_counter()
+    result = _render(job)
+    self.inline_seconds += time.perf_counter() - t0
+    self._done()
+    return job, result
+
+  @staticmethod
+  def _result(pending: object) -> RenderResult:
+    return pending.result() if hasattr(pending, "result") else pending  # type: ignore[union-attr,return-value]
+
+  def feed(self, session: Session) -> None:
+    for url in self.collector.add(session):
+      use = self.collector.use(url)
+      if self._foreign(use.filename):
+        continue
+      if url in self.shared:
+        self.provisional[url] = _Provisional({})  # planned once in finish(), with its final used_in
+        continue
+      hashes, decision, reasons = self._plan(use)
+      prov = _Provisional(hashes)
+      if decision == "build":
+        prov.job, prov.pending = self._submit(use, hashes, reasons)
+      self.provisional[url] = prov
+
+  def finish(self, adopt: bool = False) -> None:
+    """Finalize used_in, render what is still needed and wait for every render."""
+    pending: List[object] = []
+    try:
+      for url, use in self.collector.uses().items():
+        if self._foreign(use.filename):
+          self.foreign += 1
+          continue
+        prov = self.provisional[url]
+        hashes, decision, reasons = self._plan(use)
+        self.hashes[use.filename] = hashes
+        if prov.job is not None and hashes == prov.hashes:
+          self.jobs.append(prov.job)
+          pending.append(prov.pending)
+          continue
+        if prov.job is not None:
+          # Rendered with partial used_in: wait for it, then overwrite it with the final inputs.
+          self._result(prov.pending)
+          self.rerendered += 1
+          decision, reasons = "build", (reasons if decision == "build" else ["used_in finalized after rendering"])
+        if decision == "build":
+          job, result = self._submit(use, hashes, reasons)
+          self.jobs.append(job)
+          pending.append(result)
+        elif decision == "unmanaged" and adopt:
+          self.manifest[use.filename] = manifest_entry(url, hashes, TEMPLATE_VERSION, SUMMARY_BUILDER)
+          self.adopted += 1
+        elif decision == "unmanaged":
+          self.unmanaged += 1
+        else:
+          self.up_to_date += 1
+      self.results = [self._result(p) for p in pending]
+    finally:
+      self.close()
+
+  def abort(self) -> List[Tuple[RenderJob, Dict[str, str]]]:
+    """Wait for renders started so far and return the ones that succeeded, with their provisional hashes.
+
+    Recording them in the build manifest keeps outputs written before a parse
+    error from looking hand-made (unmanaged) on the next run; their provisional
+    hashes make that run rebuild them if the final inputs differ.
+    """
+    done = []
+    try:
+      for prov in self.provisional.values():
+        if prov.job is not None and not self._result(prov.pending).error:
+          done.append((prov.job, prov.hashes))
+    finally:
+      self.close()
+    return done
+
+  def close(self) -> None:
+    if self.pool is not None:
+      self.pool.shutdown()
+      self.pool = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  ap = argparse.ArgumentParser(description="Genera los PDFs de /resources que faltan a partir de sessions.ts.")
+  ap.add_argument("--no-cache", action="store_true", help="parse sessions.ts even if the parse cache is valid")
+  ap.add_argument("--check-cache", action="store_true", help="exit 0 if the parse cache matches sessions.ts, 1 otherwise")
+  ap.add_argument("--purge-cache", action="store_true", help="delete the parse cache and exit")
+  ap.add_argument(
+    "--force",
+    action="store_true",
+    help="rebuild every summary, including ones not in the build manifest (never spec or markdown outputs)",
+  )
+  ap.add_argument(
+    "--adopt",
+    action="store_true",
+    help="record hand-made outputs missing from the build manifest as up to date instead of skipping them",
+  )
+  ap.add_argument("--jobs", "-j", type=int, default=1, metavar="N", help="render with N worker processes")
+  ap.add_argument(
+    "--reproducible",
+    action="store_true",
+    help="date PDFs from the last change of sessions.ts instead of today (also on if SOURCE_DATE_EPOCH is set)",
+  )
+  ap.add_argument("--linearize", action="store_true", help="write linearized (fast web view) PDFs; needs pikepdf")
+  ap.add_argument("--profile", action="store_true", help="print parse/story/layout/write timings per document")
+  ap.add_argument(
+    "--profile-out",
+    metavar="FILE.pstats",
+    help="also run under cProfile and write FILE.pstats plus FILE.collapsed (flamegraph stacks); implies --profile",
+  )
+  ap.add_argument(
+    "--metrics",
+    metavar="FILE",
+    help="append per-document metrics to FILE (default: PDF_METRICS or .cache/render-metrics.jsonl)",
+  )
+  ap.add_argument("--no-metrics", action="store_true", help="do not record per-document metrics")
+  args = ap.parse_args(argv)
+  if args.metrics or args.no_metrics:
+    pdf_metrics.set_sink(None if args.no_metrics else os.path.abspath(args.metrics))
+  if args.reproducible:
+    enable_reproducible()
+  if args.linearize:
+    try:
+      enable_linearize()
+    except RuntimeError as e:
+      ap.error(str(e))
+
+  if args.purge_cache:
+    removed = purge_parse_cache()
+    print(f"Parse cache {'removed' if removed else 'not present'}: {PARSE_CACHE}")
+    return 0
+  if args.check_cache:
+    valid = check_parse_cache()
+    print(f"Parse cache {'valid' if valid else 'stale or missing'}: {PARSE_CACHE}")
+    return 0 if valid else 1
+
+  if args.profile_out and args.jobs > 1:
+    print("--profile-out: rendering in-process so cProfile sees every document (ignoring --jobs)")
+    args.jobs = 1
+  with pdf_profile.profiled(args.profile_out):
+    return _build(args)
+
+
+def _build(args: argparse.Namespace) -> int:
+  # Imported here: build_resources imports this module.
+  from build_resources import owned_outputs
+
+  os.makedirs(OUT_DIR, exist_ok=True)
+  manifest = load_build_manifest()
+
+  # Resources are planned and rendered while sessions.ts is still being parsed.
+  t0 = time.perf_counter()
+  stream = StreamingBuild(manifest, args.force, args.jobs, owned_outputs(), shared_urls())
+  try:
+    for session in stream_sessions(cache_path=None if args.no_cache else PARSE_CACHE):
+      stream.feed(session)
+  except BaseException:
+    done = stream.abort()
+    for job, job_hashes in done:
+      manifest[os.path.basename(job.out_path)] = manifest_entry(job.url, job_hashes, epoch=job.epoch)
+    if done:
+      save_build_manifest(manifest)
+    raise
+  parse_seconds = time.perf_counter() - t0 - stream.inline_seconds
+  stream.finish(adopt=args.adopt)
+  wall = time.perf_counter() - t0
+  jobs, results, hashes = stream.jobs, stream.results, stream.hashes
+
+  failed = [r for r in results if r.error]
+  for job, r in zip(jobs, results):
+    status = "FAILED" if r.error else ("built" if r.written else "unchanged")
+    print(f"  {r.seconds * 1000:8.1f} ms  {status}  {os.path.basename(r.out_path)}  ({'; '.join(job.reasons)})")
+    if not r.error:
+      fname = os.path.basename(r.out_path)
+      manifest[fname] = manifest_entry(job.url, hashes[fname], epoch=job.epoch)
+  for r in failed:
+    print(f"\n{r.url}:\n{r.error}")
+  if len(results) > len(failed) or stream.adopted:
+    save_build_manifest(manifest)
+  uses = stream.collector.uses().values()
+  resources_manifest.publish((u.url, os.path.join(OUT_DIR, u.filename), u.used_in) for u in uses)
+  pdf_metrics.append(r.metrics for r in results if not r.error)
+
+  created = sum(1 for r in results if r.written and not r.error)
+  identical = sum(1 for r in results if not r.written and not r.error)
+  summary = f"Created: {created}, up-to-date: {stream.up_to_date}, unmanaged(existing): {stream.unmanaged}"
+  if identical:
+    summary += f", unchanged bytes: {identical}"
+  if stream.adopted:
+    summary += f", adopted: {stream.adopted}"
+  if stream.foreign:
+    summary += f", left to other builders: {stream.foreign}"
+  if stream.rerendered:
+    summary += f", re-rendered after used_in was final: {stream.rerendered}"
+  if failed:
+    summary += f", failed: {len(failed)}"
+  if results:
+    summary += f" in {wall:.2f}s with {max(1, args.jobs)} job(s)"
+    if stream.first_done is not None:
+      summary += f", first PDF after {(stream.first_done - t0) * 1000:.0f} ms"
+  print(summary)
+  if args.profile or args.profile_out:
+    pdf_profile.print_phases([(os.path.basename(r.out_path), r.phases) for r in results], parse_seconds)
+  return 1 if failed else 0
 
 
 if __name__ == "__main__":
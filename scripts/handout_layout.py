@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""Motor de maquetación de las fichas declarativas de contenido-pdfs/fichas/.
+
+Cada fichero sesion-NN.json describe los handouts dedicados de una sesión como
+datos: ya no hay un builder de Python por PDF. El motor conoce un juego pequeño
+de bloques y los coloca con la tipografía de pdf_theme:
+
+  text         párrafo (markup de reportlab) con un estilo del layout
+  poster_grid  rejilla de cajas título + texto, rellenada por columnas
+  term_table   tabla con cabecera (términos, fórmulas, ejemplos...)
+  card         tarjeta enmarcada con título, descripción y listas
+  list         viñetas "• texto" o "• <b>etiqueta:</b> texto"
+  labeled      etiqueta en negrita seguida de una o más líneas
+  spacer, page_break
+
+  {"session": 3, "handouts": [
+    {"output": "subjuntivo-duda.pdf", "title": "Tarjetas de rol", "layout": "handout",
+     "blocks": [{"type": "text", "text": "Tarjetas de rol", "style": "h1"},
+                {"type": "card", "title": "Moderador", "text": "...",
+                 "sections": [["Ejemplos", ["...", "..."]]], "space_after": 10}]}]}
+
+Cualquier bloque admite "space_after" (puntos). "{updated}" en un texto se
+sustituye por la fecha de la ficha (pdf_output.stamp_date). Las anchuras van en cm.
+
+Cada fichero se valida y se compila una vez por proceso (y de nuevo solo si
+cambia en disco): los bloques compilados guardan el markup ya compuesto, las
+anchuras en puntos y los TableStyle, y renderizar solo crea los flowables. Así
+build_resources.py y watch_resources.py renderizan todas las fichas con un solo
+motor caliente. Añadir los handouts de una sesión nueva es añadir su JSON; el
+builder se llama session<N>.
+
+Uso: python3 scripts/handout_layout.py [--check]
+(sin opciones lista las fichas; --check solo valida, informa de los errores de
+todas y sale con 1 si alguna falla)
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import io
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+import pdf_theme
+from pdf_output import save, stamp_date
+from pdf_theme import HandoutStyles, PosterStyles, box_table_style, grid_table_style, poster_grid_style
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SPEC_DIR = os.path.join(ROOT, "contenido-pdfs", "fichas")
+
+CARD_WIDTH_CM = 16.4
+CARD_BORDER = 0.8
+POSTER_COLUMN_CM = 13.2
+
+_SPEC_NAME = re.compile(r"^sesion-\d+\.json$")
+
+# Bump whenever a block or layout renders differently, so every handout is
+# rebuilt on the next build_resources.py run (its spec file hash is the other input).
+ENGINE_VERSION = 1
+
+
+class SpecError(ValueError):
+    """A spec file that does not describe valid handouts."""
+
+
+@dataclass(frozen=True)
+class Layout:
+    pagesize: Tuple[float, float]
+    margins: Tuple[float, float, float, float]  # left, right, top, bottom in cm
+    styles: Callable[[], NamedTuple]
+    fields: Tuple[str, ...]  # style names blocks may use
+    body: str  # default text style
+
+
+LAYOUTS = {
+    "handout": Layout(A4, (1.6, 1.6, 1.5, 1.5), pdf_theme.handout_styles, HandoutStyles._fields, "p"),
+    "poster": Layout(landscape(A4), (1.2, 1.2, 1.0, 1.0), pdf_theme.poster_styles, PosterStyles._fields, "box_body"),
+}
+
+THEME_COLORS = {
+    "ink": pdf_theme.INK,
+    "muted": pdf_theme.MUTED,
+    "heading": pdf_theme.HEADING,
+    "rule": pdf_theme.RULE,
+    "panel": pdf_theme.PANEL,
+    "white": pdf_theme.WHITE,
+}
+
+Context = Dict[str, str]
+
+
+def _fill(markup: str, ctx: Context) -> str:
+    return markup.replace("{updated}", ctx["updated"]) if "{" in markup else markup
+
+
+# --- compiled blocks ---------------------------------------------------------
+#
+# Each block keeps only what varies per document: the rendered style set and the
+# date. Markup, widths and table styles are worked out once by compile_block.
+
+
+@dataclass
+class Block(abc.ABC):
+    space_after: float = 0.0
+
+    @abc.abstractmethod
+    def flowables(self, styles: NamedTuple, ctx: Context) -> List[object]:
+        """The reportlab flowables of this block, without the trailing space_after."""
+
+    def render(self, styles: NamedTuple, ctx: Context) -> List[object]:
+        out = self.flowables(styles, ctx)
+        if self.space_after:
+            out.append(Spacer(1, self.space_after))
+        return out
+
+
+@dataclass
+class TextBlock(Block):
+    markup: str = ""
+    style: str = "p"
+
+    def flowables(self, styles, ctx):
+        return [Paragraph(_fill(self.markup, ctx), getattr(styles, self.style))]
+
+
+@dataclass
+class SpacerBlock(Block):
+    height: float = 0.0
+
+    def flowables(self, styles, ctx):
+        return [Spacer(1, self.height)]
+
+
+@dataclass
+class PageBreakBlock(Block):
+    def flowables(self, styles, ctx):
+        return [PageBreak()]
+
+
+@dataclass
+class ParagraphsBlock(Block):
+    """A run of paragraphs with fixed markup: list and labeled blocks."""
+
+    lines: List[Tuple[str, str]] = field(default_factory=list)  # (markup, style); "" markup is a gap
+    gap: float = 0.0
+
+    def flowables(self, styles, ctx):
+        return [
+            Paragraph(_fill(markup, ctx), getattr(styles, style)) if markup else Spacer(1, self.gap)
+            for markup, style in self.lines
+        ]
+
+
+@dataclass
+class TermTableBlock(Block):
+    header: List[str] = field(default_factory=list)
+    rows: List[List[str]] = field(default_factory=list)
+    widths: List[float] = field(default_factory=list)
+    table_style: Optional[TableStyle] = None
+
+    def flowables(self, styles, ctx):
+        p = styles.p
+        data = [[Paragraph(h, p) for h in self.header]]
+        data += [[Paragraph(_fill(c, ctx), p) for c in row] for row in self.rows]
+        t = Table(data, colWidths=self.widths, repeatRows=1)
+        t.setStyle(self.table_style)
+        return [t]
+
+
+@dataclass
+class PosterGridBlock(Block):
+    cells: List[List[str]] = field(default_factory=list)
+    widths: List[float] = field(default_factory=list)
+    table_style: Optional[TableStyle] = None
+
+    def flowables(self, styles, ctx):
+        body = styles.box_body
+        rows = [[Paragraph(_fill(c, ctx), body) if c else "" for c in row] for row in self.cells]
+        t = Table(rows, colWidths=self.widths, hAlign="LEFT")
+        t.setStyle(self.table_style)
+        return [t]
+
+
+@dataclass
+class CardBlock(Block):
+    lines: List[Tuple[str, str]] = field(default_factory=list)  # (markup, style); "" markup is a 6pt gap
+    width: float = 0.0
+    table_style: Optional[TableStyle] = None
+
+    def flowables(self, styles, ctx):
+        content = [
+            Paragraph(_fill(markup, ctx), getattr(styles, style)) if markup else Spacer(1, 6)
+            for markup, style in self.lines
+        ]
+        t = Table([[content]], colWidths=[self.width])
+        t.setStyle(self.table_style)
+        return [t]
+
+
+# --- validation and compilation ---------------------------------------------
+
+
+def _fields(raw: object, where: str, required: Sequence[str], optional: Sequence[str] = ()) -> dict:
+    if not isinstance(raw, dict):
+        raise SpecError(f"{where}: se esperaba un objeto")
+    unknown = set(raw) - set(required) - set(optional) - {"type", "space_after"}
+    if unknown:
+        raise SpecError(f"{where}: claves desconocidas {', '.join(sorted(unknown))}")
+    missing = [k for k in required if k not in raw]
+    if missing:
+        raise SpecError(f"{where}: faltan {', '.join(missing)}")
+    return raw
+
+
+def _str(value: object, where: str) -> str:
+    if not isinstance(value, str):
+        raise SpecError(f"{where}: se esperaba un texto")
+    return value
+
+
+def _num(value: object, where: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise SpecError(f"{where}: se esperaba un numero positivo")
+    return float(value)
+
+
+def _strs(value: object, where: str) -> List[str]:
+    if not isinstance(value, list):
+        raise SpecError(f"{where}: se esperaba una lista de textos")
+    return [_str(v, f"{where}[{i}]") for i, v in enumerate(value)]
+
+
+def _style(raw: dict, key: str, layout: Layout, where: str) -> str:
+    style = _str(raw.get(key, layout.body), f"{where}.{key}")
+    if style not in layout.fields:
+        raise SpecError(f"{where}: estilo {style!r} no existe en este layout ({', '.join(layout.fields)})")
+    return style
+
+
+def _color(value: object, where: str) -> str:
+    value = _str(value, where)
+    if value.startswith("#"):
+        return value
+    if value not in THEME_COLORS:
+        raise SpecError(f"{where}: color {value!r} desconocido (usa #rrggbb o {', '.join(THEME_COLORS)})")
+    return THEME_COLORS[value]
+
+
+def _text(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["text"], ["style"])
+    return TextBlock(markup=_str(raw["text"], f"{where}.text"), style=_style(raw, "style", layout, where))
+
+
+def _spacer(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["height"])
+    return SpacerBlock(height=_num(raw["height"], f"{where}.height"))
+
+
+def _page_break(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, [])
+    return PageBreakBlock()
+
+
+def _list(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["items"], ["style", "bullet"])
+    style = _style(raw, "style", layout, where)
+    bullet = _str(raw.get("bullet", "•"), f"{where}.bullet")
+    lines = []
+    for i, item in enumerate(raw["items"] if isinstance(raw["items"], list) else [None]):
+        at = f"{where}.items[{i}]"
+        if isinstance(item, list):
+            if len(item) != 2:
+                raise SpecError(f"{at}: se esperaba [etiqueta, texto]")
+            label, text = _strs(item, at)
+            lines.append((f"{bullet} <b>{label}:</b> {text}", style))
+        else:
+            lines.append((f"{bullet} {_str(item, at)}", style))
+    return ParagraphsBlock(lines=lines)
+
+
+def _labeled(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["items"], ["style", "label_style", "bullet", "gap"])
+    style = _style(raw, "style", layout, where)
+    label_style = _style(raw, "label_style", layout, where)
+    bullet = _str(raw.get("bullet", ""), f"{where}.bullet")
+    gap = _num(raw.get("gap", 0), f"{where}.gap")
+    lines: List[Tuple[str, str]] = []
+    for i, item in enumerate(raw["items"] if isinstance(raw["items"], list) else [None]):
+        at = f"{where}.items[{i}]"
+        if not (isinstance(item, list) and len(item) == 2):
+            raise SpecError(f"{at}: se esperaba [etiqueta, [lineas]]")
+        lines.append((f"<b>{_str(item[0], at)}:</b>", label_style))
+        lines += [(f"{bullet} {line}" if bullet else line, style) for line in _strs(item[1], at)]
+        if gap:
+            lines.append(("", style))
+    return ParagraphsBlock(lines=lines, gap=gap)
+
+
+def _term_table(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["columns", "rows", "header_bg"], ["header_text", "padding"])
+    if "p" not in layout.fields:
+        raise SpecError(f"{where}: term_table necesita el layout handout")
+    columns = raw["columns"]
+    if not isinstance(columns, list) or not columns:
+        raise SpecError(f"{where}.columns: se esperaba una lista de [cabecera, ancho_cm]")
+    header, widths = [], []
+    for i, col in enumerate(columns):
+        at = f"{where}.columns[{i}]"
+        if not (isinstance(col, list) and len(col) == 2):
+            raise SpecError(f"{at}: se esperaba [cabecera, ancho_cm]")
+        header.append(f"<b>{_str(col[0], at)}</b>")
+        widths.append(_num(col[1], at) * cm)
+    if not isinstance(raw["rows"], list):
+        raise SpecError(f"{where}.rows: se esperaba una lista de filas")
+    rows = []
+    for i, row in enumerate(raw["rows"]):
+        cells = _strs(row, f"{where}.rows[{i}]")
+        if len(cells) != len(header):
+            raise SpecError(f"{where}.rows[{i}]: {len(cells)} celdas, se esperaban {len(header)}")
+        rows.append(cells)
+    header_text = _color(raw["header_text"], f"{where}.header_text") if "header_text" in raw else None
+    padding = raw.get("padding", 6)
+    if not isinstance(padding, int) or isinstance(padding, bool) or padding < 0:
+        raise SpecError(f"{where}.padding: se esperaba un entero positivo")
+    style = grid_table_style(_color(raw["header_bg"], f"{where}.header_bg"), padding, header_text)
+    return TermTableBlock(header=header, rows=rows, widths=widths, table_style=style)
+
+
+def _poster_grid(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["items"], ["columns", "width"])
+    if "box_body" not in layout.fields:
+        raise SpecError(f"{where}: poster_grid necesita el layout poster")
+    ncols = raw.get("columns", 2)
+    if not isinstance(ncols, int) or isinstance(ncols, bool) or ncols < 1:
+        raise SpecError(f"{where}.columns: se esperaba un entero positivo")
+    width = _num(raw.get("width", POSTER_COLUMN_CM), f"{where}.width") * cm
+    boxes = []
+    for i, item in enumerate(raw["items"] if isinstance(raw["items"], list) else [None]):
+        at = f"{where}.items[{i}]"
+        if not (isinstance(item, list) and len(item) == 2):
+            raise SpecError(f"{at}: se esperaba [titulo, texto]")
+        title, body = _strs(item, at)
+        boxes.append(f"<para><b>{title}</b><br/>{body}</para>")
+    if not boxes:
+        raise SpecError(f"{where}.items: la rejilla esta vacia")
+    # Filled column by column, like a printed poster read top to bottom.
+    nrows = -(-len(boxes) // ncols)
+    boxes += [""] * (nrows * ncols - len(boxes))
+    cells = [[boxes[c * nrows + r] for c in range(ncols)] for r in range(nrows)]
+    return PosterGridBlock(cells=cells, widths=[width] * ncols, table_style=poster_grid_style(nrows))
+
+
+def _card(raw: dict, layout: Layout, where: str) -> Block:
+    _fields(raw, where, ["title"], ["text", "sections", "width", "border"])
+    if not {"p", "small"} <= set(layout.fields):
+        raise SpecError(f"{where}: card necesita el layout handout")
+    lines = [(f"<b>{_str(raw['title'], where + '.title')}</b>", "p")]
+    if "text" in raw:
+        lines.append((_str(raw["text"], f"{where}.text"), "small"))
+    sections = raw.get("sections", [])
+    for i, section in enumerate(sections if isinstance(sections, list) else [None]):
+        at = f"{where}.sections[{i}]"
+        if not (isinstance(section, list) and len(section) == 2):
+            raise SpecError(f"{at}: se esperaba [titulo, [lineas]]")
+        items = _strs(section[1], at)
+        lines += [("", "small"), (f"<b>{_str(section[0], at)}</b>", "small"), ("· " + "<br/>· ".join(items), "small")]
+    return CardBlock(
+        lines=lines,
+        width=_num(raw.get("width", CARD_WIDTH_CM), f"{where}.width") * cm,
+        table_style=box_table_style(_num(raw.get("border", CARD_BORDER), f"{where}.border")),
+    )
+
+
+BLOCK_TYPES: Dict[str, Callable[[dict, Layout, str], Block]] = {
+    "text": _text,
+    "spacer": _spacer,
+    "page_break": _page_break,
+    "list": _list,
+    "labeled": _labeled,
+    "term_table": _term_table,
+    "poster_grid": _poster_grid,
+    "card": _card,
+}
+
+
+def compile_block(raw: object, layout: Layout, where: str) -> Block:
+    kind = raw.get("type") if isinstance(raw, dict) else None
+    if kind not in BLOCK_TYPES:
+        raise SpecError(f"{where}: tipo de bloque {kind!r} desconocido ({', '.join(BLOCK_TYPES)})")
+    block = BLOCK_TYPES[kind](raw, layout, where)
+    block.space_after = _num(raw.get("space_after", 0), f"{where}.space_after")
+    return block
+
+
+@dataclass
+class Handout:
+    output: str
+    title: str
+    layout: str
+    blocks: List[Block]
+
+
+@dataclass
+class Spec:
+    path: str
+    session: int
+    handouts: Dict[str, Handout]  # output filename -> handout, in file order
+
+    @property
+    def builder(self) -> str:
+        return f"session{self.session}"
+
+
+def compile_spec(path: str, data: object) -> Spec:
+    name = os.path.basename(path)
+    top = _fields(data, name, ["session", "handouts"])
+    session = top["session"]
+    if not isinstance(session, int) or isinstance(session, bool):
+        raise SpecError(f"{name}.session: se esperaba un numero de sesion")
+    if not isinstance(top["handouts"], list):
+        raise SpecError(f"{name}.handouts: se esperaba una lista")
+    handouts: Dict[str, Handout] = {}
+    for i, raw in enumerate(top["handouts"]):
+        where = f"{name}.handouts[{i}]"
+        h = _fields(raw, where, ["output", "title", "blocks"], ["layout"])
+        output = _str(h["output"], f"{where}.output")
+        if not output.endswith(".pdf") or os.path.basename(output) != output:
+            raise SpecError(f"{where}.output: se esperaba un nombre de fichero .pdf")
+        if output in handouts:
+            raise SpecError(f"{where}.output: {output} repetido")
+        layout_name = _str(h.get("layout", "handout"), f"{where}.layout")
+        if layout_name not in LAYOUTS:
+            raise SpecError(f"{where}.layout: {layout_name!r} desconocido ({', '.join(LAYOUTS)})")
+        layout = LAYOUTS[layout_name]
+        if not isinstance(h["blocks"], list):
+            raise SpecError(f"{where}.blocks: se esperaba una lista")
+        blocks = [compile_block(b, layout, f"{where}.blocks[{j}]") for j, b in enumerate(h["blocks"])]
+        handouts[output] = Handout(output, _str(h["title"], f"{where}.title"), layout_name, blocks)
+    return Spec(os.path.abspath(path), session, handouts)
+
+
+# path -> ((mtime_ns, size), compiled spec); specs are recompiled only when they change.
+_compiled: Dict[str, Tuple[Tuple[int, int], Spec]] = {}
+
+
+def load_spec(path: str) -> Spec:
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _compiled.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise SpecError(f"{os.path.basename(path)}: JSON invalido: {e}") from e
+    spec = compile_spec(path, data)
+    _compiled[path] = (key, spec)
+    return spec
+
+
+def spec_paths(spec_dir: str = SPEC_DIR) -> List[str]:
+    try:
+        names = sorted(n for n in os.listdir(spec_dir) if _SPEC_NAME.match(n))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(spec_dir, n) for n in names]
+
+
+def _shared_outputs(specs: Sequence[Spec]) -> List[str]:
+    owner: Dict[str, str] = {}
+    errors = []
+    for spec in specs:
+        for output in spec.handouts:
+            if output in owner:
+                errors.append(f"{output} aparece en {owner[output]} y en {os.path.basename(spec.path)}")
+            owner[output] = os.path.basename(spec.path)
+    return errors
+
+
+def load_specs(spec_dir: str = SPEC_DIR) -> List[Spec]:
+    """Every spec in spec_dir, checking that no two handouts share an output filename."""
+    specs = [load_spec(p) for p in spec_paths(spec_dir)]
+    errors = _shared_outputs(specs)
+    if errors:
+        raise SpecError(errors[0])
+    return specs
+
+
+def check_specs(spec_dir: str = SPEC_DIR) -> List[str]:
+    """Validate every spec in spec_dir; the errors of all of them, not just the first."""
+    specs: List[Spec] = []
+    errors = []
+    for path in spec_paths(spec_dir):
+        try:
+            specs.append(load_spec(path))
+        except SpecError as e:
+            errors.append(str(e))
+    return errors + _shared_outputs(specs)
+
+
+def render_handout(out_path: str, spec_path: str, output: str) -> bool:
+    """Render handout `output` of the spec at spec_path; False if the bytes did not change."""
+    handout = load_spec(spec_path).handouts[output]
+    layout = LAYOUTS[handout.layout]
+    left, right, top, bottom = layout.margins
+    doc = SimpleDocTemplate(
+        io.BytesIO(),
+        pagesize=layout.pagesize,
+        leftMargin=left * cm,
+        rightMargin=right * cm,
+        topMargin=top * cm,
+        bottomMargin=bottom * cm,
+        title=handout.title,
+        author="oral7",
+    )
+    styles = layout.styles()
+    ctx = {"updated": stamp_date(spec_path).isoformat()}
+    story: List[object] = []
+    for block in handout.blocks:
+        story += block.render(styles, ctx)
+    return save(doc, story, out_path, spec_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Valida las fichas declarativas de contenido-pdfs/fichas/.")
+    ap.add_argument(
+        "--check", action="store_true", help="validate every spec without listing them; exit 1 if any is invalid"
+    )
+    ap.add_argument("--spec-dir", default=SPEC_DIR, help="directory with sesion-NN.json specs")
+    args = ap.parse_args(argv)
+    if args.check:
+        errors = check_specs(args.spec_dir)
+        for e in errors:
+            print(f"error: {e}")
+        if errors:
+            return 1
+        print(f"{len(spec_paths(args.spec_dir))} spec(s) OK")
+        return 0
+    try:
+        specs = load_specs(args.spec_dir)
+    except SpecError as e:
+        print(f"error: {e}")
+        return 1
+    for spec in specs:
+        blocks = sum(len(h.blocks) for h in spec.handouts.values())
+        print(f"{os.path.relpath(spec.path, ROOT)}: {spec.builder}, {len(spec.handouts)} handout(s), {blocks} blocks")
+        for h in spec.handouts.values():
+            print(f"  {h.output} ({h.layout})")
+    print(f"{len(specs)} spec(s) OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
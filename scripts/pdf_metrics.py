@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Métricas por documento de cada build, en JSONL.
+
+Cada PDF generado añade una línea a .cache/render-metrics.jsonl (o al fichero
+de PDF_METRICS / --metrics):
+
+  {"build": "2026-03-01T10:00:00Z", "output": "subjuntivo-duda.pdf",
+   "builder": "session_summary", "sessions": [7, 9], "flowables": 42,
+   "table_rows": 18, "pages": 2, "bytes": 10532, "ms": 48.1,
+   "story_ms": 9.7, "layout_ms": 36.0, "write_ms": 2.4,
+   "peak_rss_kb": 81234, "written": true}
+
+"build" agrupa las líneas de una misma ejecución. peak_rss_kb es el máximo del
+proceso que renderizó el documento hasta ese momento (un worker con --jobs), no
+solo de ese documento. Las líneas las escribe el proceso principal al final del
+build, así que los workers no compiten por el fichero.
+
+Para comparar builds: python3 scripts/pdf_metrics.py [--output 'sesion-*'] [--last 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pdf_profile
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+METRICS_ENV = "PDF_METRICS"
+DEFAULT_SINK = os.path.join(ROOT, ".cache", "render-metrics.jsonl")
+
+_current: Optional[Dict[str, object]] = None
+
+
+def sink() -> Optional[str]:
+    """Metrics file from PDF_METRICS (empty or "0" disables them), else the default."""
+    value = os.environ.get(METRICS_ENV)
+    if value is None:
+        return DEFAULT_SINK
+    return None if value.strip() in ("", "0") else value
+
+
+def set_sink(path: Optional[str]) -> None:
+    """Point this process and its workers at `path`, or turn metrics off with None."""
+    os.environ[METRICS_ENV] = path or "0"
+
+
+def build_id() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def peak_rss_kb() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB elsewhere
+
+
+def story_counts(story: Sequence[object]) -> Tuple[int, int]:
+    """(flowables, table rows) in a story, including flowables nested in tables and containers."""
+    flowables = rows = 0
+    stack = list(story)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+            continue
+        flowables += 1
+        cells = getattr(item, "_cellvalues", None)
+        if cells is not None:
+            rows += len(cells)
+            stack.extend(c for row in cells for c in row if isinstance(c, (list, tuple)) or hasattr(c, "wrap"))
+        content = getattr(item, "_content", None)
+        if isinstance(content, list):
+            stack.extend(content)
+    return flowables, rows
+
+
+def note(**values: object) -> None:
+    """Attach values to the metrics of the document being built, if any."""
+    if _current is not None:
+        _current.update(values)
+
+
+@dataclass
+class Measurement:
+    record: Dict[str, object] = field(default_factory=dict)
+    phases: Dict[str, float] = field(default_factory=dict)  # pdf_profile.PHASES -> seconds
+
+
+@contextmanager
+def measure(builder: str, output: str, sessions: Iterable[int]) -> Iterator[Measurement]:
+    """Time one document build and collect its metrics; pdf_output.save fills in the content counts."""
+    global _current
+    m = Measurement({"output": output, "builder": builder, "sessions": sorted(set(sessions))})
+    outer, _current = _current, m.record
+    t0 = time.perf_counter()
+    try:
+        with pdf_profile.document() as phases:
+            m.phases = phases
+            yield m
+    finally:
+        _current = outer
+        m.record["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        for name in pdf_profile.PHASES:
+            m.record[f"{name}_ms"] = round(phases.get(name, 0.0) * 1000, 1)
+        m.record["peak_rss_kb"] = peak_rss_kb()
+
+
+def append(records: Iterable[Dict[str, object]], build: Optional[str] = None, path: Optional[str] = None) -> int:
+    """Append one JSON line per record to the sink; returns the number of lines written."""
+    path = path or sink()
+    if path is None:
+        return 0
+    build = build or build_id()
+    lines = [json.dumps({"build": build, **r}, ensure_ascii=False) + "\n" for r in records if r]
+    if lines:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))  # one write, so concurrent builds do not interleave lines
+    return len(lines)
+
+
+def load(path: str) -> List[Dict[str, object]]:
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                continue  # a line cut short by an interrupted build
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Resume las métricas por documento de los últimos builds.")
+    ap.add_argument("file", nargs="?", help="metrics file (default: PDF_METRICS or .cache/render-metrics.jsonl)")
+    ap.add_argument("--output", "-o", action="append", default=[], metavar="PATTERN", help="only these outputs")
+    ap.add_argument("--last", type=int, default=5, metavar="N", help="builds to show per output")
+    args = ap.parse_args(argv)
+
+    path = args.file or sink() or DEFAULT_SINK
+    if not os.path.exists(path):
+        ap.error(f"No se encontro {path}")
+    history: Dict[str, List[Dict[str, object]]] = {}
+    for row in load(path):
+        name = str(row.get("output"))
+        if not args.output or any(fnmatch.fnmatchcase(name, p) for p in args.output):
+            history.setdefault(name, []).append(row)
+    for name in sorted(history):
+        rows = history[name][-args.last:]
+        first, last = rows[0], rows[-1]
+        trend = ""
+        if len(rows) > 1 and first.get("ms") and first.get("bytes"):
+            trend = (
+                f"  ms {(float(last['ms']) / float(first['ms']) - 1) * 100:+.0f}%,"
+                f" bytes {(int(last['bytes']) / int(first['bytes']) - 1) * 100:+.0f}%"
+            )
+        print(f"{name}{trend}")
+        for r in rows:
+            print(
+                f"  {r.get('build')}  {r.get('ms', 0):>8} ms  {r.get('bytes', 0):>8} B  {r.get('pages')} p"
+                f"  {r.get('flowables')} flowables  {r.get('table_rows')} rows"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Escritura de PDFs reproducible para los generadores.
+
+En modo reproducible (variable PDF_REPRODUCIBLE=1, opción --reproducible de los
+scripts, o SOURCE_DATE_EPOCH definida) cada documento toma su fecha del último
+cambio de su fuente (o de la fecha que el generador guarde para él, como los
+resúmenes en el manifiesto de build): la fecha "Actualizado" impresa y los CreationDate/ModDate
+que reportlab incrusta. reportlab deriva el /ID del documento de esa marca de
+tiempo, así que también es estable. Como en reproducible-builds.org, si
+SOURCE_DATE_EPOCH está definida actúa como tope superior.
+
+Fuera de ese modo se mantiene el comportamiento anterior (fecha de hoy), pero la
+escritura sigue siendo atómica y se omite si los bytes no cambian.
+
+Con PDF_LINEARIZE=1 (opción --linearize) el PDF se reescribe linealizado ("fast
+web view") con pikepdf/qpdf: los objetos de la página 1 y las tablas de hints van
+primero, así que un visor puede pintarla tras la primera petición por rangos.
+pikepdf es opcional y solo se importa en ese caso.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import subprocess
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+from pdf_metrics import note, story_counts
+from pdf_profile import phase
+
+
+REPRODUCIBLE_ENV = "PDF_REPRODUCIBLE"
+LINEARIZE_ENV = "PDF_LINEARIZE"
+
+# Deflate page content streams. Explicit so the output does not depend on the
+# installed reportlab's rl_config default; pdf_size_report.py flips it to compare.
+PAGE_COMPRESSION = 1
+
+
+def reproducible() -> bool:
+    return os.environ.get(REPRODUCIBLE_ENV) == "1" or bool(os.environ.get("SOURCE_DATE_EPOCH", "").strip())
+
+
+def enable_reproducible() -> None:
+    """Turn reproducible mode on for this process and any worker it starts."""
+    os.environ[REPRODUCIBLE_ENV] = "1"
+
+
+def linearized() -> bool:
+    return os.environ.get(LINEARIZE_ENV) == "1"
+
+
+def enable_linearize() -> None:
+    """Turn linearized output on for this process and its workers; fails early without pikepdf."""
+    try:
+        import pikepdf  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("--linearize necesita pikepdf (pip install pikepdf)") from e
+    os.environ[LINEARIZE_ENV] = "1"
+
+
+def output_options() -> Dict[str, str]:
+    """Output settings that change the bytes, merged into build-manifest input hashes."""
+    return {"output": "linearized"} if linearized() else {}
+
+
+def linearize(data: bytes) -> bytes:
+    import pikepdf
+
+    out = io.BytesIO()
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        # deterministic_id keeps reproducible builds byte-identical.
+        pdf.save(out, linearize=True, deterministic_id=True)
+    return out.getvalue()
+
+
+def _git(args: List[str], cwd: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+@lru_cache(maxsize=None)
+def source_epoch(path: str) -> int:
+    """Unix time of the last change to `path`.
+
+    The last commit touching it if it is tracked and clean, its mtime otherwise,
+    clamped to SOURCE_DATE_EPOCH when that is set.
+    """
+    path = os.path.abspath(path)
+    cwd = os.path.dirname(path)
+    epoch = 0
+    if not _git(["status", "--porcelain", "--", path], cwd):
+        epoch = int(_git(["log", "-1", "--format=%ct", "--", path], cwd) or 0)
+    if not epoch:
+        epoch = int(os.path.getmtime(path))
+    return _clamp(epoch)
+
+
+def _clamp(epoch: int) -> int:
+    clamp = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    return min(epoch, int(clamp)) if clamp else epoch
+
+
+def stamp_date(source_path: str, epoch: Optional[int] = None) -> date:
+    """Date printed as "Actualizado": today, or the source's last change (or `epoch`) in reproducible mode."""
+    if not reproducible():
+        return date.today()
+    return datetime.fromtimestamp(source_epoch(source_path) if epoch is None else epoch, tz=timezone.utc).date()
+
+
+@contextmanager
+def _pdf_timestamps(source_path: str, epoch: Optional[int] = None) -> Iterator[None]:
+    # reportlab reads SOURCE_DATE_EPOCH when it creates each document.
+    if not reproducible():
+        yield
+        return
+    saved = os.environ.get("SOURCE_DATE_EPOCH")
+    os.environ["SOURCE_DATE_EPOCH"] = str(source_epoch(source_path) if epoch is None else epoch)
+    try:
+        yield
+    finally:
+        if saved is None:
+            del os.environ["SOURCE_DATE_EPOCH"]
+        else:
+            os.environ["SOURCE_DATE_EPOCH"] = saved
+
+
+def write_if_changed(out_path: str, data: bytes) -> bool:
+    """Atomically replace out_path with data unless it already holds exactly those bytes."""
+    try:
+        with open(out_path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, out_path)
+    return True
+
+
+def render(doc, story: list, source_path: str, epoch: Optional[int] = None) -> bytes:
+    """Build `doc` (created on an io.BytesIO) and return the PDF bytes.
+
+    In reproducible mode the document is dated from `epoch` if given, else from source_path.
+    """
+    if doc.pageCompression is None:
+        doc.pageCompression = PAGE_COMPRESSION
+    flowables, table_rows = story_counts(story)  # counted first: doc.build consumes the story
+    with phase("layout"), _pdf_timestamps(source_path, epoch):
+        doc.build(story)
+    note(flowables=flowables, table_rows=table_rows, pages=doc.page)
+    return doc.filename.getvalue()
+
+
+def save(doc, story: list, out_path: str, source_path: str, epoch: Optional[int] = None) -> bool:
+    """Build `doc` (created on an io.BytesIO) and write it to out_path.
+
+    Returns False when the file on disk already had identical bytes.
+    """
+    data = render(doc, story, source_path, epoch)
+    with phase("write"):
+        if linearized():
+            data = linearize(data)
+        written = write_if_changed(out_path, data)
+    note(bytes=len(data), written=written)
+    return written
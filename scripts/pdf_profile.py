@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Perfilado por fases de los generadores de PDF (--profile).
+
+Cada documento se reparte en tres fases que mide pdf_output.save y el runner:
+
+  story   código del builder: Paragraph, Table, estilos... (todo lo anterior a save)
+  layout  doc.build(story): partición en líneas, paginación y serialización
+  write   linealización opcional y escritura atómica a disco
+
+El parseo de sessions.ts se mide aparte, una vez por build. Las medidas son
+unas pocas llamadas a perf_counter por documento y están siempre activas, así
+que --profile solo añade el informe y vale para los builds de CI.
+
+Con --profile-out FILE.pstats el build se ejecuta además bajo cProfile: se
+guarda FILE.pstats (para pstats o snakeviz) y FILE.collapsed, pilas colapsadas
+("a;b;c microsegundos") para flamegraph.pl, speedscope o inferno.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+PHASES = ("story", "layout", "write")
+
+_current: Optional[Dict[str, float]] = None
+
+
+@contextmanager
+def document() -> Iterator[Dict[str, float]]:
+    """Collect the phase timings (seconds) of one document build into the yielded dict."""
+    global _current
+    outer, phases = _current, {}
+    _current = phases
+    t0 = time.perf_counter()
+    try:
+        yield phases
+    finally:
+        _current = outer
+        inner = sum(phases.get(p, 0.0) for p in PHASES[1:])
+        phases["story"] = max(0.0, time.perf_counter() - t0 - inner)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to `name` of the document being built, if any."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _current is not None:
+            _current[name] = _current.get(name, 0.0) + time.perf_counter() - t0
+
+
+def print_phases(rows: Sequence[Tuple[str, Dict[str, float]]], parse_seconds: float) -> None:
+    """Per-document phase table, slowest first, with totals and each phase's share."""
+    rows = [(n, p) for n, p in rows if p]
+    if not rows:
+        return
+    width = max(len(n) for n, _ in rows)
+    print(f"\nprofile: parse sessions.ts {parse_seconds * 1000:.1f} ms")
+    print(f"{'document':<{width}}  " + " ".join(f"{p:>9}" for p in PHASES) + f" {'total':>9}  (ms)")
+    for name, phases in sorted(rows, key=lambda r: -sum(r[1].values())):
+        cells = " ".join(f"{phases.get(p, 0.0) * 1000:>9.1f}" for p in PHASES)
+        print(f"{name:<{width}}  {cells} {sum(phases.values()) * 1000:>9.1f}")
+    totals = {p: sum(ph.get(p, 0.0) for _, ph in rows) for p in PHASES}
+    grand = sum(totals.values()) or 1.0
+    cells = " ".join(f"{totals[p] * 1000:>9.1f}" for p in PHASES)
+    print(f"{'total':<{width}}  {cells} {grand * 1000:>9.1f}")
+    print(f"{'share':<{width}}  " + " ".join(f"{totals[p] / grand * 100:>8.0f}%" for p in PHASES))
+
+
+def _frame(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    label = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats, min_fraction: float = 1e-4, max_depth: int = 200) -> Dict[str, int]:
+    """Fold a cProfile call graph into collapsed stacks, in microseconds of self time.
+
+    cProfile keeps caller -> callee edges, not whole stacks, so each edge's time
+    is split across the paths reaching its caller in proportion to the time of
+    each path (the approach of flameprof and gprof2dot). Recursive edges are
+    cut, and paths below min_fraction of the total are dropped to bound output.
+    """
+    table = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[tuple, List[Tuple[tuple, float]]] = {}
+    for func, (_, _, _, _, callers) in table.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [f for f, (_, _, _, _, callers) in table.items() if not any(c in table for c in callers)]
+    total = sum(table[f][3] for f in roots) or 1.0
+    floor = total * min_fraction
+    out: Dict[str, int] = {}
+
+    def walk(func: tuple, path: List[str], on_stack: set, seconds: float) -> None:
+        _, _, tt, ct, _ = table[func]
+        scale = seconds / ct if ct else 0.0
+        path.append(_frame(func))
+        own = int(tt * scale * 1e6)
+        if own:
+            key = ";".join(path)
+            out[key] = out.get(key, 0) + own
+        if len(path) < max_depth:
+            on_stack.add(func)
+            for callee, edge_ct in callees.get(func, ()):
+                if callee in on_stack or callee not in table:
+                    continue
+                child = edge_ct * scale
+                if child >= floor:
+                    walk(callee, path, on_stack, child)
+            on_stack.discard(func)
+        path.pop()
+
+    for root in roots:
+        if table[root][3] >= floor:
+            walk(root, [], set(), table[root][3])
+    return out
+
+
+def _collapsed_path(pstats_path: str) -> str:
+    base, ext = os.path.splitext(pstats_path)
+    return (base if ext == ".pstats" else pstats_path) + ".collapsed"
+
+
+@contextmanager
+def profiled(pstats_path: Optional[str]) -> Iterator[None]:
+    """Run the block under cProfile and write pstats_path plus its .collapsed stacks; no-op for None."""
+    if not pstats_path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(pstats_path)), exist_ok=True)
+        prof.dump_stats(pstats_path)
+        stacks = collapsed_stacks(pstats.Stats(prof))
+        collapsed = _collapsed_path(pstats_path)
+        with open(collapsed, "w", encoding="utf-8") as f:
+            for key, us in sorted(stacks.items()):
+                f.write(f"{key} {us}\n")
+        print(f"profile: wrote {pstats_path} and {collapsed}")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Informe de tamaño y tiempo de render de los PDFs generados, antes y después.
+
+Renderiza cada objetivo de build_resources.py dos veces en un directorio
+temporal (no toca public/resources):
+
+  antes    sin compresión de página y con Helvetica base-14
+  después  la configuración actual: pdf_output.PAGE_COMPRESSION y PDF_FONT
+           (o --font)
+
+y muestra bytes y milisegundos por fichero y los totales. Con --json guarda
+las filas para compararlas entre ramas.
+
+Uso: python3 scripts/pdf_size_report.py [FILE ...] [--builder markdown] [--font vera]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import build_resources
+import generate_missing_session_pdfs as missing
+import pdf_output
+import pdf_theme
+
+
+def configure(compression: int, font: str) -> None:
+    pdf_output.PAGE_COMPRESSION = compression
+    os.environ[pdf_theme.FONT_ENV] = font
+    pdf_theme.clear_caches()
+
+
+def measure(targets: List[build_resources.Target], out_dir: str) -> Dict[str, Dict[str, float]]:
+    # One untimed render so font registration and imports are not billed to a file.
+    targets[0].func(os.path.join(out_dir, "warm.pdf"), *targets[0].args)
+    rows = {}
+    for t in targets:
+        path = os.path.join(out_dir, t.name)
+        t0 = time.perf_counter()
+        t.func(path, *t.args)
+        rows[t.name] = {"bytes": os.path.getsize(path), "ms": (time.perf_counter() - t0) * 1000}
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("targets", nargs="*", metavar="FILE", help="output filenames or glob patterns (default: all)")
+    ap.add_argument("--builder", "-b", action="append", default=[], help="only targets of this builder")
+    ap.add_argument("--font", default=None, help="PDF_FONT for the 'after' run (default: current PDF_FONT)")
+    ap.add_argument("--json", metavar="PATH", help="also write the rows as JSON")
+    args = ap.parse_args(argv)
+
+    targets = build_resources.select(build_resources.registry(missing.load_sessions()), args.targets, [], args.builder)
+    if not targets:
+        print("No targets match the given filters.")
+        return 1
+    font = args.font if args.font is not None else os.environ.get(pdf_theme.FONT_ENV, "helvetica")
+    compression = pdf_output.PAGE_COMPRESSION
+
+    with tempfile.TemporaryDirectory(prefix="pdf-size-") as tmp:
+        os.makedirs(os.path.join(tmp, "before"))
+        os.makedirs(os.path.join(tmp, "after"))
+        configure(0, "helvetica")
+        before = measure(targets, os.path.join(tmp, "before"))
+        configure(compression, font)
+        after = measure(targets, os.path.join(tmp, "after"))
+
+    width = max(len(t.name) for t in targets)
+    print(f"{'file':<{width}}  {'before KB':>10} {'after KB':>10} {'change':>8}  {'before ms':>10} {'after ms':>10}")
+    rows = []
+    for t in targets:
+        b, a = before[t.name], after[t.name]
+        change = (a["bytes"] - b["bytes"]) / b["bytes"] * 100
+        print(
+            f"{t.name:<{width}}  {b['bytes'] / 1024:10.1f} {a['bytes'] / 1024:10.1f} {change:+7.1f}%  "
+            f"{b['ms']:10.1f} {a['ms']:10.1f}"
+        )
+        rows.append({"file": t.name, "builder": t.builder, "before": b, "after": a})
+    tb = sum(r["before"]["bytes"] for r in rows)
+    ta = sum(r["after"]["bytes"] for r in rows)
+    mb = sum(r["before"]["ms"] for r in rows)
+    ma = sum(r["after"]["ms"] for r in rows)
+    print(
+        f"\n{len(rows)} files: {tb / 1024:.1f} KB -> {ta / 1024:.1f} KB ({(ta - tb) / tb * 100:+.1f}%), "
+        f"render {mb:.0f} ms -> {ma:.0f} ms (after: compression={compression}, font={font})"
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"compression": compression, "font": font, "files": rows}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
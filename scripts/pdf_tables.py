@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Tablas de miles de filas (glosarios, listados) sin el coste de platypus.
+
+Una Table de reportlab con un Paragraph por celda se maqueta entera de una vez:
+mide cada párrafo, calcula alturas y, al no caber, la parte página a página
+copiando filas y estilos. Con 14 filas da igual; con miles domina el build.
+Este constructor hace ese trabajo por adelantado y en streaming:
+
+  - El texto de cada celda se parte en líneas con anchos medidos una vez por
+    (palabra, fuente, tamaño) y, para textos repetidos (categorías, ejemplos
+    compartidos), una vez por celda. Las celdas son cadenas con saltos de
+    línea, no Paragraph, así que reportlab no vuelve a medirlas.
+  - Las alturas de fila se conocen de antemano, así que las filas se cortan en
+    trozos que caben en una página mientras se recorren, con la cabecera
+    repetida. Cada trozo es una Table con colWidths y rowHeights fijos que
+    reportlab coloca sin medir ni partir.
+  - Los estilos salen de una sola lista de comandos: el rayado alterno es un
+    único ROWBACKGROUNDS en lugar de un BACKGROUND por fila, y el TableStyle se
+    comparte entre todos los trozos con la misma paridad.
+
+Solo texto plano: las celdas no interpretan markup.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Table, TableStyle
+
+from pdf_theme import INK, PANEL, RULE, WHITE, color, fonts
+
+
+# SimpleDocTemplate's frame pads its content by 6pt on every side.
+FRAME_PADDING = 6.0
+ELLIPSIS = "…"
+
+
+@lru_cache(maxsize=1 << 16)
+def text_width(text: str, font: str, size: float) -> float:
+    """stringWidth, memoized: glossary columns repeat the same words and strings."""
+    return stringWidth(text, font, size)
+
+
+@lru_cache(maxsize=1 << 15)
+def wrap_text(text: str, font: str, size: float, width: float) -> Tuple[str, ...]:
+    """Greedy word wrap of plain text into lines no wider than `width` points."""
+    space = text_width(" ", font, size)
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line: List[str] = []
+        used = 0.0
+        for word in paragraph.split():
+            w = text_width(word, font, size)
+            if w > width:
+                # A word wider than the column: break it by characters.
+                if line:
+                    lines.append(" ".join(line))
+                    line, used = [], 0.0
+                piece = ""
+                for ch in word:
+                    if piece and text_width(piece + ch, font, size) > width:
+                        lines.append(piece)
+                        piece = ""
+                    piece += ch
+                line, used = [piece], text_width(piece, font, size)
+                continue
+            if line and used + space + w > width:
+                lines.append(" ".join(line))
+                line, used = [word], w
+            else:
+                used += (space if line else 0.0) + w
+                line.append(word)
+        lines.append(" ".join(line))
+    return tuple(lines)
+
+
+@dataclass(frozen=True)
+class TableLook:
+    """Typography and spacing shared by every chunk of one table."""
+
+    font: str
+    bold: str
+    size: float = 8.5
+    leading: float = 10.5
+    padding: float = 3.0
+    header_bg: str = "#eef2ff"
+
+
+def default_look() -> TableLook:
+    f = fonts()
+    return TableLook(f.regular, f.bold)
+
+
+@lru_cache(maxsize=None)
+def chunk_style(look: TableLook, odd_start: bool) -> TableStyle:
+    """One batch of commands for any chunk; odd_start keeps the stripes continuous across chunks."""
+    stripes = [color(PANEL), color(WHITE)]
+    if odd_start:
+        stripes.reverse()
+    return TableStyle(
+        [
+            ("FONT", (0, 0), (-1, -1), look.font, look.size, look.leading),
+            ("FONT", (0, 0), (-1, 0), look.bold, look.size, look.leading),
+            ("TEXTCOLOR", (0, 0), (-1, -1), color(INK)),
+            ("BACKGROUND", (0, 0), (-1, 0), color(look.header_bg)),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), stripes),
+            ("GRID", (0, 0), (-1, -1), 0.5, color(RULE)),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), look.padding),
+            ("RIGHTPADDING", (0, 0), (-1, -1), look.padding),
+            ("TOPPADDING", (0, 0), (-1, -1), look.padding),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), look.padding),
+        ]
+    )
+
+
+def _cells(
+    row: Sequence[str], widths: Sequence[float], look: TableLook, font: str, max_lines: int
+) -> Tuple[List[str], float]:
+    """Wrapped cell strings and the row height."""
+    cells, lines = [], 1
+    for text, width in zip(row, widths):
+        wrapped = wrap_text(text or "", font, look.size, width - 2 * look.padding)
+        if len(wrapped) > max_lines:
+            wrapped = wrapped[: max_lines - 1] + (wrapped[max_lines - 1] + " " + ELLIPSIS,)
+        lines = max(lines, len(wrapped))
+        cells.append("\n".join(wrapped))
+    return cells, lines * look.leading + 2 * look.padding
+
+
+def table_chunks(
+    header: Sequence[str],
+    rows: Iterable[Sequence[str]],
+    col_widths: Sequence[float],
+    page_height: float,
+    first_height: Optional[float] = None,
+    look: Optional[TableLook] = None,
+) -> Iterator[Table]:
+    """Yield Tables that each fit one page, header repeated, as `rows` is consumed.
+
+    page_height is the room in an empty frame, first_height what is left on the
+    current page (defaults to page_height). A row taller than a whole page is
+    cut with an ellipsis.
+    """
+    look = look or default_look()
+    head, head_height = _cells(header, col_widths, look, look.bold, 1 << 30)
+    max_lines = max(1, int((page_height - head_height - 2 * look.padding) // look.leading))
+    room = first_height if first_height is not None else page_height
+    chunk: List[List[str]] = [head]
+    heights: List[float] = [head_height]
+    used = head_height
+    done = 0  # body rows already emitted, for the stripe phase
+    for row in rows:
+        cells, height = _cells(row, col_widths, look, look.font, max_lines)
+        if used + height > room and len(chunk) > 1:
+            yield _table(chunk, heights, col_widths, look, done)
+            done += len(chunk) - 1
+            chunk, heights, used, room = [head], [head_height], head_height, page_height
+        chunk.append(cells)
+        heights.append(height)
+        used += height
+    if len(chunk) > 1:
+        yield _table(chunk, heights, col_widths, look, done)
+
+
+def _table(
+    data: List[List[str]], heights: List[float], col_widths: Sequence[float], look: TableLook, done: int
+) -> Table:
+    t = Table(data, colWidths=list(col_widths), rowHeights=heights, repeatRows=1, hAlign="LEFT")
+    t.setStyle(chunk_style(look, done % 2 == 1))
+    return t
+
+
+def frame_height(doc) -> float:
+    """Room for flowables in an empty frame of a SimpleDocTemplate."""
+    return doc.height - 2 * FRAME_PADDING
+
+
+def story_height(flowables: Sequence[object], width: float) -> float:
+    """Height the flowables take in a frame, spacing included (an upper bound at the top of a frame)."""
+    total = 0.0
+    for f in flowables:
+        _, h = f.wrap(width, 1 << 20)  # type: ignore[attr-defined]
+        total += h + f.getSpaceBefore() + f.getSpaceAfter()  # type: ignore[attr-defined]
+    return total
+
+
+def clear_caches() -> None:
+    """Forget measured widths and wrapped cells (benchmarks only)."""
+    for fn in (text_width, wrap_text, chunk_style):
+        fn.cache_clear()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Tipografía, colores y estilos de tabla compartidos por los generadores de PDF.
+
+Cada función construye sus objetos una sola vez por proceso y devuelve siempre
+las mismas instancias. reportlab no modifica ni los ParagraphStyle ni los
+TableStyle al maquetar, así que se pueden compartir entre documentos.
+
+Por defecto se usa Helvetica (base-14, no se incrusta). Con PDF_FONT=vera se usa
+la Bitstream Vera que trae reportlab, y con PDF_FONT=/ruta/Fuente.ttf una familia
+TTF propia (las variantes -Bold, -Italic/-Oblique y -BoldItalic/-BoldOblique, o
+Bd/It/BI, se buscan en la misma carpeta).
+Las TTF se registran una vez por proceso y reportlab incrusta solo los glifos
+usados en cada documento.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import reportlab
+from reportlab.lib import colors
+from reportlab.lib.fonts import addMapping
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+
+INK = "#111827"
+MUTED = "#374151"
+HEADING = "#1f2937"
+RULE = "#d1d5db"
+PANEL = "#f9fafb"
+WHITE = "#ffffff"
+
+
+FONT_ENV = "PDF_FONT"
+
+
+class Fonts(NamedTuple):
+    regular: str
+    bold: str
+    italic: str
+    bold_italic: str
+
+
+class HandoutStyles(NamedTuple):
+    h1: ParagraphStyle
+    h2: ParagraphStyle
+    p: ParagraphStyle
+    small: ParagraphStyle
+
+
+class MarkdownStyles(NamedTuple):
+    h3: ParagraphStyle
+    bullet: ParagraphStyle
+    quote: ParagraphStyle
+    code: ParagraphStyle
+    cell: ParagraphStyle
+
+
+class PosterStyles(NamedTuple):
+    title: ParagraphStyle
+    subtitle: ParagraphStyle
+    box_body: ParagraphStyle
+
+
+def _sibling(regular: str, *suffixes: str) -> str:
+    base, ext = os.path.splitext(regular)
+    for suffix in suffixes:
+        if os.path.exists(base + suffix + ext):
+            return base + suffix + ext
+    return regular
+
+
+def _register_ttf_family(regular: str) -> Fonts:
+    family = os.path.splitext(os.path.basename(regular))[0]
+    names = Fonts(family, f"{family}-Bold", f"{family}-Italic", f"{family}-BoldItalic")
+    paths = [
+        regular,
+        _sibling(regular, "-Bold", "Bd"),
+        _sibling(regular, "-Italic", "-Oblique", "It"),
+        _sibling(regular, "-BoldItalic", "-BoldOblique", "BI"),
+    ]
+    for name, path in zip(names, paths):
+        pdfmetrics.registerFont(TTFont(name, path))
+    # <b>/<i> inside paragraphs resolve through these mappings.
+    for (bold, italic), name in zip([(0, 0), (1, 0), (0, 1), (1, 1)], names):
+        addMapping(family, bold, italic, name)
+    return names
+
+
+@lru_cache(maxsize=None)
+def fonts() -> Fonts:
+    """Font names for the PDF_FONT setting, registering TTFs on first use."""
+    choice = os.environ.get(FONT_ENV, "").strip()
+    if not choice or choice.lower() == "helvetica":
+        return Fonts("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+    if choice.lower() == "vera":
+        choice = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+    if not os.path.exists(choice):
+        raise FileNotFoundError(f"No se encontro la fuente {choice} ({FONT_ENV})")
+    return _register_ttf_family(choice)
+
+
+@lru_cache(maxsize=None)
+def has_glyph(font_name: str, ch: str) -> bool:
+    """Whether `font_name` can draw `ch`: TTFs by their cmap, base-14 fonts by WinAnsi."""
+    face = pdfmetrics.getFont(font_name).face
+    cmap = getattr(face, "charToGlyph", None)
+    if cmap is not None:
+        return ord(ch) in cmap
+    try:
+        ch.encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def sample_styles() -> StyleSheet1:
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=None)
+def color(hex_value: str) -> colors.Color:
+    return colors.HexColor(hex_value)
+
+
+@lru_cache(maxsize=None)
+def handout_styles(compact: bool = False) -> HandoutStyles:
+    """H1/H2/P/Small for A4 handouts.
+
+    compact=True is the slightly tighter variant used by the per-session
+    summaries in generate_missing_session_pdfs.py.
+    """
+    styles = sample_styles()
+    f = fonts()
+    h1 = ParagraphStyle(
+        "H1",
+        parent=styles["Title"],
+        fontName=f.bold,
+        fontSize=18,
+        leading=22,
+        textColor=color(INK),
+        spaceAfter=8 if compact else 10,
+    )
+    h2 = ParagraphStyle(
+        "H2",
+        parent=styles["Heading2"],
+        fontName=f.bold,
+        fontSize=12.5 if compact else 13,
+        leading=15 if compact else 16,
+        textColor=color(INK),
+        spaceBefore=10,
+        spaceAfter=6,
+    )
+    p = ParagraphStyle(
+        "P",
+        parent=styles["Normal"],
+        fontName=f.regular,
+        fontSize=10.5,
+        leading=14,
+        textColor=color(INK),
+    )
+    small = ParagraphStyle(
+        "Small",
+        parent=p,
+        fontSize=9.5,
+        leading=12,
+        textColor=color(MUTED),
+    )
+    return HandoutStyles(h1, h2, p, small)
+
+
+@lru_cache(maxsize=None)
+def markdown_styles() -> MarkdownStyles:
+    """Extra block styles for contenido-pdfs, derived from the compact handout styles."""
+    base = handout_styles(compact=True)
+    f = fonts()
+    h3 = ParagraphStyle(
+        "H3",
+        parent=base.p,
+        fontName=f.bold,
+        fontSize=11,
+        leading=14,
+        spaceBefore=8,
+        spaceAfter=3,
+    )
+    bullet = ParagraphStyle("Bullet", parent=base.p, leftIndent=14, bulletIndent=4, spaceAfter=2)
+    quote = ParagraphStyle(
+        "Quote",
+        parent=base.small,
+        leftIndent=12,
+        borderPadding=(4, 6, 4, 6),
+        borderColor=color(RULE),
+        borderWidth=0.5,
+        backColor=color(PANEL),
+        spaceBefore=4,
+        spaceAfter=6,
+    )
+    code = ParagraphStyle("Code", parent=base.small, fontName="Courier", fontSize=8.5, leading=11, leftIndent=8)
+    cell = ParagraphStyle("Cell", parent=base.p, fontSize=9.5, leading=12)
+    return MarkdownStyles(h3, bullet, quote, code, cell)
+
+
+@lru_cache(maxsize=None)
+def bullet_style(level: int = 0) -> ParagraphStyle:
+    base = markdown_styles().bullet
+    if level == 0:
+        return base
+    return ParagraphStyle(
+        f"Bullet{level}",
+        parent=base,
+        leftIndent=base.leftIndent + 14 * level,
+        bulletIndent=base.bulletIndent + 14 * level,
+    )
+
+
+@lru_cache(maxsize=None)
+def poster_styles() -> PosterStyles:
+    styles = sample_styles()
+    f = fonts()
+    title = ParagraphStyle(
+        "PosterTitle",
+        parent=styles["Title"],
+        fontName=f.bold,
+        fontSize=26,
+        leading=30,
+        textColor=color(HEADING),
+        spaceAfter=10,
+    )
+    subtitle = ParagraphStyle(
+        "PosterSubtitle",
+        parent=styles["Normal"],
+        fontName=f.regular,
+        fontSize=12,
+        leading=15,
+        textColor=color(MUTED),
+        spaceAfter=14,
+    )
+    box_body = ParagraphStyle(
+        "BoxBody",
+        parent=styles["Normal"],
+        fontName=f.regular,
+        fontSize=11,
+        leading=14,
+        textColor=color(INK),
+    )
+    return PosterStyles(title, subtitle, box_body)
+
+
+@lru_cache(maxsize=None)
+def grid_table_style(header_bg: str, padding: int = 6, header_text: Optional[str] = None) -> TableStyle:
+    """Ruled table with a tinted header row and top-aligned cells."""
+    cmds = [("BACKGROUND", (0, 0), (-1, 0), color(header_bg))]
+    if header_text:
+        cmds.append(("TEXTCOLOR", (0, 0), (-1, 0), color(header_text)))
+    cmds += [
+        ("GRID", (0, 0), (-1, -1), 0.5, color(RULE)),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), padding),
+        ("RIGHTPADDING", (0, 0), (-1, -1), padding),
+        ("TOPPADDING", (0, 0), (-1, -1), padding),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), padding),
+    ]
+    return TableStyle(cmds)
+
+
+@lru_cache(maxsize=None)
+def box_table_style(border: float = 0.7) -> TableStyle:
+    """Single-cell shaded panel used for tips and role cards."""
+    return TableStyle(
+        [
+            ("BOX", (0, 0), (-1, -1), border, color(RULE)),
+            ("BACKGROUND", (0, 0), (-1, -1), color(PANEL)),
+            ("LEFTPADDING", (0, 0), (-1, -1), 10),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
+            ("TOPPADDING", (0, 0), (-1, -1), 10),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def poster_grid_style(rows: int) -> TableStyle:
+    """Ruled poster grid with alternating row backgrounds."""
+    cmds = [
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 10),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 10),
+        ("TOPPADDING", (0, 0), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+        ("GRID", (0, 0), (-1, -1), 0.5, color(RULE)),
+    ]
+    for r in range(rows):
+        cmds.append(("BACKGROUND", (0, r), (-1, r), color(PANEL if r % 2 == 0 else WHITE)))
+    return TableStyle(cmds)
+
+
+def clear_caches() -> None:
+    """Forget every cached style and font choice (benchmarks and reports only)."""
+    for fn in (
+        fonts,
+        has_glyph,
+        sample_styles,
+        color,
+        handout_styles,
+        markdown_styles,
+        bullet_style,
+        poster_styles,
+        grid_table_style,
+        box_table_style,
+        poster_grid_style,
+    ):
+        fn.cache_clear()
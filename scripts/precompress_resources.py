@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Variantes precomprimidas (.br, .gz) y ETag fuerte para cada fichero de public/resources.
+
+Para cada recurso escribe, a su lado:
+
+  <fichero>.etag      el ETag fuerte, `"<sha256 del contenido>"`
+  <fichero>.gz        gzip -9, solo si ocupa menos que el original
+  <fichero>.br        brotli calidad 11, ídem (necesita el módulo opcional brotli)
+  <fichero>.gz.etag   ETag de cada variante: el mismo hash con sufijo `-gz` /
+  <fichero>.br.etag   `-br`, como pide RFC 9110 para representaciones distintas
+
+El proxy puede servir la variante según Accept-Encoding (gzip_static /
+brotli_static en nginx) y responder 304 comparando If-None-Match con el
+.etag de lo que serviría, sin abrir el PDF.
+
+Si el .etag ya coincide con el hash del fichero no se recomprime nada. Una
+variante que deja de ahorrar bytes se borra con su .etag para que no quede una
+versión vieja, y los .gz/.br/.etag de un recurso que ya no existe también.
+Las escrituras son atómicas y el trabajo va en un pool de hilos (zlib y brotli
+liberan el GIL).
+
+Uso: python3 scripts/precompress_resources.py [--jobs 8] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from pdf_output import write_if_changed
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(ROOT, "public", "resources")
+ETAG_SUFFIX = ".etag"
+VARIANT_SUFFIXES = (".gz", ".br")
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output identical for identical input.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available encodings by file suffix; brotli only if the module is installed."""
+    out: Dict[str, Callable[[bytes], bytes]] = {".gz": _gzip}
+    try:
+        import brotli
+    except ImportError:
+        return out
+    out[".br"] = lambda data: brotli.compress(data, quality=11)
+    return out
+
+
+def is_source(name: str) -> bool:
+    """True for the resources themselves, not their variants or sidecars."""
+    return not name.startswith(".") and not name.endswith((ETAG_SUFFIX, *VARIANT_SUFFIXES, ".tmp"))
+
+
+def source_of(name: str) -> Optional[str]:
+    """The resource a sidecar belongs to ("a.pdf" for a.pdf.gz, a.pdf.etag, a.pdf.br.etag), else None."""
+    base = name.removesuffix(ETAG_SUFFIX)
+    for suffix in VARIANT_SUFFIXES:
+        if base.endswith(suffix):
+            return base.removesuffix(suffix)
+    return base if base != name else None
+
+
+@dataclass
+class Result:
+    name: str
+    status: str  # "unchanged", "updated" or "removed" (orphan sidecar)
+    bytes: int = 0
+    variants: Dict[str, int] = field(default_factory=dict)  # suffix -> bytes written
+
+
+def strong_etag(data: bytes, coding: str = "") -> str:
+    """`"<sha256>"` for the resource, `"<sha256>-gz"` etc. for an encoded variant of it."""
+    return f'"{hashlib.sha256(data).hexdigest()}{coding}"'
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def precompress(path: str, codecs: Dict[str, Callable[[bytes], bytes]], force: bool = False) -> Result:
+    name = os.path.basename(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    etag = strong_etag(data)
+    etag_path = path + ETAG_SUFFIX
+    if not force:
+        try:
+            with open(etag_path, "r", encoding="ascii") as f:
+                current = f.read().strip() == etag
+            # Variants from before per-variant ETags get theirs on the next run.
+            if current and all(os.path.exists(path + s + ETAG_SUFFIX) for s in codecs if os.path.exists(path + s)):
+                return Result(name, "unchanged", len(data))
+        except FileNotFoundError:
+            pass
+    result = Result(name, "updated", len(data))
+    for suffix, encode in codecs.items():
+        packed = encode(data)
+        if len(packed) < len(data):
+            write_if_changed(path + suffix, packed)
+            tag = strong_etag(data, "-" + suffix[1:])
+            write_if_changed(path + suffix + ETAG_SUFFIX, (tag + "\n").encode("ascii"))
+            result.variants[suffix] = len(packed)
+        else:
+            _remove(path + suffix)
+            _remove(path + suffix + ETAG_SUFFIX)
+    # Written last: a present, matching .etag means the variants are current.
+    write_if_changed(etag_path, (etag + "\n").encode("ascii"))
+    return result
+
+
+def remove_orphans(directory: str, names: List[str]) -> List[Result]:
+    """Delete variants and .etag files whose resource is gone."""
+    removed = []
+    for name in names:
+        source = source_of(name)
+        if source is not None and not os.path.isfile(os.path.join(directory, source)):
+            _remove(os.path.join(directory, name))
+            removed.append(Result(name, "removed"))
+    return removed
+
+
+def precompress_dir(directory: str = RESOURCES_DIR, workers: int = 8, force: bool = False) -> List[Result]:
+    codecs = encoders()
+    names = sorted(os.listdir(directory))
+    paths = [os.path.join(directory, n) for n in names if is_source(n) and os.path.isfile(os.path.join(directory, n))]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda p: precompress(p, codecs, force), paths))
+    return results + remove_orphans(directory, names)
+
+
+def print_summary(results: List[Result], seconds: float) -> None:
+    updated = [r for r in results if r.status == "updated"]
+    unchanged = sum(1 for r in results if r.status == "unchanged")
+    removed = sum(1 for r in results if r.status == "removed")
+    for r in updated:
+        parts = [f"{s[1:]} {n / r.bytes * 100:.0f}%" for s, n in sorted(r.variants.items())] or ["no saving"]
+        print(f"  {r.name}: {r.bytes / 1024:.1f} KB -> {', '.join(parts)}")
+    saved = {s: sum(r.bytes - r.variants[s] for r in results if s in r.variants) for s in (".br", ".gz")}
+    print(
+        f"Precompressed: {len(updated)} updated, {unchanged} unchanged, {removed} orphan file(s) removed "
+        f"in {seconds:.2f}s "
+        f"(updated files: br saves {saved['.br'] / 1024:.0f} KB, gz {saved['.gz'] / 1024:.0f} KB)"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera .br/.gz y ETags para public/resources.")
+    ap.add_argument("--dir", default=RESOURCES_DIR, help="directory to process")
+    ap.add_argument("--jobs", "-j", type=int, default=8, metavar="N", help="worker threads")
+    ap.add_argument("--force", action="store_true", help="recompress even if the .etag matches")
+    args = ap.parse_args(argv)
+
+    if ".br" not in encoders():
+        print("brotli module not installed: writing .gz variants only (pip install brotli)")
+    t0 = time.perf_counter()
+    results = precompress_dir(args.dir, args.jobs, args.force)
+    print_summary(results, time.perf_counter() - t0)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
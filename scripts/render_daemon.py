@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Servicio local que genera los PDFs de /resources bajo demanda.
+
+Expone los mismos objetivos que build_resources.py por HTTP en localhost (o en
+un socket Unix con --socket), sin red externa:
+
+  GET /resources/<fichero>.pdf             PDF renderizado (o desde caché)
+  GET /resources/<fichero>.pdf?session=N   resumen con los datos de la sesión N
+  GET /status                              estado de la caché y de la cola
+
+Solo se sirven los PDFs que genera algún builder, con la misma regla que
+build_resources.py: un fichero hecho a mano (sin entrada en el manifiesto de
+build y sin la marca de los generadores) o un enlace simbólico da 404.
+
+Los renders se hacen en un pool de procesos con reportlab ya cargado (si un
+worker muere, el pool se vuelve a crear). Como mucho --max-pending peticiones
+distintas esperan turno; el resto recibe 503. Los resultados se guardan en una
+LRU (--cache-mb) cuya clave es el hash de las entradas del PDF, que es también
+el ETag: un If-None-Match que coincide recibe 304 sin renderizar. Un cambio en
+sessions.ts, en un .md o en una ficha de contenido-pdfs/fichas/ invalida solo lo
+que toca, y las peticiones simultáneas del mismo PDF comparten un único render.
+
+Con --write un PDF canónico desactualizado se guarda en public/resources y se
+anota en el manifiesto de build y en resources-manifest.json, como haría
+build_resources.py. Una respuesta que no coincide con el fichero publicado (sin
+--write, o una variante ?session=N, que nunca se escribe) lleva X-Preview: 1.
+
+Uso: python3 scripts/render_daemon.py [--port 8765 | --socket /tmp/oral7-pdf.sock] [-j 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import build_resources
+import generate_missing_session_pdfs as missing
+import handout_layout
+import pdf_output
+import render_markdown_pdfs
+from watch_resources import snapshot
+
+
+class NotFound(LookupError):
+    """No such resource, or not used in the requested session (404)."""
+
+
+class LRUCache:
+    """Byte-bounded LRU of rendered PDFs, keyed by content hash."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self._items[key] = data
+            self.bytes += len(data)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+
+def content_key(target: build_resources.Target) -> str:
+    """Hash of everything the PDF depends on: tracked inputs (and date), or the builder's source."""
+    if target.input_hashes is not None:
+        inputs = target.input_hashes
+    else:
+        inputs = {"module": render_markdown_pdfs.source_hash(inspect.getsourcefile(target.func))}
+    payload = [target.builder, target.name, target.template, inputs, target.epoch]
+    if not pdf_output.reproducible():
+        payload.append(date.today().isoformat())  # the "Actualizado" stamp
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def render_bytes(target: build_resources.Target) -> bytes:
+    """Run a target's builder into a scratch file and return the PDF bytes."""
+    with tempfile.TemporaryDirectory(prefix="oral7-pdf-") as tmp:
+        path = os.path.join(tmp, target.name)
+        target.build(path)
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class RenderService:
+    def __init__(self, workers: int, max_pending: int, cache_bytes: int, write: bool) -> None:
+        self.workers = workers
+        self.pool = self._new_pool()
+        self.pool_restarts = 0
+        self.cache = LRUCache(cache_bytes)
+        self.max_pending = max_pending
+        self.write = write
+        self.rejected = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # serializes output, build-manifest and resources-manifest writes
+        self._targets: Dict[str, build_resources.Target] = {}
+        self._sessions: Dict[int, missing.Session] = {}
+        self._sources_state: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=build_resources._warm_worker)
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Replace `broken` (a worker died) unless another request already did."""
+        with self._lock:
+            if self.pool is not broken:
+                return
+            self.pool = self._new_pool()
+            self.pool_restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def source_paths() -> List[str]:
+        return [
+            missing.SESSIONS_TS,
+            *render_markdown_pdfs.markdown_sources().values(),
+            *handout_layout.spec_paths(),
+        ]
+
+    def _refresh(self) -> None:
+        # Sources are re-read only when one of them changes (stat of each file:
+        # an edit in place does not touch the directory's mtime); the parse
+        # cache makes the sessions.ts half cheap anyway.
+        state = snapshot(self.source_paths())
+        if state == self._sources_state:
+            return
+        sessions = missing.load_sessions()
+        self._targets = {t.name: t for t in build_resources.registry(sessions)}
+        self._sessions = {s.session_number: s for s in sessions}
+        self._sources_state = state
+
+    def resolve(self, name: str, session: Optional[int]) -> Tuple[build_resources.TargetRun, bool]:
+        """Return (planned run, canonical); a ?session=N variant of a summary is not canonical.
+
+        The run is planned against the build manifest as in build_resources.py:
+        outputs no builder owns (hand-made, or symlinks) are NotFound.
+        """
+        with self._lock:
+            self._refresh()
+            target = self._targets.get(name)
+            if target is None:
+                raise NotFound(f"No existe el recurso {name}")
+            run = build_resources.plan([target], missing.load_build_manifest(), force=False)[0]
+            if run.status == "unmanaged":
+                raise NotFound(f"{name} no lo genera ningun builder")
+            target = run.target
+            if session is None or session == target.sessions[0]:
+                return run, True
+            if session not in target.sessions:
+                raise NotFound(f"{name} no se usa en la sesion {session}")
+            if target.builder != missing.SUMMARY_BUILDER:
+                return run, True  # dedicated and markdown handouts do not vary by session
+            title, _, used_in = target.args
+            s = self._sessions[session]
+            variant = dataclasses.replace(
+                target,
+                args=(title, s, used_in),
+                input_hashes=missing.hash_inputs(missing.pdf_inputs(title, s, used_in)),
+            )
+            return dataclasses.replace(run, target=variant), False
+
+    def render(self, run: build_resources.TargetRun, canonical: bool = True) -> Tuple[str, bytes, bool]:
+        """Return (content key, pdf bytes, served from cache). Raises OverflowError when the queue is full.
+
+        With --write a canonical render of a stale output is saved to
+        public/resources and recorded; variants and up-to-date outputs never are.
+        """
+        key = content_key(run.target)
+        data = self.cache.get(key)
+        if data is not None:
+            return key, data, True
+        with self._lock:
+            future = self._inflight.get(key)
+            submitted = future is None
+            if submitted:
+                if len(self._inflight) >= self.max_pending:
+                    self.rejected += 1
+                    raise OverflowError("Demasiadas peticiones en cola")
+                pool = self.pool
+                try:
+                    future = pool.submit(render_bytes, run.target)
+                except BrokenProcessPool:
+                    pool = self.pool = self._new_pool()
+                    self.pool_restarts += 1
+                    future = pool.submit(render_bytes, run.target)
+                self._inflight[key] = future
+        if submitted:
+            # Outside the lock: an already finished future runs the callback right here.
+            write = self.write and canonical and run.status == "build"
+            future.add_done_callback(lambda f: self._finish(key, run, write, pool, f))
+        return key, future.result(), False
+
+    def _finish(
+        self, key: str, run: build_resources.TargetRun, write: bool, pool: ProcessPoolExecutor, future: Future
+    ) -> None:
+        error = future.exception()
+        if error is None:
+            data = future.result()
+            self.cache.put(key, data)
+            if write:
+                self._publish(run, data)
+        elif isinstance(error, BrokenProcessPool):
+            self._restart_pool(pool)
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _publish(self, run: build_resources.TargetRun, data: bytes) -> None:
+        """Write one output and record it, as build_resources.py does after a build."""
+        with self._write_lock:
+            pdf_output.write_if_changed(run.target.out_path, data)
+            manifest = missing.load_build_manifest()
+            if build_resources.record([run], manifest):
+                missing.save_build_manifest(manifest)
+            with self._lock:
+                sessions = list(self._sessions.values())
+            build_resources.publish(sessions)
+
+    @staticmethod
+    def is_preview(run: build_resources.TargetRun, data: bytes) -> bool:
+        """Whether `data` differs from the file public/resources serves for this output."""
+        try:
+            with open(run.target.out_path, "rb") as f:
+                return f.read() != data
+        except FileNotFoundError:
+            return True
+
+    def status(self) -> dict:
+        with self._lock:
+            pending = len(self._inflight)
+        return {
+            "cache": self.cache.stats(),
+            "pending": pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "pool_restarts": self.pool_restarts,
+            "targets": len(self._targets),
+        }
+
+
+class Handler(BaseHTTPRequestHandler):
+    service: RenderService  # set on the subclass built in main()
+    server_version = "oral7-pdf/1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/status":
+            self._send(200, json.dumps(self.service.status()).encode("utf-8"), "application/json")
+            return
+        if not url.path.startswith("/resources/") or not url.path.endswith(".pdf"):
+            self._send(404, b"not found\n")
+            return
+        name = url.path.removeprefix("/resources/")
+        values = parse_qs(url.query).get("session")
+        try:
+            session = int(values[0]) if values else None
+        except ValueError:
+            self._send(400, b"session must be an integer\n")
+            return
+        t0 = time.perf_counter()
+        try:
+            run, canonical = self.service.resolve(name, session)
+            etag = f'"{content_key(run.target)}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", headers={"ETag": etag})
+                return
+            _, data, hit = self.service.render(run, canonical)
+        except NotFound as e:
+            self._send(404, f"{e}\n".encode("utf-8"))
+            return
+        except OverflowError as e:
+            self._send(503, f"{e}\n".encode("utf-8"), headers={"Retry-After": "1"})
+            return
+        except Exception as e:
+            self._send(500, f"{type(e).__name__}: {e}\n".encode("utf-8"))
+            return
+        headers = {
+            "ETag": etag,
+            "X-Cache": "HIT" if hit else "MISS",
+            "X-Render-Ms": f"{(time.perf_counter() - t0) * 1000:.1f}",
+        }
+        if self.service.is_preview(run, data):
+            headers.update({"X-Preview": "1", "Cache-Control": "no-store"})
+        self._send(200, data, "application/pdf", headers)
+
+    def _send(self, code: int, body: bytes, ctype: str = "text/plain; charset=utf-8", headers=None) -> None:
+        self.send_response(code)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if code != 304:
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if code != 304:
+            self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Servidor local de PDFs de /resources bajo demanda.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    ap.add_argument("--jobs", "-j", type=int, default=2, metavar="N", help="render worker processes")
+    ap.add_argument("--max-pending", type=int, default=16, metavar="N", help="distinct renders queued before 503")
+    ap.add_argument("--cache-mb", type=float, default=64, metavar="MB", help="LRU size for rendered PDFs")
+    ap.add_argument("--write", action="store_true", help="also save rendered PDFs into public/resources")
+    ap.add_argument("--reproducible", action="store_true", help="date PDFs from their sources, as in build_resources")
+    args = ap.parse_args(argv)
+    if args.reproducible:
+        pdf_output.enable_reproducible()
+
+    service = RenderService(args.jobs, args.max_pending, int(args.cache_mb * 1024 * 1024), args.write)
+    # Start every worker now so the first request does not pay for reportlab.
+    for f in [service.pool.submit(build_resources._warm_worker) for _ in range(args.jobs)]:
+        f.result()
+    handler = type("BoundHandler", (Handler,), {"service": service})
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server: socketserver.BaseServer = UnixHTTPServer(args.socket, handler)
+        where = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Serving /resources/*.pdf on {where} with {args.jobs} worker(s). Ctrl+C to stop.", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        service.pool.shutdown(cancel_futures=True)
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
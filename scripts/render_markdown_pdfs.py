@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Renderiza los .md de contenido-pdfs/ como PDFs en public/resources.
+
+Cada fuente `NN-tema.md` produce `NN-tema.pdf`, el nombre que usan las URLs
+`/resources/NN-tema.pdf` de sessions.ts. El markdown se lee línea a línea y se
+convierte directamente en flowables con la tipografía de pdf_theme. Soporta
+títulos, listas (anidadas, numeradas y de casillas), negrita/cursiva/código,
+tablas, citas, bloques de código y separadores `---`.
+
+Los símbolos que la fuente del cuerpo no tiene (Helvetica no trae ❌, ✅, → ni
+emoji) se dibujan con las fuentes base-14 ZapfDingbats y Symbol; ❌ y ✅ siempre
+como ✘ rojo y ✔ verde, y cada línea que empieza por uno de ellos va aparte, para
+que la forma incorrecta no se confunda con la correcta. Los emoji decorativos
+sin equivalente se omiten.
+
+Los objetivos se registran en build_resources.py (builder "markdown"), que se
+encarga de --jobs, --dry-run y de reconstruir solo las fuentes modificadas; este
+script es un atajo a `build_resources.py --builder markdown`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from generate_missing_session_pdfs import ROOT
+from pdf_output import save
+
+
+SOURCE_DIR = os.path.join(ROOT, "contenido-pdfs")
+# Project notes rather than handouts.
+EXCLUDED = {"README.md", "INDICE.md"}
+
+# Bump whenever the markdown mapping or layout changes so every rendered
+# handout is rebuilt on the next run.
+RENDERER_VERSION = 2
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_RULE = re.compile(r"^\s*([-*_])(?:\s*\1){2,}\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_CHECKBOX = re.compile(r"^\[([ xX])\]\s+")
+_TABLE_SEP = re.compile(r"^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+
+_INLINE = [
+    (re.compile(r"`([^`]+)`"), r'<font face="Courier">\1</font>'),
+    (re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*"), r"<b>\1</b>"),
+    (re.compile(r"(?<![\w*])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![\w*])"), r"<i>\1</i>"),
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)"), r"\1"),
+]
+_BR = re.compile(r"<br\s*/?>", re.IGNORECASE)
+
+# Symbol -> (base-14 font, glyph, colour) for when the body font lacks it.
+_SYMBOLS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    "❌": ("ZapfDingbats", "✘", "#b91c1c"),
+    "✅": ("ZapfDingbats", "✔", "#15803d"),
+    "✗": ("ZapfDingbats", "✗", None),
+    "✓": ("ZapfDingbats", "✓", None),
+    "☐": ("ZapfDingbats", "❏", None),
+    "⚠": ("ZapfDingbats", "❢", None),
+    "✍": ("ZapfDingbats", "✍", None),
+    "📝": ("ZapfDingbats", "✎", None),
+    "✨": ("ZapfDingbats", "✦", None),
+    "→": ("Symbol", "→", None),
+    "↔": ("Symbol", "↔", None),
+    "≤": ("Symbol", "≤", None),
+    "β": ("Symbol", "β", None),
+    "⊘": ("Symbol", "∅", None),
+}
+# Wrong/right markers: always the coloured dingbats, whatever the body font.
+_MARKS = ("❌", "✅")
+_MARK_LINE = re.compile(r"^(?:❌|✅|✗|✓)")
+_WIDE = re.compile(r"[^\x00-\xff]")
+
+
+def _glyph(m: "re.Match[str]") -> str:
+    from pdf_theme import fonts, has_glyph
+
+    ch = m.group(0)
+    if ch not in _MARKS and has_glyph(fonts().regular, ch):
+        return ch
+    symbol = _SYMBOLS.get(ch)
+    if symbol is None:
+        return ""  # emoji and variation selectors: decoration the font cannot draw
+    face, glyph, colour = symbol
+    attrs = f' color="{colour}"' if colour else ""
+    return f'<font face="{face}"{attrs}>{glyph}</font>'
+
+
+def inline(text: str) -> str:
+    """Markdown inline markup -> reportlab paragraph markup."""
+    parts = _BR.split(text)
+    out = []
+    for part in parts:
+        part = part.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        for pattern, repl in _INLINE:
+            part = pattern.sub(repl, part)
+        out.append(_WIDE.sub(_glyph, part))
+    return "<br/>".join(out)
+
+
+def _continue(parts: List[str], text: str) -> None:
+    """Append a continuation line, keeping a ❌/✅ line on a line of its own."""
+    parts.append("<br/>" + text if parts and _MARK_LINE.match(text) else text)
+
+
+def _split_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [c.strip().replace("\\|", "|") for c in re.split(r"(?<!\\)\|", line)]
+
+
+def _table(rows: List[List[str]], width: float):
+    from reportlab.platypus import Paragraph, Table
+
+    from pdf_theme import grid_table_style, markdown_styles
+
+    cell = markdown_styles().cell
+    ncols = max(len(r) for r in rows)
+    rows = [r + [""] * (ncols - len(r)) for r in rows]
+    # Share the width by the longest text in each column, with a floor so short
+    # columns stay readable.
+    weights = [max(12, min(60, max(len(r[c]) for r in rows))) for c in range(ncols)]
+    total = sum(weights)
+    col_widths = [width * w / total for w in weights]
+    data = [[Paragraph(f"<b>{inline(c)}</b>" if i == 0 else inline(c), cell) for c in r] for i, r in enumerate(rows)]
+    t = Table(data, colWidths=col_widths, repeatRows=1)
+    t.setStyle(grid_table_style("#eef2ff", padding=4))
+    return t
+
+
+def iter_flowables(lines: Iterable[str], width: float) -> Iterator[object]:
+    """Yield flowables for markdown `lines` as each block ends."""
+    from reportlab.platypus import HRFlowable, Paragraph, Preformatted, Spacer
+
+    from pdf_theme import RULE, bullet_style, color, handout_styles, markdown_styles
+
+    h1, h2, p, _ = handout_styles(compact=True)
+    md = markdown_styles()
+
+    para: List[str] = []
+    quote: List[str] = []
+    table: List[List[str]] = []
+    code: Optional[List[str]] = None
+    item: Optional[List] = None  # [indent level, bullet text, text parts]
+    list_indents: List[int] = []
+
+    def flush() -> Iterator[object]:
+        nonlocal para, quote, table, item
+        if para:
+            yield Paragraph(inline(" ".join(para)), p)
+            yield Spacer(1, 4)
+            para = []
+        if quote:
+            yield Paragraph(inline(" ".join(quote)), md.quote)
+            quote = []
+        if table:
+            rows = [r for r in table if r is not None]
+            if rows:
+                yield _table(rows, width)
+                yield Spacer(1, 6)
+            table = []
+        if item:
+            yield from flush_item()
+
+    def flush_item() -> Iterator[object]:
+        nonlocal item
+        if item:
+            level, bullet, parts = item
+            yield Paragraph(inline(" ".join(parts)), bullet_style(level), bulletText=bullet)
+            item = None
+
+    for raw in lines:
+        line = raw.rstrip("\n").rstrip()
+
+        if code is not None:
+            if line.lstrip().startswith("```"):
+                yield Preformatted("\n".join(code), md.code)
+                yield Spacer(1, 6)
+                code = None
+            else:
+                code.append(line)
+            continue
+        if line.lstrip().startswith("```"):
+            yield from flush()
+            code = []
+            continue
+
+        if not line.strip():
+            yield from flush()
+            list_indents = []
+            continue
+
+        if line.lstrip().startswith("|"):
+            if not table:
+                yield from flush()
+            # Separator rows only mark the header; drop them.
+            table.append(None if _TABLE_SEP.match(line) else _split_row(line))  # type: ignore[arg-type]
+            continue
+        if table:
+            yield from flush()
+
+        m = _HEADING.match(line)
+        if m:
+            yield from flush()
+            level, text = len(m.group(1)), inline(m.group(2))
+            yield Paragraph(text, h1 if level == 1 else h2 if level == 2 else md.h3)
+            continue
+
+        if _RULE.match(line):
+            yield from flush()
+            yield HRFlowable(width="100%", thickness=0.6, color=color(RULE), spaceBefore=4, spaceAfter=6)
+            continue
+
+        if line.startswith(">"):
+            if para or item:
+                yield from flush()
+            _continue(quote, line.lstrip("> ").strip())
+            continue
+
+        m = _LIST_ITEM.match(line)
+        if m:
+            if para or quote:
+                yield from flush()
+            yield from flush_item()
+            indent, marker, text = len(m.group(1).expandtabs(4)), m.group(2), m.group(3)
+            while list_indents and indent < list_indents[-1]:
+                list_indents.pop()
+            if not list_indents or indent > list_indents[-1]:
+                list_indents.append(indent)
+            box = _CHECKBOX.match(text)
+            if box:
+                bullet, text = ("[x]" if box.group(1) != " " else "[  ]"), text[box.end():]
+            else:
+                bullet = marker if marker[0].isdigit() else ("•" if len(list_indents) == 1 else "–")
+            item = [len(list_indents) - 1, bullet, [text]]
+            continue
+
+        if item and raw[:1].isspace():
+            _continue(item[2], line.strip())  # continuation of the current list item
+            continue
+        if quote:
+            _continue(quote, line.strip())
+            continue
+        if item or (para and _MARK_LINE.match(line.strip())):
+            yield from flush()  # a ❌/✅ example is never run into the previous line
+        para.append(line.strip())
+
+    if code is not None:
+        yield Preformatted("\n".join(code), md.code)
+    yield from flush()
+
+
+def render_markdown_pdf(out_path: str, source_path: str) -> bool:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(
+        io.BytesIO(),
+        pagesize=A4,
+        leftMargin=1.6 * cm,
+        rightMargin=1.6 * cm,
+        topMargin=1.5 * cm,
+        bottomMargin=1.5 * cm,
+        title=document_title(source_path),
+        author="oral7",
+    )
+    with open(source_path, "r", encoding="utf-8") as f:
+        story = list(iter_flowables(f, doc.width))
+    return save(doc, story, out_path, source_path)
+
+
+def document_title(source_path: str) -> str:
+    with open(source_path, "r", encoding="utf-8") as f:
+        for line in f:
+            m = _HEADING.match(line.rstrip())
+            if m and len(m.group(1)) == 1:
+                return re.sub(r"[*`_]", "", m.group(2))
+    return os.path.splitext(os.path.basename(source_path))[0]
+
+
+def source_hash(source_path: str) -> str:
+    with open(source_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def markdown_sources(referenced: Optional[Set[str]] = None) -> Dict[str, str]:
+    """Map output filename -> markdown source path.
+
+    With `referenced` (filenames used by sessions.ts), sources nobody links to
+    are left out.
+    """
+    out = {}
+    for name in sorted(os.listdir(SOURCE_DIR)):
+        if not name.endswith(".md") or name in EXCLUDED:
+            continue
+        pdf = name[:-3] + ".pdf"
+        if referenced is None or pdf in referenced:
+            out[pdf] = os.path.join(SOURCE_DIR, name)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import build_resources
+
+    return build_resources.main(["--builder", "markdown", *(sys.argv[1:] if argv is None else argv)])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
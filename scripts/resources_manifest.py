@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Manifiesto público de recursos: public/resources-manifest.json.
+
+Una entrada por URL de /resources con lo que la web necesita para mostrar
+"3 páginas · 120 KB" sin abrir el PDF:
+
+  {"resources": {"/resources/x.pdf": {"pages": 3, "bytes": 122880,
+    "sha256": "...", "used_in": [4, 7], "built_at": "2026-01-01T10:00:00Z"}}}
+
+Lo rehacen los generadores (build_resources.py, watch_resources.py y
+generate_missing_session_pdfs.py) tras cada build a partir de todas las URLs de
+sessions.ts, no solo de lo que se acaba de generar: aparecen también los PDFs
+hechos a mano y desaparecen las URLs que ya no están en sessions.ts o cuyo
+fichero no existe. Una entrada con los mismos bytes y used_in conserva su
+built_at, y el fichero no se toca si nada cambió.
+
+Las páginas se cuentan con pikepdf si está instalado (lee también los PDFs que
+guardan sus diccionarios en object streams, como los hechos a mano); sin él se
+buscan con una expresión regular, que solo entiende PDFs sin object streams
+como los de reportlab. Un fichero cuyo sha256 no cambia no se vuelve a abrir.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from pdf_output import write_if_changed
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MANIFEST = os.path.join(ROOT, "public", "resources-manifest.json")
+
+_PAGES_COUNT = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b")
+_PAGE = re.compile(rb"/Type\s*/Page(?![s\w])")
+
+
+def page_count(data: bytes) -> Optional[int]:
+    """Pages of a PDF: with pikepdf if installed, else by scanning for the page tree (_scan_page_count)."""
+    try:
+        import pikepdf
+    except ImportError:
+        return _scan_page_count(data)
+    try:
+        with pikepdf.open(io.BytesIO(data)) as pdf:
+            return len(pdf.pages)
+    except pikepdf.PdfError:
+        return _scan_page_count(data)
+
+
+def _scan_page_count(data: bytes) -> Optional[int]:
+    """Pages of a PDF whose object dictionaries are not inside object streams (all reportlab output)."""
+    counts = [int(a or b) for a, b in _PAGES_COUNT.findall(data)]
+    if counts:
+        return max(counts)  # the root of the page tree counts every page
+    pages = len(_PAGE.findall(data))
+    return pages or None
+
+
+def describe(out_path: str, used_in: Sequence[int], prev: Optional[dict] = None) -> dict:
+    """Entry fields for one file; the page count is reused from `prev` when its sha256 matches."""
+    with open(out_path, "rb") as f:
+        data = f.read()
+    sha = hashlib.sha256(data).hexdigest()
+    known = prev is not None and prev.get("sha256") == sha and prev.get("pages") is not None
+    return {
+        "pages": prev["pages"] if known else page_count(data),  # type: ignore[index]
+        "bytes": len(data),
+        "sha256": sha,
+        "used_in": sorted(set(used_in)),
+    }
+
+
+def load(path: str = MANIFEST) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("resources", {})
+    except FileNotFoundError:
+        return {}
+
+
+def publish(resources: Iterable[Tuple[str, str, Sequence[int]]], path: str = MANIFEST) -> int:
+    """Rewrite the manifest from every (url, out_path, used_in) in sessions.ts; return how many entries changed."""
+    old = load(path)
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    entries: Dict[str, dict] = {}
+    changed = 0
+    for url, out_path, used_in in resources:
+        prev = old.get(url)
+        try:
+            entry = describe(out_path, used_in, prev)
+        except FileNotFoundError:
+            continue
+        if prev is not None and all(prev.get(k) == v for k, v in entry.items()):
+            entries[url] = prev
+            continue
+        entries[url] = {**entry, "built_at": now}
+        changed += 1
+    changed += sum(1 for url in old if url not in entries)
+    if changed:
+        text = json.dumps({"resources": dict(sorted(entries.items()))}, ensure_ascii=False, indent=2) + "\n"
+        write_if_changed(path, text.encode("utf-8"))
+    return changed
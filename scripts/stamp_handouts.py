@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Copias personalizadas de los handouts: nombre y correo de cada alumno en el pie y marca de agua.
+
+No se vuelve a maquetar ningún handout. Por alumno se dibuja una sola capa con
+reportlab (pie "Copia personal de ..." y marca de agua diagonal muy clara), una
+por tamaño de página, y se superpone con pikepdf a las páginas ya generadas de
+cada PDF de public/resources. Cada worker lee los PDFs base una vez y reutiliza
+esos bytes para todos los alumnos que procesa.
+
+La lista de alumnos es un CSV con columnas name,email (o nombre,email), por
+ejemplo exportado de la tabla users. La salida va a stamped/<correo>/<pdf>, un
+directorio por alumno, y cada alumno se informa en cuanto termina. Con los
+mismos PDFs base el resultado es idéntico byte a byte, así que volver a
+ejecutarlo no reescribe nada.
+
+Necesita pikepdf (pip install pikepdf) y una fuente TrueType (.ttf/.ttc) que
+cubra los nombres de los alumnos, con --font o STAMP_FONT: Helvetica no tiene
+ni "ě" ni "张伟", y la marca es lo que identifica cada copia. Un alumno cuyo
+nombre o correo tiene caracteres que la fuente no trae falla con un mensaje en
+lugar de recibir cuadraditos.
+
+Uso:
+  export STAMP_FONT=/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc
+  python3 scripts/stamp_handouts.py alumnos.csv 36-guia-examen-parcial.pdf 39-rubrica-parcial.pdf
+  python3 scripts/stamp_handouts.py alumnos.csv -j 8 --font DejaVuSans.ttf   # todos los PDFs
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import fnmatch
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pdf_output import write_if_changed
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(ROOT, "public", "resources")
+STAMPED_DIR = os.path.join(ROOT, "stamped")
+
+WATERMARK_ALPHA = 0.07
+STAMP_NAME = "/StudentStamp"
+FONT_ENV = "STAMP_FONT"
+
+
+@dataclass(frozen=True)
+class Student:
+    name: str
+    email: str
+
+    @property
+    def dirname(self) -> str:
+        return re.sub(r"[^A-Za-z0-9._@-]+", "_", self.email.lower())
+
+
+@dataclass
+class StudentResult:
+    student: Student
+    written: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def load_students(path: str) -> List[Student]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = {(h or "").strip().lower(): h for h in reader.fieldnames or []}
+        name_col = fields.get("name") or fields.get("nombre")
+        email_col = fields.get("email") or fields.get("correo")
+        if not name_col or not email_col:
+            raise ValueError(f"{path} necesita columnas name y email")
+        students = []
+        seen = set()
+        for row in reader:
+            name, email = (row.get(name_col) or "").strip(), (row.get(email_col) or "").strip()
+            if name and email and email.lower() not in seen:
+                seen.add(email.lower())
+                students.append(Student(name, email))
+    return students
+
+
+@lru_cache(maxsize=None)
+def stamp_font(path: str) -> str:
+    """Register the TrueType font at `path` once per process; return its reportlab name."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    name = "Stamp-" + os.path.splitext(os.path.basename(path))[0]
+    pdfmetrics.registerFont(TTFont(name, path))
+    return name
+
+
+def missing_glyphs(font: str, text: str) -> str:
+    """Characters of `text` that `font` cannot draw, each once."""
+    from pdf_theme import has_glyph
+
+    return "".join(dict.fromkeys(ch for ch in text if not ch.isspace() and not has_glyph(font, ch)))
+
+
+def overlay_pdf(student: Student, width: float, height: float, font_path: str) -> bytes:
+    """One page of `width` x `height` points with the student's footer and watermark."""
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
+    from pdf_theme import MUTED, color
+
+    font = stamp_font(font_path)
+    missing = missing_glyphs(font, student.name + student.email)
+    if missing:
+        font_name = os.path.basename(font_path)
+        raise ValueError(f"La fuente {font_name} no tiene los caracteres {missing!r} de {student.name}")
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=(width, height), invariant=1, pageCompression=1)
+    c.setFont(font, 7)
+    c.setFillColor(color(MUTED))
+    c.drawCentredString(width / 2, 0.55 * cm, f"Copia personal de {student.name} <{student.email}> · no distribuir")
+
+    c.saveState()
+    c.setFillColor(color(MUTED))
+    c.setFillAlpha(WATERMARK_ALPHA)
+    mark = student.email
+    size = min(48.0, 1.9 * (width ** 2 + height ** 2) ** 0.5 / max(len(mark), 1))
+    c.setFont(font, size)
+    c.translate(width / 2, height / 2)
+    c.rotate(57 if height > width else 33)
+    c.drawCentredString(0, -size / 3, mark)
+    c.restoreState()
+    c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+# Per-worker cache of base handout bytes by path; each worker reads a handout once.
+_bases: Dict[str, bytes] = {}
+
+
+def _base(path: str) -> bytes:
+    data = _bases.get(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = _bases[path] = f.read()
+    return data
+
+
+def stamp_student(student: Student, paths: Sequence[str], out_dir: str, font_path: str) -> StudentResult:
+    """Stamp every handout in `paths` for one student into out_dir/<student>/."""
+    import pikepdf
+
+    result = StudentResult(student)
+    t0 = time.perf_counter()
+    target = os.path.join(out_dir, student.dirname)
+    os.makedirs(target, exist_ok=True)
+    overlays: Dict[Tuple[float, float], pikepdf.Pdf] = {}
+    try:
+        for path in paths:
+            with pikepdf.open(io.BytesIO(_base(path))) as pdf:
+                forms: Dict[Tuple[float, float], pikepdf.Object] = {}  # overlays copied into this pdf
+                for page in pdf.pages:
+                    x0, y0, x1, y1 = (float(v) for v in page.mediabox)
+                    size = (x1 - x0, y1 - y0)
+                    if size not in overlays:
+                        overlays[size] = pikepdf.open(io.BytesIO(overlay_pdf(student, *size, font_path)))
+                    if size not in forms:
+                        forms[size] = pdf.copy_foreign(overlays[size].pages[0].as_form_xobject())
+                    # Page.add_overlay would pick a random resource name; a fixed one keeps output stable.
+                    name = page.add_resource(forms[size], pikepdf.Name.XObject, pikepdf.Name(STAMP_NAME))
+                    page.contents_add(b"q\n", prepend=True)
+                    page.contents_add(f"\nQ q 1 0 0 1 {x0:g} {y0:g} cm {name} Do Q\n".encode())
+                pdf.docinfo["/Subject"] = f"Copia personal de {student.name} <{student.email}>"
+                out = io.BytesIO()
+                pdf.save(out, deterministic_id=True, compress_streams=True)
+            if write_if_changed(os.path.join(target, os.path.basename(path)), out.getvalue()):
+                result.written += 1
+            else:
+                result.unchanged += 1
+    except Exception as e:  # noqa: BLE001 - reported per student, the others go on
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        for overlay in overlays.values():
+            overlay.close()
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+def select_handouts(patterns: Sequence[str], resources_dir: str = RESOURCES_DIR) -> List[str]:
+    names = sorted(n for n in os.listdir(resources_dir) if n.endswith(".pdf"))
+    if patterns:
+        names = [n for n in names if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+    return [os.path.join(resources_dir, n) for n in names]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera copias de los handouts con el nombre y correo de cada alumno.")
+    ap.add_argument("students", help="CSV with name,email columns")
+    ap.add_argument("handouts", nargs="*", metavar="PDF", help="filenames or globs in public/resources (default: all)")
+    ap.add_argument("--out", default=STAMPED_DIR, help="output root, one directory per student (default: stamped/)")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, metavar="N", help="worker processes")
+    ap.add_argument(
+        "--font",
+        default=os.environ.get(FONT_ENV),
+        metavar="FILE.ttf",
+        help=f"TrueType font covering the students' names (default: ${FONT_ENV})",
+    )
+    args = ap.parse_args(argv)
+    try:
+        import pikepdf  # noqa: F401
+    except ImportError:
+        ap.error("stamp_handouts.py necesita pikepdf (pip install pikepdf)")
+    if not args.font:
+        ap.error(f"stamp_handouts.py necesita una fuente TrueType que cubra los nombres (--font o {FONT_ENV})")
+    try:
+        stamp_font(args.font)
+    except Exception as e:  # noqa: BLE001 - reportlab raises TTFError, OSError, ...
+        ap.error(f"No se pudo cargar la fuente {args.font}: {e}")
+
+    try:
+        students = load_students(args.students)
+    except (OSError, ValueError) as e:
+        ap.error(str(e))
+    paths = select_handouts(args.handouts)
+    if not students or not paths:
+        print(f"Nothing to stamp: {len(students)} student(s), {len(paths)} handout(s).")
+        return 1
+
+    t0 = time.perf_counter()
+    results: List[StudentResult] = []
+    workers = max(1, min(args.jobs, len(students)))
+    if workers == 1:
+        pending = (stamp_student(s, paths, args.out, args.font) for s in students)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = [pool.submit(stamp_student, s, paths, args.out, args.font) for s in students]
+        pending = (f.result() for f in as_completed(futures))
+    try:
+        for r in pending:
+            results.append(r)
+            status = f"FAILED {r.error}" if r.error else f"{r.written} written, {r.unchanged} unchanged"
+            print(f"  {r.seconds * 1000:8.1f} ms  {r.student.dirname}/  {status}", flush=True)
+    finally:
+        if workers > 1:
+            pool.shutdown()
+
+    failed = sum(1 for r in results if r.error)
+    files = sum(r.written + r.unchanged for r in results)
+    print(
+        f"Stamped {files} PDFs for {len(results) - failed} student(s) ({len(paths)} handouts each), "
+        f"{failed} failed, in {time.perf_counter() - t0:.2f}s with {workers} job(s) -> {os.path.relpath(args.out)}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
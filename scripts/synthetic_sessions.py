@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Generador de sessions.ts sintéticos para benchmarks y pruebas de escala.
+
+Produce un fichero con la misma forma que src/data/sessions.ts pero con tantas
+sesiones como se pida (1k, 10k...): bloques con comentarios de cabecera,
+comentarios de línea y de bloque entre propiedades, las tres comillas de TS
+(con escapes, apóstrofos y comillas anidadas), `new Date(...)`, comas finales y
+el mismo anidamiento (dynamics > instructions, grammarContent > examples...).
+
+La salida es determinista para una semilla dada.
+
+Uso: python3 scripts/synthetic_sessions.py 10000 -o /tmp/sessions-10k.ts [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+
+SESSIONS_PER_BLOCK = 8
+
+_WORDS = (
+    "argumentación hipótesis matiz registro subjuntivo conector réplica turno cortesía "
+    "debate exposición acuerdo desacuerdo ironía atenuación énfasis concesión causa "
+    "consecuencia opinión valoración anécdota narración descripción entrevista"
+).split()
+_CATEGORIES = ("expresiones", "verbos", "sustantivo", "conectores", "terminología")
+_GROUPS = ("pairs", "small_group", "whole_class", "individual")
+_TYPES = ("pdf", "video", "link", "audio")
+
+
+def _phrase(rnd: random.Random, lo: int = 3, hi: int = 9) -> str:
+    words = [rnd.choice(_WORDS) for _ in range(rnd.randint(lo, hi))]
+    return " ".join(words).capitalize()
+
+
+def _quote(rnd: random.Random, text: str) -> str:
+    """A TS string literal for text, in one of the quoting styles sessions.ts uses."""
+    style = rnd.random()
+    if style < 0.6:
+        return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    if style < 0.9:
+        return json.dumps(text, ensure_ascii=False)
+    return "`" + text.replace("\\", "\\\\").replace("`", "\\`").replace("${", "\\${") + "`"
+
+
+def _text(rnd: random.Random, lo: int = 3, hi: int = 9) -> str:
+    """A phrase that sometimes carries the characters the tokenizer must get right."""
+    text = _phrase(rnd, lo, hi)
+    extra = rnd.random()
+    if extra < 0.15:
+        text += " (l'accord)"
+    elif extra < 0.3:
+        text = f'Tema: "{text}"'
+    elif extra < 0.35:
+        text += " // no es un comentario"
+    elif extra < 0.4:
+        text += " /* tampoco */ ¿verdad?"
+    return text
+
+
+def _session(rnd: random.Random, n: int, day: date, block: int, block_title: str) -> List[str]:
+    q = lambda s: _quote(rnd, s)  # noqa: E731
+    out = [
+        "  {",
+        f"    sessionNumber: {n},",
+        f"    id: `session-{n}`,",
+        f"    date: new Date('{day.isoformat()}'),",
+        f"    title: {q(_text(rnd, 4, 10))},",
+        f"    subtitle: {q(_phrase(rnd, 2, 4))},",
+        f"    blockNumber: {block},",
+        f"    blockTitle: {q(block_title)},",
+        f"    isExamDay: {'true' if n % SESSIONS_PER_BLOCK == 0 else 'false'},",
+        "    objectives: [",
+    ]
+    for i in range(rnd.randint(3, 6)):
+        mode = ", isModeB: true" if rnd.random() < 0.2 else ""
+        out.append(f"      {{ id: 'obj-{n}-{i + 1}', text: {q(_text(rnd))}{mode} }},")
+    out.append("    ],")
+    out.append("    timing: [")
+    for i in range(rnd.randint(4, 7)):
+        out.append(
+            f"      {{ id: 't{n}-{i + 1}', duration: '{rnd.choice((10, 15, 20, 25))} min', "
+            f"activity: {q(_phrase(rnd))}, description: {q(_text(rnd, 5, 12))} }},"
+        )
+    out.append("    ],")
+    out.append("    dynamics: [")
+    for i in range(rnd.randint(2, 5)):
+        out += [
+            "      {",
+            f"        id: 'd{n}-{i + 1}',",
+            f"        step: {i + 1},",
+            f"        title: {q(_text(rnd))},",
+            "        instructions: [",
+            *(f"          {q(_text(rnd, 5, 14))}," for _ in range(rnd.randint(3, 7))),
+            "        ],",
+            f"        groupType: '{rnd.choice(_GROUPS)}',",
+        ]
+        if rnd.random() < 0.4:
+            out.append(f"        materials: [{', '.join(q(_phrase(rnd, 1, 3)) for _ in range(rnd.randint(1, 3)))}],")
+        if rnd.random() < 0.2:
+            out.append("        // timeRequired: '20 min',")
+        out.append("      },")
+    out.append("    ],")
+    out += [
+        "    grammarContent: {",
+        f"      title: {q(_text(rnd))},",
+        f"      explanation: {q(_text(rnd, 10, 25))},",
+        "      examples: [",
+        *(f"        {{ spanish: {q(_text(rnd, 5, 12))}, }}," for _ in range(rnd.randint(2, 5))),
+        "      ],",
+        "      rules: [",
+        *(f"        {q(_text(rnd, 6, 14))}," for _ in range(rnd.randint(2, 5))),
+        "      ],",
+        "      notes: [",
+        *(f"        {q(_text(rnd, 6, 14))}," for _ in range(rnd.randint(0, 3))),
+        "      ],",
+        "    },",
+        "    vocabularyContent: {",
+        f"      title: {q(_phrase(rnd))},",
+        "      items: [",
+    ]
+    for _ in range(rnd.randint(4, 8)):
+        out.append(
+            f"        {{ term: {q(_phrase(rnd, 1, 3))}, definition: {q(_text(rnd, 4, 10))}, "
+            f"example: {q(_text(rnd, 5, 12))}, category: '{rnd.choice(_CATEGORIES)}' }},"
+        )
+    out.append("      ],")
+    out.append("      expressions: [")
+    for _ in range(rnd.randint(1, 4)):
+        out.append(
+            f"        {{ expression: {q(_phrase(rnd, 2, 4))}, meaning: {q(_text(rnd))}, usage: {q(_text(rnd))} }},"
+        )
+    out += ["      ],", "    },", "    tasks: ["]
+    for i in range(rnd.randint(1, 3)):
+        out.append(f"      {{ id: 'task-{n}-{i + 1}', title: {q(_phrase(rnd))}, description: {q(_text(rnd, 8, 16))} }},")
+    out.append("    ],")
+    out.append(f"    checklistItems: [{', '.join(q(_phrase(rnd, 2, 5)) for _ in range(rnd.randint(2, 4)))}],")
+    if rnd.random() < 0.7:
+        out.append(f"    homeworkInstructions: {q(_text(rnd, 10, 30))},")
+    out.append("    resources: [")
+    for i in range(rnd.randint(1, 3)):
+        kind = rnd.choice(_TYPES)
+        slug = f"sesion-{n}-recurso-{i + 1}"
+        url = f"/resources/{slug}.pdf" if kind == "pdf" else f"https://example.org/{slug}"
+        desc = f", description: {q(_text(rnd))}" if rnd.random() < 0.5 else ""
+        out.append(
+            f"      {{ id: 'r{n}-{i + 1}', title: {q(_text(rnd, 3, 7))}, type: '{kind}', "
+            f"url: '{url}', order: {i + 1}{desc} }},"
+        )
+    out += ["    ],", "  },"]
+    return out
+
+
+def synthetic_sessions_ts(count: int, seed: int = 7) -> str:
+    """Source text of a sessions.ts with `count` sessions."""
+    rnd = random.Random(seed)
+    lines = [
+        'import { SessionData } from "@/types"',
+        "",
+        "// ============================================",
+        f"// DATOS SINTÉTICOS - {count} sesiones (semilla {seed})",
+        "// ============================================",
+        "",
+        "export const sessionsData: SessionData[] = [",
+    ]
+    day = date(2026, 2, 3)
+    block_title = ""
+    for n in range(1, count + 1):
+        block = (n - 1) // SESSIONS_PER_BLOCK + 1
+        if (n - 1) % SESSIONS_PER_BLOCK == 0:
+            block_title = _phrase(rnd, 2, 5)
+            lines += [
+                "  // ============================================",
+                f"  // BLOQUE {block}: {block_title}",
+                "  // ============================================",
+                "",
+            ]
+        elif rnd.random() < 0.1:
+            lines.append(f"  /* Sesión {n}: revisar {{ materiales }} y [fechas] */")
+        lines += _session(rnd, n, day, block, block_title)
+        day += timedelta(days=2 if day.weekday() == 1 else 5)
+    lines += ["]", ""]
+    return "\n".join(lines)
+
+
+def synthetic_vocab_rows(count: int, seed: int = 7) -> List[Tuple[str, str, str, str, str]]:
+    """(term, category, definition, example, sessions) rows shaped like a course glossary."""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(count):
+        term = _phrase(rnd, 1, 3)
+        definition = _phrase(rnd, 4, 14) if rnd.random() > 0.1 else _phrase(rnd, 18, 40)
+        rows.append((term, rnd.choice(_CATEGORIES), definition, _text(rnd, 5, 12), str(1 + i % 60)))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera un sessions.ts sintético.")
+    ap.add_argument("count", type=int, help="number of sessions")
+    ap.add_argument("-o", "--output", help="output file (default: stdout)")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    text = synthetic_sessions_ts(args.count, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
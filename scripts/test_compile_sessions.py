@@ -0,0 +1,39 @@
+"""Pruebas de compile_sessions: sesiones repetidas y fechas leídas igual que el parser de los PDFs.
+
+Uso: python3 -m pytest -q scripts/test_compile_sessions.py
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import compile_sessions
+import generate_missing_session_pdfs as missing
+
+SOURCE = """export const sessionsData: Session[] = [
+  { id: 's1', sessionNumber: 1, title: 'Uno', date: new Date('2026-02-03') },
+  { id: 's2', sessionNumber: 2, title: 'Dos', date: '2026-02-05' },
+  { id: 's3', sessionNumber: 3, title: 'Tres', date: new Date(2026, 1, 10) },
+  { id: 's4', sessionNumber: 4, title: 'Cuatro', date: 'el martes que viene' },
+];
+"""
+
+
+def test_duplicate_session_number_names_both_literals(tmp_path):
+    source = tmp_path / "sessions.ts"
+    source.write_text(SOURCE.replace("sessionNumber: 4", "sessionNumber: 2"), encoding="utf-8")
+
+    with pytest.raises(missing.SessionsParseError) as err:
+        compile_sessions.compile_sessions(str(source), str(tmp_path / "c.json"), str(tmp_path / "c.sqlite"))
+
+    message = str(err.value)
+    assert "sessionNumber 2" in message
+    assert "elemento 2 (id 's2', titulo 'Dos')" in message and "elemento 4 (id 's4', titulo 'Cuatro')" in message
+
+
+def test_dates_match_the_pdf_parser():
+    tables = compile_sessions.normalize(list(missing.iter_session_objects(SOURCE)))
+    compiled = {row["number"]: row["date"] for row in tables["sessions"]}
+    parsed = {s.session_number: s.date_str for s in missing.iter_sessions_text(SOURCE)}
+
+    assert compiled == parsed == {1: "2026-02-03", 2: "2026-02-05", 3: None, 4: None}
@@ -0,0 +1,46 @@
+"""Pruebas de handout_layout: --check valida todas las fichas y los bloques incompletos no se crean.
+
+Uso: python3 -m pytest -q scripts/test_handout_layout.py
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import dataclass
+
+import pytest
+
+import handout_layout
+
+
+def _write(path, data) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_check_reports_every_invalid_spec(tmp_path, capsys):
+    shutil.copy(f"{handout_layout.SPEC_DIR}/sesion-02.json", tmp_path / "sesion-02.json")
+    _write(tmp_path / "sesion-07.json", {"session": 7, "handouts": "no"})
+    handout = {"output": "x.pdf", "title": "X", "blocks": [{"type": "bogus"}]}
+    _write(tmp_path / "sesion-08.json", {"session": 8, "handouts": [handout]})
+
+    errors = handout_layout.check_specs(str(tmp_path))
+
+    assert len(errors) == 2
+    assert handout_layout.main(["--check", "--spec-dir", str(tmp_path)]) == 1
+    out = capsys.readouterr().out
+    assert "sesion-07.json.handouts" in out and "'bogus'" in out
+
+
+def test_check_passes_on_the_shipped_specs(capsys):
+    assert handout_layout.main(["--check"]) == 0
+    assert capsys.readouterr().out.endswith("spec(s) OK\n")
+
+
+def test_block_without_flowables_cannot_be_built():
+    @dataclass
+    class Incomplete(handout_layout.Block):
+        text: str = ""
+
+    with pytest.raises(TypeError, match="flowables"):
+        Incomplete()
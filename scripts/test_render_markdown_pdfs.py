@@ -0,0 +1,73 @@
+"""Pruebas de render_markdown_pdfs: los ejemplos ❌/✅ se leen y no se mezclan.
+
+Uso: python3 -m pytest -q scripts/test_render_markdown_pdfs.py   (necesita pymupdf)
+"""
+
+from __future__ import annotations
+
+import io
+from typing import List
+
+import pytest
+
+import pdf_theme
+import render_markdown_pdfs as md
+
+pymupdf = pytest.importorskip("pymupdf")
+
+RED, GREEN = 0xB91C1C, 0x15803D
+
+
+@pytest.fixture(autouse=True)
+def helvetica(monkeypatch):
+    # The default body font, which has no glyph for ❌/✅.
+    monkeypatch.delenv(pdf_theme.FONT_ENV, raising=False)
+    pdf_theme.clear_caches()
+    yield
+    pdf_theme.clear_caches()
+
+
+def _lines(markdown: str) -> List[List[dict]]:
+    """Spans of each extracted line of `markdown` rendered on one A4 page."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4)
+    doc.build(list(md.iter_flowables(markdown.splitlines(True), doc.width)))
+    page = pymupdf.open(stream=buf.getvalue(), filetype="pdf")[0]
+    return [line["spans"] for block in page.get_text("dict")["blocks"] for line in block.get("lines", [])]
+
+
+def _text(spans: List[dict]) -> str:
+    return "".join(s["text"] for s in spans if s["font"] != "ZapfDingbats").strip()
+
+
+def _mark(spans: List[dict]) -> dict:
+    marks = [s for s in spans if s["font"] == "ZapfDingbats" and s["text"].strip()]
+    assert len(marks) == 1, spans
+    return marks[0]
+
+
+def test_wrong_and_right_lines_stay_apart():
+    lines = _lines('❌ "Ayer **he hablado** con María."\n✅ "Ayer **hablé** con María."\n')
+
+    assert [_text(s) for s in lines] == ['"Ayer he hablado con María."', '"Ayer hablé con María."']
+    wrong, right = _mark(lines[0]), _mark(lines[1])
+    assert (wrong["color"], right["color"]) == (RED, GREEN)
+    assert wrong["text"] != right["text"]
+
+
+def test_marks_in_a_list_item_continuation():
+    lines = _lines('1. ❌ "Ojalá **había venido**."\n   ✅ "Ojalá **hubiera venido**."\n')
+
+    assert [_text(s) for s in lines] == ['1. "Ojalá había venido."', '"Ojalá hubiera venido."']
+    assert [_mark(s)["color"] for s in lines] == [RED, GREEN]
+
+
+def test_other_symbols_use_base14_glyphs_or_are_dropped():
+    (spans,) = _lines("Duda → SUBJUNTIVO 📝\n")
+
+    text = "".join(s["text"] for s in spans)
+    assert "→" in text
+    assert "📝" not in text and "�" not in text and "■" not in text
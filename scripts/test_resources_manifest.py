@@ -0,0 +1,54 @@
+"""Pruebas de resources_manifest: páginas de PDFs hechos a mano y de reportlab.
+
+Uso: python3 -m pytest -q scripts/test_resources_manifest.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+import resources_manifest
+
+RESOURCES = os.path.join(resources_manifest.ROOT, "public", "resources")
+# Hand-made (not reportlab): its page tree lives in compressed object streams.
+HANDMADE = os.path.join(RESOURCES, "02-guia-curso.pdf")
+
+
+def _read(path: str) -> bytes:
+    if not os.path.exists(path):
+        pytest.skip(f"{path} not present")
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_handmade_pdf_pages_are_counted():
+    pytest.importorskip("pikepdf")
+    data = _read(HANDMADE)
+    assert resources_manifest._scan_page_count(data) is None  # what the regex alone gave
+    assert resources_manifest.page_count(data) == 8
+
+
+def test_reportlab_pdf_pages_match_scan(tmp_path):
+    from reportlab.pdfgen import canvas
+
+    path = tmp_path / "three.pdf"
+    c = canvas.Canvas(str(path), invariant=1)
+    for _ in range(3):
+        c.drawString(72, 72, "x")
+        c.showPage()
+    c.save()
+    data = path.read_bytes()
+    assert resources_manifest.page_count(data) == resources_manifest._scan_page_count(data) == 3
+
+
+def test_publish_describes_handmade_pdf(tmp_path):
+    pytest.importorskip("pikepdf")
+    _read(HANDMADE)
+    out = tmp_path / "resources-manifest.json"
+    assert resources_manifest.publish([("/resources/02-guia-curso.pdf", HANDMADE, [2])], str(out)) == 1
+    entry = json.loads(out.read_text(encoding="utf-8"))["resources"]["/resources/02-guia-curso.pdf"]
+    assert entry["pages"] == 8 and entry["used_in"] == [2]
+    assert resources_manifest.publish([("/resources/02-guia-curso.pdf", HANDMADE, [2])], str(out)) == 0
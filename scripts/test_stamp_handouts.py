@@ -0,0 +1,49 @@
+"""Pruebas de stamp_handouts: los nombres fuera de Latin-1 se estampan tal cual o fallan claro.
+
+Uso: STAMP_FONT=/ruta/Fuente.ttf python3 -m pytest -q scripts/test_stamp_handouts.py
+(por defecto DejaVu Sans si está instalada; necesita pymupdf)
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from stamp_handouts import FONT_ENV, Student, missing_glyphs, overlay_pdf, stamp_font
+
+pymupdf = pytest.importorskip("pymupdf")
+
+FONT = os.environ.get(FONT_ENV) or "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+if not os.path.exists(FONT):
+    pytest.skip(f"no TrueType font at {FONT} (set {FONT_ENV})", allow_module_level=True)
+
+A4 = (595.2756, 841.8898)
+
+
+def _footer(student: Student) -> str:
+    page = pymupdf.open(stream=overlay_pdf(student, *A4, FONT), filetype="pdf")[0]
+    return next(line for line in page.get_text().splitlines() if line.startswith("Copia personal"))
+
+
+def test_non_latin_name_is_stamped_as_text():
+    student = Student("Zhāng Wěi Ψάλτης Иван", "zhang.wei@example.com")
+    if missing_glyphs(stamp_font(FONT), student.name):
+        pytest.skip(f"{FONT} does not cover {student.name}")
+
+    assert _footer(student) == "Copia personal de Zhāng Wěi Ψάλτης Иван <zhang.wei@example.com> · no distribuir"
+
+
+def test_cjk_name_is_stamped_or_fails_clearly():
+    student = Student("Zhāng Wěi 张伟", "zw@example.com")
+    missing = missing_glyphs(stamp_font(FONT), student.name)
+    if not missing:
+        assert "Zhāng Wěi 张伟" in _footer(student)
+        return
+    with pytest.raises(ValueError, match=missing):
+        overlay_pdf(student, *A4, FONT)
+
+
+def test_overlay_is_reproducible():
+    student = Student("Zoë Ørsted", "zoe@example.com")
+    assert overlay_pdf(student, *A4, FONT) == overlay_pdf(student, *A4, FONT)
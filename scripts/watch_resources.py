@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Vigila sessions.ts, contenido-pdfs/ y los generadores y reconstruye solo lo afectado.
+
+Pensado para quien edita contenido: el proceso se queda abierto con reportlab,
+las fuentes y los estilos de pdf_theme ya cargados, así que cada cambio cuesta
+solo el render de los PDFs implicados.
+
+- sessions.ts o un .md de contenido-pdfs: se usan los hashes del manifiesto de
+  build, como en build_resources.py, para rehacer solo los resúmenes y handouts
+  cuyos datos cambiaron. De sessions.ts solo se vuelve a parsear el literal de
+  la sesión editada (IncrementalSessions); un cambio fuera de una sesión
+  reparsea el fichero entero.
+- una ficha de contenido-pdfs/fichas/: se rehacen sus handouts (el motor la
+  vuelve a compilar al ver que cambió).
+- handout_layout.py, render_markdown_pdfs.py o generate_missing_session_pdfs.py:
+  se recarga el módulo y se rehacen todos los objetivos de sus builders.
+- pdf_theme.py o pdf_output.py: se recargan todos los generadores y se rehace todo.
+
+Uso: python3 scripts/watch_resources.py [--interval 0.2] [--reproducible]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import os
+import time
+import traceback
+from typing import Dict, List, Optional, Set, Tuple
+
+import build_resources
+import generate_missing_session_pdfs as missing
+import handout_layout
+import pdf_output
+import pdf_theme
+import render_markdown_pdfs
+
+
+# Modules that everything else imports names from; a change reloads every generator.
+SHARED_MODULES = (pdf_output, pdf_theme)
+
+
+def module_builders() -> Dict[str, Tuple[object, str]]:
+    """Source path -> (module, builder name) for modules that own one builder.
+
+    handout_layout owns one builder per spec; "session*" stands for all of them.
+    """
+    owned = [(missing, "session_summary"), (render_markdown_pdfs, "markdown"), (handout_layout, "session*")]
+    return {os.path.abspath(mod.__file__): (mod, builder) for mod, builder in owned}
+
+
+def watched_paths() -> List[str]:
+    paths = [missing.SESSIONS_TS]
+    paths += [os.path.abspath(mod.__file__) for mod in SHARED_MODULES]
+    paths += list(module_builders())
+    paths += list(render_markdown_pdfs.markdown_sources().values())
+    paths += handout_layout.spec_paths()
+    return paths
+
+
+def snapshot(paths: List[str]) -> Dict[str, Tuple[int, int]]:
+    out = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        out[path] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def warm_up() -> None:
+    """Import reportlab, load the base fonts and build every shared style once."""
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    h1, _, p, _ = pdf_theme.handout_styles()
+    pdf_theme.handout_styles(compact=True)
+    pdf_theme.markdown_styles()
+    pdf_theme.poster_styles()
+    SimpleDocTemplate(io.BytesIO()).build([Paragraph("<b>oral7</b> <i>warm</i>", p), Paragraph("x", h1)])
+
+
+def reload_modules(changed: Set[str]) -> Optional[Set[str]]:
+    """Reload changed generator modules; return the builders to force, or None for all."""
+    owners = module_builders()
+    if any(os.path.abspath(mod.__file__) in changed for mod in SHARED_MODULES):
+        for mod in SHARED_MODULES:
+            importlib.reload(mod)
+        # Generators bind theme names at import time, so they have to follow.
+        for mod, _ in owners.values():
+            importlib.reload(mod)
+        return None
+    forced = set()
+    specs = set(handout_layout.spec_paths())
+    for path in changed:
+        if path in owners:
+            mod, builder = owners[path]
+            importlib.reload(mod)
+            forced.add(builder)
+        elif path in specs:
+            forced.add(handout_layout.load_spec(path).builder)
+    if "session*" in forced:
+        forced |= {spec.builder for spec in handout_layout.load_specs()}
+    return forced
+
+
+def plan_changes(
+    targets: List[build_resources.Target], manifest: Dict[str, dict], forced: Optional[Set[str]], why: str
+) -> List[build_resources.TargetRun]:
+    """Forced builders rebuild everything; other tracked targets only if their inputs changed."""
+    runs = []
+    for t in targets:
+        if forced is None or t.builder in forced:
+            runs.append(build_resources.TargetRun(t, "build", [why]))
+        elif t.input_hashes is not None:
+            run = build_resources.plan([t], manifest, force=False)[0]
+            if run.status == "build":
+                runs.append(run)
+    return runs
+
+
+class Watcher:
+    def __init__(self) -> None:
+        self.sessions: List[missing.Session] = []
+        self.parser: Optional[missing.IncrementalSessions] = None
+        self.paths = watched_paths()
+        self.state = snapshot(self.paths)
+
+    def poll(self) -> Set[str]:
+        self.paths = watched_paths()  # picks up new markdown sources
+        current = snapshot(self.paths)
+        changed = {p for p in set(current) | set(self.state) if current.get(p) != self.state.get(p)}
+        self.state = current
+        return changed
+
+    def cycle(self, changed: Set[str], t_saved: float) -> None:
+        names = ", ".join(sorted(os.path.relpath(p, missing.ROOT) for p in changed)) or "startup"
+        t0 = time.perf_counter()
+        try:
+            forced = reload_modules(changed) if changed else set()
+            if self.parser is None or forced is None or "session_summary" in forced:
+                self.parser = missing.IncrementalSessions()  # first cycle, or the parser was reloaded
+                self.sessions = self.parser.update()
+            elif missing.SESSIONS_TS in changed:
+                self.sessions = self.parser.update()
+        except Exception:
+            # Usually a half-saved file; the next save triggers another cycle.
+            print(f"[{names}] not rebuilt:\n{traceback.format_exc()}", flush=True)
+            return
+        pdf_output.source_epoch.cache_clear()
+
+        manifest = missing.load_build_manifest()
+        runs = plan_changes(build_resources.registry(self.sessions), manifest, forced, f"{names} changed")
+        build_resources.execute(runs)
+        if build_resources.record(runs, manifest):
+            missing.save_build_manifest(manifest)
+        build_resources.publish(self.sessions)
+        build_resources.log_metrics(runs)
+        elapsed = time.perf_counter() - t0
+        if runs:
+            build_resources.print_report(runs, dry_run=False)
+        after_save = f", {(time.time() - t_saved) * 1000:.0f} ms after save" if changed else ""
+        print(f"[{names}] {len(runs)} target(s) in {elapsed * 1000:.0f} ms{after_save}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Reconstruye los PDFs afectados cada vez que cambia una fuente.")
+    ap.add_argument("--interval", type=float, default=0.2, metavar="S", help="seconds between polls")
+    ap.add_argument("--reproducible", action="store_true", help="date PDFs from their sources, as in build_resources")
+    args = ap.parse_args(argv)
+    if args.reproducible:
+        pdf_output.enable_reproducible()
+
+    os.makedirs(build_resources.OUT_DIR, exist_ok=True)
+    t0 = time.perf_counter()
+    warm_up()
+    watcher = Watcher()
+    print(f"Warm in {(time.perf_counter() - t0) * 1000:.0f} ms; watching {len(watcher.paths)} files. Ctrl+C to stop.")
+    # Catch up on anything that changed while nobody was watching.
+    watcher.cycle(set(), time.time())
+    try:
+        while True:
+            time.sleep(args.interval)
+            changed = watcher.poll()
+            if changed:
+                t_saved = max(watcher.state.get(p, (time.time_ns(), 0))[0] for p in changed) / 1e9
+                watcher.cycle(changed, t_saved)
+    except KeyboardInterrupt:
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())